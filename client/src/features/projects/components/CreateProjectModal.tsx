@@ -15,6 +15,19 @@ export interface CreateProjectModalProps {
 
 type SetupMode = 'intelligent' | 'manual';
 
+// Intelligent setup runs as a background job on the server
+const SETUP_POLL_INTERVAL_MS = 2000;
+// Stop polling after 20 minutes; the server fails a job stalled for 15
+const SETUP_POLL_TIMEOUT_MS = 20 * 60 * 1000;
+
+interface SetupJob {
+  job_id: number;
+  status: 'pending' | 'running' | 'completed' | 'failed';
+  progress?: string | null;
+  result?: unknown;
+  error?: string | null;
+}
+
 export function CreateProjectModal({ isOpen, onClose }: CreateProjectModalProps) {
   const dispatch = useDispatch();
   const [createProject, { isLoading }] = useCreateProjectMutation();
@@ -85,11 +98,31 @@ export function CreateProjectModal({ isOpen, onClose }: CreateProjectModalProps)
     setErrors({});
 
     try {
-      const response = await apiClient.post('/api/projects/intelligent-setup', {
+      const { data: started } = await apiClient.post<SetupJob>('/api/projects/intelligent-setup', {
         url: intelligentUrl,
       });
 
-      console.log('Intelligent setup result:', response.data);
+      // Poll the job until it finishes or the timeout passes
+      let job = started;
+      const deadline = Date.now() + SETUP_POLL_TIMEOUT_MS;
+      while (job.status === 'pending' || job.status === 'running') {
+        if (Date.now() >= deadline) {
+          throw new Error('Setup is taking too long. Check the project list later or try manual mode.');
+        }
+        await new Promise((resolve) => setTimeout(resolve, SETUP_POLL_INTERVAL_MS));
+        ({ data: job } = await apiClient.get<SetupJob>(
+          `/api/projects/intelligent-setup/${started.job_id}`
+        ));
+        if (job.progress) {
+          setSetupStatus(`${job.progress}...`);
+        }
+      }
+
+      if (job.status === 'failed') {
+        throw new Error(job.error || 'Setup failed. Please try manual mode.');
+      }
+
+      console.log('Intelligent setup result:', job.result);
 
       // Invalidate projects cache to refresh the list
       dispatch(projectsApi.util.invalidateTags(['Project']));
@@ -15,7 +15,7 @@ const axiosBaseQuery =
         params,
         timeout, // Allow custom timeout per request
       });
-      return { data: result.data };
+      return { data: result.data, meta: { headers: result.headers } };
     } catch (axiosError: any) {
       const err = axiosError;
       return {
@@ -64,10 +64,22 @@ export const urlsApi = createApi({
   tagTypes: ['URL'],
   endpoints: (builder) => ({
     getURLs: builder.query<MonitoredURL[], { project_id?: number; active_only?: boolean }>({
-      query: ({ project_id, active_only = true }) => ({
-        url: '/api/urls',
-        params: { project_id, active_only },
-      }),
+      // /api/urls is paged; follow X-Next-After until the last page so the
+      // list stays complete
+      queryFn: async ({ project_id, active_only = true }, _api, _extraOptions, baseQuery) => {
+        const urls: MonitoredURL[] = [];
+        let after_id: string | undefined;
+        do {
+          const result = await baseQuery({
+            url: '/api/urls',
+            params: { project_id, active_only, limit: 500, after_id },
+          });
+          if (result.error) return { error: result.error };
+          urls.push(...(result.data as MonitoredURL[]));
+          after_id = result.meta?.headers['x-next-after'] as string | undefined;
+        } while (after_id);
+        return { data: urls };
+      },
       providesTags: (result) =>
         result
           ? [
@@ -12,6 +12,19 @@ interface Props {
 
 type TabType = 'manual' | 'upload';
 
+const UPLOAD_POLL_INTERVAL_MS = 2000;
+// Stop polling after 20 minutes; the server fails a job stalled for 15
+const UPLOAD_POLL_TIMEOUT_MS = 20 * 60 * 1000;
+
+interface UploadJob {
+  job_id: number;
+  status: 'pending' | 'running' | 'completed' | 'failed';
+  status_url?: string | null;
+  progress?: string | null;
+  result?: unknown;
+  error?: string | null;
+}
+
 export default function AddLegislationModal({ stateCode, onClose }: Props) {
   const dispatch = useDispatch();
   const [activeTab, setActiveTab] = useState<TabType>('upload');
@@ -26,6 +39,7 @@ export default function AddLegislationModal({ stateCode, onClose }: Props) {
   const [isDragging, setIsDragging] = useState(false);
   const [uploadLoading, setUploadLoading] = useState(false);
   const [uploadError, setUploadError] = useState<string | null>(null);
+  const [uploadProgress, setUploadProgress] = useState<string | null>(null);
   const [uploadSuccess, setUploadSuccess] = useState(false);
   const fileInputRef = useRef<HTMLInputElement>(null);
 
@@ -108,13 +122,34 @@ export default function AddLegislationModal({ stateCode, onClose }: Props) {
       formData.append('file', uploadFile);
       formData.append('state_code', stateCode);
 
-      const response = await apiClient.post('/api/states/legislation/upload', formData, {
+      const { data: started } = await apiClient.post<UploadJob>('/api/states/legislation/upload', formData, {
         headers: {
           'Content-Type': 'multipart/form-data',
         },
       });
 
-      console.log('Upload success:', response.data);
+      // Digesting runs as a background job; poll it until it finishes or the
+      // timeout passes
+      let job = started;
+      const deadline = Date.now() + UPLOAD_POLL_TIMEOUT_MS;
+      while (job.status === 'pending' || job.status === 'running') {
+        if (Date.now() >= deadline) {
+          throw new Error('Digesting is taking too long. Check the legislation list later.');
+        }
+        await new Promise((resolve) => setTimeout(resolve, UPLOAD_POLL_INTERVAL_MS));
+        ({ data: job } = await apiClient.get<UploadJob>(
+          `/api/states/legislation/jobs/${started.job_id}`
+        ));
+        if (job.progress) {
+          setUploadProgress(`${job.progress}...`);
+        }
+      }
+
+      if (job.status === 'failed') {
+        throw new Error(job.error || 'Failed to upload and digest document');
+      }
+
+      console.log('Upload success:', job.result);
 
       // Invalidate RTK Query cache to refresh legislation list
       dispatch(apiSlice.util.invalidateTags(['States']));
@@ -123,9 +158,12 @@ export default function AddLegislationModal({ stateCode, onClose }: Props) {
       setUploadSuccess(true);
     } catch (error: any) {
       console.error('Upload failed:', error);
-      setUploadError(error.response?.data?.detail || 'Failed to upload and digest document');
+      setUploadError(
+        error.response?.data?.detail || error.response?.data?.error || error.message || 'Failed to upload and digest document'
+      );
     } finally {
       setUploadLoading(false);
+      setUploadProgress(null);
     }
   };
 
@@ -261,7 +299,7 @@ export default function AddLegislationModal({ stateCode, onClose }: Props) {
                 onClick={handleUploadSubmit}
                 disabled={!uploadFile || uploadLoading}
               >
-                {uploadLoading ? 'Uploading & Digesting...' : 'Upload & Digest'}
+                {uploadLoading ? uploadProgress || 'Uploading & Digesting...' : 'Upload & Digest'}
               </button>
             </div>
           </div>
@@ -13,7 +13,7 @@ const axiosBaseQuery =
         data: body || data, // RTK Query uses 'body', axios uses 'data'
         params,
       });
-      return { data: result.data };
+      return { data: result.data, meta: { headers: result.headers } };
     } catch (axiosError: any) {
       const err = axiosError;
       return {
@@ -155,10 +155,22 @@ export const apiSlice = createApi({
 
     // URLs
     getURLs: builder.query<URL[], { project_id?: number; active_only?: boolean }>({
-      query: (params) => ({
-        url: '/api/urls',
-        params,
-      }),
+      // /api/urls is paged; follow X-Next-After until the last page so the
+      // list stays complete
+      queryFn: async (params, _api, _extraOptions, baseQuery) => {
+        const urls: URL[] = [];
+        let after_id: string | undefined;
+        do {
+          const result = await baseQuery({
+            url: '/api/urls',
+            params: { limit: 500, ...params, after_id },
+          });
+          if (result.error) return { error: result.error };
+          urls.push(...(result.data as URL[]));
+          after_id = result.meta?.headers['x-next-after'] as string | undefined;
+        } while (after_id);
+        return { data: urls };
+      },
       providesTags: ['URL'],
     }),
     getURL: builder.query<URL, number>({
@@ -0,0 +1,36 @@
+"""Add refresh token session index
+
+Revision ID: 20251029_001
+Revises: 20251028_002
+Create Date: 2025-10-29
+
+Adds idx_refresh_tokens_user_expires for listing a user's sessions by
+expiry. Lookups by token_hash (/refresh, /logout) already seek through the
+column's UNIQUE constraint index and need nothing extra.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+revision: str = '20251029_001'
+down_revision: Union[str, None] = '20251028_002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create refresh token session index."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user_expires
+        ON refresh_tokens(user_id, expires_at)
+    """))
+
+
+def downgrade() -> None:
+    """Drop refresh token session index."""
+    conn = op.get_bind()
+
+    conn.execute(text("DROP INDEX IF EXISTS idx_refresh_tokens_user_expires"))
@@ -0,0 +1,44 @@
+"""Add compliance check lookup indexes
+
+Revision ID: 20251029_002
+Revises: 20251029_001
+Create Date: 2025-10-29
+
+compliance_checks and its child tables had no secondary indexes, so the
+check read paths scanned whole tables:
+- idx_compliance_checks_url_checked: latest check for a URL
+  (WHERE url = ? ORDER BY checked_at DESC LIMIT 1) becomes a single seek
+  with no sort step
+- idx_violations_check / idx_visual_verifications_check: child rows for a
+  check_id
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+revision: str = '20251029_002'
+down_revision: Union[str, None] = '20251029_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create compliance check indexes."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_compliance_checks_url_checked
+        ON compliance_checks(url, checked_at DESC)
+    """))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_violations_check ON violations(check_id)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_visual_verifications_check ON visual_verifications(check_id)"))
+
+
+def downgrade() -> None:
+    """Drop compliance check indexes."""
+    conn = op.get_bind()
+
+    conn.execute(text("DROP INDEX IF EXISTS idx_visual_verifications_check"))
+    conn.execute(text("DROP INDEX IF EXISTS idx_violations_check"))
+    conn.execute(text("DROP INDEX IF EXISTS idx_compliance_checks_url_checked"))
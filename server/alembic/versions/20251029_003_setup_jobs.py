@@ -0,0 +1,47 @@
+"""Add setup_jobs table
+
+Revision ID: 20251029_003
+Revises: 20251029_002
+Create Date: 2025-10-29
+
+Intelligent project setup (scrape + several LLM calls) now runs as a
+background job. setup_jobs tracks each run's status, current step and the
+final result or error so the client can poll for it.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+revision: str = '20251029_003'
+down_revision: Union[str, None] = '20251029_002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create setup_jobs table."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS setup_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending'
+                CHECK(status IN ('pending', 'running', 'completed', 'failed')),
+            progress TEXT,
+            result TEXT,
+            error TEXT,
+            created_by INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (created_by) REFERENCES users(id)
+        )
+    """))
+
+
+def downgrade() -> None:
+    """Drop setup_jobs table."""
+    conn = op.get_bind()
+
+    conn.execute(text("DROP TABLE IF EXISTS setup_jobs"))
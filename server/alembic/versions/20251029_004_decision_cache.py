@@ -0,0 +1,43 @@
+"""Add decision_cache table
+
+Revision ID: 20251029_004
+Revises: 20251029_003
+Create Date: 2025-10-29
+
+Pages on the same dealership template often produce identical LLM input.
+decision_cache stores the finished text + visual analysis keyed by
+(template_id, state_code, content_hash) so a re-check of identical content
+skips the LLM and visual verification steps.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+revision: str = '20251029_004'
+down_revision: Union[str, None] = '20251029_003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create decision_cache table."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS decision_cache (
+            template_id TEXT NOT NULL,
+            state_code TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            result TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (template_id, state_code, content_hash)
+        )
+    """))
+
+
+def downgrade() -> None:
+    """Drop decision_cache table."""
+    conn = op.get_bind()
+
+    conn.execute(text("DROP TABLE IF EXISTS decision_cache"))
@@ -0,0 +1,36 @@
+"""Add partial index for active page types
+
+Revision ID: 20251029_005
+Revises: 20251029_004
+Create Date: 2025-10-29
+
+GET /api/page-types/ lists active page types with
+WHERE active = 1 ORDER BY name. A partial index on name over the active rows
+lets SQLite walk them in order with no filter or sort step.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+revision: str = '20251029_005'
+down_revision: Union[str, None] = '20251029_004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create active page types index."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_page_types_active_name
+        ON page_types(name) WHERE active = 1
+    """))
+
+
+def downgrade() -> None:
+    """Drop active page types index."""
+    conn = op.get_bind()
+
+    conn.execute(text("DROP INDEX IF EXISTS idx_page_types_active_name"))
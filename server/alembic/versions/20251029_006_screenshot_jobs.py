@@ -0,0 +1,48 @@
+"""Add screenshot_jobs table
+
+Revision ID: 20251029_006
+Revises: 20251029_005
+Create Date: 2025-10-29
+
+Project screenshot captures were plain in-process background tasks and were
+lost if the worker restarted. Each capture is now recorded in
+screenshot_jobs; unfinished jobs are picked up again at startup.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+revision: str = '20251029_006'
+down_revision: Union[str, None] = '20251029_005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create screenshot_jobs table."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS screenshot_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending'
+                CHECK(status IN ('pending', 'running', 'completed', 'failed')),
+            screenshot_path TEXT,
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (project_id) REFERENCES projects(id)
+        )
+    """))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_screenshot_jobs_status ON screenshot_jobs(status)"))
+
+
+def downgrade() -> None:
+    """Drop screenshot_jobs table."""
+    conn = op.get_bind()
+
+    conn.execute(text("DROP INDEX IF EXISTS idx_screenshot_jobs_status"))
+    conn.execute(text("DROP TABLE IF EXISTS screenshot_jobs"))
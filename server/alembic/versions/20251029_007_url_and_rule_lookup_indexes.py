@@ -0,0 +1,55 @@
+"""Add URL and legislation rule lookup indexes
+
+Revision ID: 20251029_007
+Revises: 20251029_006
+Create Date: 2025-10-29
+
+GET /api/urls/ filters on project_id and active. The only index on urls is
+the UNIQUE(url) autoindex, which doesn't serve that lookup, so it scanned
+the table.
+GET /api/rules/legislation/{source_id} filters on legislation_source_id and
+orders by created_at DESC; extending that index with created_at lets SQLite
+return the rows in order without a sort step, so the single-column index is
+replaced. template_rules lookups by (template_id, rule_key) are already
+covered by the table's UNIQUE constraint.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+revision: str = '20251029_007'
+down_revision: Union[str, None] = '20251029_006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create URL and legislation rule indexes."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_urls_project_active
+        ON urls(project_id, active)
+    """))
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_rules_legislation_source_created
+        ON rules(legislation_source_id, created_at DESC)
+    """))
+    conn.execute(text("DROP INDEX IF EXISTS idx_rules_legislation_source"))
+
+    # Refresh planner statistics so the new indexes are picked up
+    conn.execute(text("ANALYZE"))
+
+
+def downgrade() -> None:
+    """Restore the previous indexes."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_rules_legislation_source
+        ON rules(legislation_source_id)
+    """))
+    conn.execute(text("DROP INDEX IF EXISTS idx_rules_legislation_source_created"))
+    conn.execute(text("DROP INDEX IF EXISTS idx_urls_project_active"))
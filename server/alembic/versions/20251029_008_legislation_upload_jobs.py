@@ -0,0 +1,49 @@
+"""Add legislation_upload_jobs table
+
+Revision ID: 20251029_008
+Revises: 20251029_007
+Create Date: 2025-10-29
+
+Legislation uploads (text extraction plus two LLM calls and the source,
+digest and rule inserts) now run as a background job instead of holding
+the upload request open. legislation_upload_jobs tracks each run's status,
+current step and the final result or error so the client can poll for it.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+revision: str = '20251029_008'
+down_revision: Union[str, None] = '20251029_007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create legislation_upload_jobs table."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS legislation_upload_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            state_code TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending'
+                CHECK(status IN ('pending', 'running', 'completed', 'failed')),
+            progress TEXT,
+            result TEXT,
+            error TEXT,
+            created_by INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (created_by) REFERENCES users(id)
+        )
+    """))
+
+
+def downgrade() -> None:
+    """Drop legislation_upload_jobs table."""
+    conn = op.get_bind()
+
+    conn.execute(text("DROP TABLE IF EXISTS legislation_upload_jobs"))
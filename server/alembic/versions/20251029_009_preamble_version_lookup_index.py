@@ -0,0 +1,47 @@
+"""Add composite preamble version lookup index
+
+Revision ID: 20251029_009
+Revises: 20251029_008
+Create Date: 2025-10-29
+
+PreambleService._get_active_version joins preambles to preamble_versions on
+preamble_id, filters status = 'active' and takes the highest version_number.
+With (preamble_id, status, version_number DESC) SQLite finds the active
+version without filtering or sorting, and the index is a left-prefix superset
+of idx_preamble_versions_preamble, which is dropped. The composition cache is
+looked up by composition_hash, already covered by its UNIQUE constraint.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+revision: str = '20251029_009'
+down_revision: Union[str, None] = '20251029_008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace the single-column preamble version index with a composite one."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_preamble_versions_preamble_status
+        ON preamble_versions(preamble_id, status, version_number DESC)
+    """))
+    conn.execute(text("DROP INDEX IF EXISTS idx_preamble_versions_preamble"))
+
+    # Refresh planner statistics so the new index is picked up
+    conn.execute(text("ANALYZE preamble_versions"))
+
+
+def downgrade() -> None:
+    """Restore the previous index."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_preamble_versions_preamble
+        ON preamble_versions(preamble_id)
+    """))
+    conn.execute(text("DROP INDEX IF EXISTS idx_preamble_versions_preamble_status"))
@@ -0,0 +1,76 @@
+"""Store preamble composition hashes as 64-bit integers
+
+Revision ID: 20251029_010
+Revises: 20251029_009
+Create Date: 2025-10-29
+
+preamble_compositions.composition_hash held a 64-character SHA-256 hex digest.
+It now holds the signed 64-bit BLAKE2b digest of the same cache key, so the
+UNIQUE index compares 8-byte integers instead of long strings. SQLite can't
+change a column's type in place, and the table is only a cache that
+PreambleService refills on the next miss, so both cache tables are dropped and
+recreated empty. The separate idx_preamble_compositions_hash duplicated the
+UNIQUE constraint's own index and is not recreated.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+revision: str = '20251029_010'
+down_revision: Union[str, None] = '20251029_009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _recreate_composition_tables(conn, hash_type: str) -> None:
+    """Drop and recreate the (disposable) composition cache tables."""
+    conn.execute(text("DROP TABLE IF EXISTS preamble_composition_deps"))
+    conn.execute(text("DROP TABLE IF EXISTS preamble_compositions"))
+
+    conn.execute(text(f"""
+        CREATE TABLE preamble_compositions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            composition_hash {hash_type} NOT NULL UNIQUE,
+            template_id INTEGER NOT NULL,
+            universal_version_id INTEGER,
+            state_version_id INTEGER,
+            page_type_version_id INTEGER,
+            project_version_id INTEGER,
+            composed_text TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            hit_count INTEGER DEFAULT 0,
+            FOREIGN KEY (template_id) REFERENCES preamble_templates(id),
+            FOREIGN KEY (universal_version_id) REFERENCES preamble_versions(id),
+            FOREIGN KEY (state_version_id) REFERENCES preamble_versions(id),
+            FOREIGN KEY (page_type_version_id) REFERENCES preamble_versions(id),
+            FOREIGN KEY (project_version_id) REFERENCES preamble_versions(id)
+        )
+    """))
+
+    conn.execute(text("""
+        CREATE TABLE preamble_composition_deps (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            composition_id INTEGER NOT NULL,
+            depends_on_version_id INTEGER NOT NULL,
+            FOREIGN KEY (composition_id) REFERENCES preamble_compositions(id) ON DELETE CASCADE,
+            FOREIGN KEY (depends_on_version_id) REFERENCES preamble_versions(id) ON DELETE CASCADE,
+            UNIQUE(composition_id, depends_on_version_id)
+        )
+    """))
+
+
+def upgrade() -> None:
+    """Recreate the composition cache with an INTEGER hash column."""
+    conn = op.get_bind()
+    _recreate_composition_tables(conn, "INTEGER")
+
+
+def downgrade() -> None:
+    """Recreate the composition cache with the TEXT hash column and its index."""
+    conn = op.get_bind()
+    _recreate_composition_tables(conn, "TEXT")
+    conn.execute(text(
+        "CREATE INDEX idx_preamble_compositions_hash ON preamble_compositions(composition_hash)"
+    ))
@@ -0,0 +1,36 @@
+"""Add a change counter to templates
+
+Revision ID: 20251029_011
+Revises: 20251029_010
+Create Date: 2025-10-29
+
+The template ETags were built from row counts, MAX(id) and the
+second-resolution updated_at/verified_date timestamps, so two rule updates
+within the same second produced the same ETag and clients kept the stale rule.
+templates.version is bumped by every write to a template or its rules and
+replaces those timestamps in the fingerprint.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+revision: str = '20251029_011'
+down_revision: Union[str, None] = '20251029_010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add templates.version."""
+    conn = op.get_bind()
+    # ComplianceDatabase._create_tables adds the column too, so it may exist
+    columns = [row[1] for row in conn.execute(text("PRAGMA table_info(templates)"))]
+    if 'version' not in columns:
+        conn.execute(text("ALTER TABLE templates ADD COLUMN version INTEGER NOT NULL DEFAULT 0"))
+
+
+def downgrade() -> None:
+    """Drop templates.version."""
+    conn = op.get_bind()
+    conn.execute(text("ALTER TABLE templates DROP COLUMN version"))
@@ -0,0 +1,33 @@
+"""Index decision_cache by created_at
+
+Revision ID: 20251029_012
+Revises: 20251029_011
+Create Date: 2025-10-29
+
+Saving a decision now deletes entries older than DECISION_CACHE_TTL_DAYS.
+Before, those entries were only filtered out of reads and stayed in the table.
+The index lets that delete find expired rows without scanning the table.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+revision: str = '20251029_012'
+down_revision: Union[str, None] = '20251029_011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the decision_cache created_at index."""
+    conn = op.get_bind()
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS idx_decision_cache_created ON decision_cache(created_at)"
+    ))
+
+
+def downgrade() -> None:
+    """Drop the decision_cache created_at index."""
+    conn = op.get_bind()
+    conn.execute(text("DROP INDEX IF EXISTS idx_decision_cache_created"))
@@ -0,0 +1,34 @@
+"""Add screenshot_jobs.attempts
+
+Revision ID: 20251029_013
+Revises: 20251029_012
+Create Date: 2025-10-29
+
+A failed screenshot capture used to mark its job failed straight away. Jobs
+are now requeued with backoff until SCREENSHOT_MAX_ATTEMPTS captures have
+been tried, and attempts counts them.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+revision: str = '20251029_013'
+down_revision: Union[str, None] = '20251029_012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add screenshot_jobs.attempts."""
+    conn = op.get_bind()
+    # ComplianceDatabase._create_tables adds the column too, so it may exist
+    columns = [row[1] for row in conn.execute(text("PRAGMA table_info(screenshot_jobs)"))]
+    if 'attempts' not in columns:
+        conn.execute(text("ALTER TABLE screenshot_jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0"))
+
+
+def downgrade() -> None:
+    """Drop screenshot_jobs.attempts."""
+    conn = op.get_bind()
+    conn.execute(text("ALTER TABLE screenshot_jobs DROP COLUMN attempts"))
@@ -7,10 +7,12 @@ import os
 
 from core.database import ComplianceDatabase
 from api.dependencies import get_db, get_current_user
+from api.routes.checks import clear_check_cache
+from api.read_cache import clear_read_caches
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/demo", tags=["demo"])
+router = APIRouter(prefix="/demo", tags=["demo"], dependencies=[Depends(get_current_user)])
 
 # Check if we're in production
 IS_PRODUCTION = os.getenv("ENVIRONMENT", "development") == "production"
@@ -44,6 +46,7 @@ async def clear_all_rules(
 
         cursor.execute("DELETE FROM rules")
         db.conn.commit()
+        clear_read_caches()
 
         logger.warning(f"User {current_user.get('email')} deleted {count} rules")
 
@@ -123,10 +126,13 @@ async def clear_all_projects(
 
         # Delete in order (respecting foreign keys)
         cursor.execute("DELETE FROM compliance_checks")
+        cursor.execute("DELETE FROM decision_cache")
         cursor.execute("DELETE FROM urls")
         cursor.execute("DELETE FROM project_page_type_preambles")
         cursor.execute("DELETE FROM projects")
         db.conn.commit()
+        clear_check_cache()
+        clear_read_caches()
 
         logger.warning(f"User {current_user.get('email')} deleted {projects_count} projects, {urls_count} URLs, {checks_count} checks")
 
@@ -251,6 +257,7 @@ async def reset_to_clean_slate(
 
         # Delete in order (respecting foreign keys)
         cursor.execute("DELETE FROM compliance_checks")
+        cursor.execute("DELETE FROM decision_cache")
         cursor.execute("DELETE FROM urls")
         cursor.execute("DELETE FROM project_page_type_preambles")
         cursor.execute("DELETE FROM projects")
@@ -270,6 +277,8 @@ async def reset_to_clean_slate(
         cursor.execute("DELETE FROM users WHERE id != ?", (current_user_id,))
 
         db.conn.commit()
+        clear_check_cache()
+        clear_read_caches()
 
         total_deleted = sum(counts.values()) + other_users_count
 
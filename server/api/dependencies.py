@@ -1,5 +1,6 @@
 """Dependency injection for API routes."""
 
+from functools import lru_cache
 from typing import Generator, Optional, Dict
 import sys
 from pathlib import Path
@@ -8,39 +9,65 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.database import ComplianceDatabase
-from core.config import DATABASE_PATH
+from core.database import ComplianceDatabase, ConnectionPool, PoolTimeout
+from core.config import (
+    DATABASE_PATH,
+    DATABASE_POOL_SIZE,
+    DATABASE_POOL_MIN_SIZE,
+    DATABASE_POOL_TIMEOUT
+)
 from core.auth import decode_access_token
 from services.project_service import ProjectService
+from services.document_parser_service import DocumentParserService
 
 security = HTTPBearer()
 
+# Shared by every request in this worker process; see ConnectionPool
+db_pool = ConnectionPool(
+    DATABASE_PATH,
+    max_size=DATABASE_POOL_SIZE,
+    min_size=DATABASE_POOL_MIN_SIZE
+)
+
 
 def get_db() -> Generator[ComplianceDatabase, None, None]:
     """
-    Get database instance for dependency injection.
+    Get a pooled database instance for dependency injection.
+
+    FastAPI caches dependencies per request, so every Depends(get_db) in one
+    request (including nested ones) shares a single pooled connection.
 
     Yields:
         Database instance
 
+    Raises:
+        HTTPException: 503 if no connection frees up within DATABASE_POOL_TIMEOUT
+
     Usage in routes:
         @router.get("/")
         async def list_items(db: ComplianceDatabase = Depends(get_db)):
             ...
     """
-    db = ComplianceDatabase(DATABASE_PATH)
+    try:
+        db = db_pool.acquire(timeout=DATABASE_POOL_TIMEOUT)
+    except PoolTimeout:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database busy"
+        )
+
     try:
         yield db
     finally:
-        db.close()
+        db_pool.release(db)
 
 
-def get_project_service() -> Generator[ProjectService, None, None]:
+def get_project_service(db: ComplianceDatabase = Depends(get_db)) -> ProjectService:
     """
     Get project service instance for dependency injection.
 
-    Yields:
-        ProjectService instance
+    Returns:
+        ProjectService bound to the request's pooled connection
 
     Usage in routes:
         @router.post("/")
@@ -50,12 +77,18 @@ def get_project_service() -> Generator[ProjectService, None, None]:
         ):
             return service.create_project(project)
     """
-    db = ComplianceDatabase(DATABASE_PATH)
-    service = ProjectService(db)
-    try:
-        yield service
-    finally:
-        service.close()
+    return ProjectService(db)
+
+
+@lru_cache(maxsize=1)
+def get_document_parser() -> DocumentParserService:
+    """
+    Get the worker's shared document parser for dependency injection.
+
+    The parser holds no per-request state, so one instance (and its OpenAI
+    client) is reused across uploads and digests.
+    """
+    return DocumentParserService()
 
 
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
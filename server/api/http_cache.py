@@ -0,0 +1,40 @@
+"""HTTP validation caching (ETag / If-None-Match) for read endpoints."""
+
+import hashlib
+
+import orjson
+from fastapi import Request, Response
+
+# Clients may reuse a response briefly, then must revalidate with the ETag
+REVALIDATE_CACHE_CONTROL = "private, max-age=30, must-revalidate"
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from a version tuple or the response data itself."""
+    digest = hashlib.blake2b(
+        orjson.dumps(parts, default=str, option=orjson.OPT_SORT_KEYS),
+        digest_size=16
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names this ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    client_etags = {tag.strip() for tag in if_none_match.split(",")}
+    return etag in client_etags or "*" in client_etags
+
+
+def set_cache_headers(response: Response, etag: str):
+    """Attach the ETag and Cache-Control headers to a response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    """A 304 response carrying the current validators."""
+    response = Response(status_code=304)
+    set_cache_headers(response, etag)
+    return response
@@ -11,7 +11,7 @@ from core.llm_operations import get_all_operation_types, validate_operation_type
 from api.dependencies import get_db, get_current_user
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/llm", tags=["llm"])
+router = APIRouter(prefix="/llm", tags=["llm"], dependencies=[Depends(get_current_user)])
 
 
 # Schemas
@@ -81,8 +81,7 @@ async def list_llm_logs(
     operation_type: Optional[str] = None,
     model: Optional[str] = None,
     status: Optional[str] = None,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """List LLM logs with optional filtering."""
     cursor = db.conn.cursor()
@@ -165,8 +164,7 @@ async def list_llm_logs(
 @router.get("/logs/{log_id}", response_model=LLMLogResponse)
 async def get_llm_log(
     log_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Get a specific LLM log by ID."""
     cursor = db.conn.cursor()
@@ -213,8 +211,7 @@ async def get_llm_log(
 
 @router.get("/stats", response_model=LLMStatsResponse)
 async def get_llm_stats(
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Get aggregate LLM usage statistics."""
     cursor = db.conn.cursor()
@@ -299,18 +296,14 @@ async def get_llm_stats(
 
 # Operation Types Endpoint
 @router.get("/operations", response_model=List[Dict])
-async def get_operation_types(
-    current_user: Dict = Depends(get_current_user)
-):
+async def get_operation_types():
     """Get list of all LLM operation types with metadata."""
     return get_all_operation_types()
 
 
 # Available Models Endpoint
 @router.get("/models/available", response_model=List[str])
-async def get_available_models(
-    current_user: Dict = Depends(get_current_user)
-):
+async def get_available_models():
     """Get list of available OpenAI models."""
     # TODO: In the future, fetch this from OpenAI API
     # For now, return a curated list of models we support with pricing
@@ -325,8 +318,7 @@ async def get_available_models(
 # Model Configuration Endpoints
 @router.get("/models", response_model=ModelConfigsListResponse)
 async def list_model_configs(
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """List all model configurations."""
     cursor = db.conn.cursor()
@@ -355,8 +347,7 @@ async def list_model_configs(
 async def update_model_config(
     operation_type: str,
     update_data: ModelConfigUpdate,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Update the model for a specific operation type."""
     cursor = db.conn.cursor()
@@ -2,9 +2,10 @@
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import logging
+import sqlite3
 import sys
 from pathlib import Path
 import os
@@ -14,6 +15,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from api.routes import projects, urls, checks, templates, reports, auth, page_types
 from api import states, preambles, rules, demo, llm
+from api.dependencies import db_pool
+from services.screenshot_service import resume_screenshot_jobs
+from services.scan_service import close_checkers
+from services.document_parser_service import shutdown_pdf_pool
 from core.config import CORS_ORIGINS, IS_PRODUCTION
 
 logging.basicConfig(level=logging.INFO)
@@ -49,6 +54,7 @@ app = FastAPI(
     Currently supporting: **CA, TX, NY, OK**
     """,
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     contact={
         "name": "AutoAudit Support",
         "email": "support@autoaudit.example.com",
@@ -66,6 +72,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-After"],
 )
 logger.info(f"CORS origins: {CORS_ORIGINS}")
 
@@ -109,6 +116,63 @@ async def health_check():
     }
 
 
+@app.on_event("startup")
+def warm_db_pool():
+    """Open pooled database connections before the first request."""
+    db_pool.warm()
+
+
+@app.on_event("startup")
+async def resume_screenshots():
+    """Pick up screenshot jobs interrupted by the last shutdown or crash."""
+    with db_pool.connection() as db:
+        resume_screenshot_jobs(db)
+
+
+@app.on_event("startup")
+def fail_orphaned_setup_jobs():
+    """Fail intelligent setup jobs whose worker died before finishing them."""
+    with db_pool.connection() as db:
+        try:
+            failed = db.fail_stale_setup_jobs()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Skipping setup job sweep: {e}")
+            return
+    if failed:
+        logger.info(f"Marked {failed} interrupted setup job(s) as failed")
+
+
+@app.on_event("startup")
+def fail_orphaned_upload_jobs():
+    """Fail legislation upload jobs whose worker died before finishing them."""
+    with db_pool.connection() as db:
+        try:
+            failed = db.fail_stale_legislation_upload_jobs()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Skipping upload job sweep: {e}")
+            return
+    if failed:
+        logger.info(f"Marked {failed} interrupted upload job(s) as failed")
+
+
+@app.on_event("shutdown")
+def close_db_pool():
+    """Close pooled database connections when the worker exits."""
+    db_pool.close()
+
+
+@app.on_event("shutdown")
+async def close_compliance_checkers():
+    """Close the per-state compliance checkers' clients."""
+    await close_checkers()
+
+
+@app.on_event("shutdown")
+def close_pdf_pool():
+    """Stop the PDF page extraction processes."""
+    shutdown_pdf_pool()
+
+
 # Error handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
@@ -137,4 +201,4 @@ async def general_exception_handler(request, exc):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
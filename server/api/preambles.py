@@ -1,10 +1,15 @@
 """API routes for preamble management."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List, Optional, Dict
-
-from core.database import ComplianceDatabase
-from api.dependencies import get_db, get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel
+from typing import List, Optional
+import orjson
+
+from core.config import DATABASE_POOL_TIMEOUT
+from core.database import ComplianceDatabase, PoolTimeout
+from api.dependencies import get_db, get_current_user, db_pool
 from services.preamble_management_service import PreambleManagementService
 from services.preamble_service import PreambleService
 from schemas.preamble import (
@@ -17,15 +22,27 @@ from schemas.preamble import (
     PreambleCompositionRequest, PreambleCompositionResponse
 )
 
-router = APIRouter(prefix="/preambles", tags=["preambles"])
+router = APIRouter(prefix="/preambles", tags=["preambles"], dependencies=[Depends(get_current_user)])
+
+
+def _list_response(key: str, items: List[BaseModel]) -> Response:
+    """Serialize a list endpoint payload with orjson.
+
+    Returning a Response directly skips FastAPI's jsonable_encoder pass over
+    every item; response_model on the route is kept for the OpenAPI schema.
+    """
+    payload = orjson.dumps({
+        key: [item.model_dump(mode="json") for item in items],
+        "total": len(items)
+    })
+    return Response(content=payload, media_type="application/json")
 
 
 # Templates
 @router.post("/templates", response_model=PreambleTemplateResponse, status_code=status.HTTP_201_CREATED)
 async def create_template(
     template_data: PreambleTemplateCreate,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Create a new preamble template."""
     service = PreambleManagementService(db)
@@ -37,20 +54,18 @@ async def create_template(
 
 @router.get("/templates", response_model=PreambleTemplatesListResponse)
 async def list_templates(
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """List all preamble templates."""
     service = PreambleManagementService(db)
     templates = service.list_templates()
-    return PreambleTemplatesListResponse(templates=templates, total=len(templates))
+    return _list_response("templates", templates)
 
 
 @router.get("/templates/{template_id}", response_model=PreambleTemplateResponse)
 async def get_template(
     template_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Get a preamble template by ID."""
     service = PreambleManagementService(db)
@@ -64,8 +79,7 @@ async def get_template(
 @router.post("", response_model=PreambleResponse, status_code=status.HTTP_201_CREATED)
 async def create_preamble(
     preamble_data: PreambleCreate,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Create a new preamble with initial version."""
     service = PreambleManagementService(db)
@@ -76,30 +90,67 @@ async def create_preamble(
 
 
 @router.get("", response_model=PreamblesListResponse)
-async def list_preambles(
+def list_preambles(
     scope: Optional[str] = None,
     state_code: Optional[str] = None,
     page_type_code: Optional[str] = None,
-    project_id: Optional[int] = None,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    project_id: Optional[int] = None
 ):
-    """List preambles with optional filters."""
-    service = PreambleManagementService(db)
-    preambles = service.list_preambles(
-        scope=scope,
-        state_code=state_code,
-        page_type_code=page_type_code,
-        project_id=project_id
+    """
+    List preambles with optional filters.
+
+    The JSON array is streamed as rows are read. The body is produced after
+    dependency teardown, so the route borrows its own pooled connection
+    instead of using get_db. It is acquired here, before the response
+    starts, so a busy pool is a 503 rather than a truncated 200.
+    """
+    try:
+        db = db_pool.acquire(timeout=DATABASE_POOL_TIMEOUT)
+    except PoolTimeout:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database busy"
+        )
+
+    released = False
+
+    def release():
+        # Called when the stream ends, and again as the response's background
+        # task in case the client left before the stream started
+        nonlocal released
+        if not released:
+            released = True
+            db_pool.release(db)
+
+    def stream():
+        try:
+            service = PreambleManagementService(db)
+            total = 0
+            yield b'{"preambles":['
+            for preamble in service.iter_preambles(
+                scope=scope,
+                state_code=state_code,
+                page_type_code=page_type_code,
+                project_id=project_id
+            ):
+                prefix = b',' if total else b''
+                yield prefix + orjson.dumps(preamble.model_dump(mode="json"))
+                total += 1
+            yield b'],"total":' + str(total).encode() + b'}'
+        finally:
+            release()
+
+    return StreamingResponse(
+        stream(),
+        media_type="application/json",
+        background=BackgroundTask(release)
     )
-    return PreamblesListResponse(preambles=preambles, total=len(preambles))
 
 
 @router.get("/{preamble_id}", response_model=PreambleResponse)
 async def get_preamble(
     preamble_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Get a preamble by ID."""
     service = PreambleManagementService(db)
@@ -114,8 +165,7 @@ async def get_preamble(
 async def create_version(
     preamble_id: int,
     version_data: PreambleVersionCreate,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Create a new version of a preamble."""
     service = PreambleManagementService(db)
@@ -136,20 +186,18 @@ async def create_version(
 @router.get("/{preamble_id}/versions", response_model=PreambleVersionsListResponse)
 async def list_versions(
     preamble_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """List all versions of a preamble."""
     service = PreambleManagementService(db)
     versions = service.list_versions(preamble_id)
-    return PreambleVersionsListResponse(versions=versions, total=len(versions))
+    return _list_response("versions", versions)
 
 
 @router.get("/versions/{version_id}", response_model=PreambleVersionResponse)
 async def get_version(
     version_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Get a preamble version by ID."""
     service = PreambleManagementService(db)
@@ -162,8 +210,7 @@ async def get_version(
 @router.patch("/versions/{version_id}/activate", response_model=PreambleVersionResponse)
 async def activate_version(
     version_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Activate a preamble version (retires current active version and invalidates caches)."""
     service = PreambleManagementService(db)
@@ -177,8 +224,7 @@ async def activate_version(
 @router.post("/test-runs", response_model=PreambleTestRunResponse, status_code=status.HTTP_201_CREATED)
 async def create_test_run(
     test_data: PreambleTestRunCreate,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Create a new test run record."""
     service = PreambleManagementService(db)
@@ -191,20 +237,18 @@ async def create_test_run(
 @router.get("/test-runs", response_model=PreambleTestRunsListResponse)
 async def list_test_runs(
     preamble_version_id: Optional[int] = None,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """List test runs, optionally filtered by version."""
     service = PreambleManagementService(db)
     test_runs = service.list_test_runs(preamble_version_id=preamble_version_id)
-    return PreambleTestRunsListResponse(test_runs=test_runs, total=len(test_runs))
+    return _list_response("test_runs", test_runs)
 
 
 @router.get("/test-runs/{test_id}", response_model=PreambleTestRunResponse)
 async def get_test_run(
     test_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Get a test run by ID."""
     service = PreambleManagementService(db)
@@ -217,8 +261,7 @@ async def get_test_run(
 @router.get("/versions/{version_id}/performance", response_model=PreambleVersionPerformanceResponse)
 async def get_version_performance(
     version_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Get performance metrics for a preamble version."""
     service = PreambleManagementService(db)
@@ -232,8 +275,7 @@ async def get_version_performance(
 @router.post("/compose", response_model=PreambleCompositionResponse)
 async def compose_preamble(
     request: PreambleCompositionRequest,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Compose a preamble for a specific project and page type."""
     service = PreambleService(db)
@@ -0,0 +1,53 @@
+"""Short-lived caches for single-row reads in the sync route handlers."""
+
+import copy
+import threading
+from typing import Callable, Hashable, List
+
+from cachetools import TTLCache
+
+_caches: List["ReadCache"] = []
+
+
+class ReadCache:
+    """
+    A small TTL cache that collapses bursts of reads of the same row.
+
+    Sync handlers run in the threadpool, so access is guarded by a lock.
+    Mutation handlers evict the keys they touch; anything written elsewhere
+    (the scheduler, another worker) is at most `ttl` seconds stale.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 10):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        _caches.append(self)
+
+    def get(self, key: Hashable, load: Callable[[], object]):
+        """Return a copy of the cached value, loading it on a miss. None isn't cached."""
+        with self._lock:
+            value = self._cache.get(key)
+        if value is None:
+            value = load()
+            if value is None:
+                return None
+            with self._lock:
+                self._cache[key] = value
+        # Callers may mutate what they get back (e.g. attach rules)
+        return copy.copy(value)
+
+    def evict(self, key: Hashable):
+        """Drop one key, after the row it caches was changed."""
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def clear(self):
+        """Drop every key (after bulk changes)."""
+        with self._lock:
+            self._cache.clear()
+
+
+def clear_read_caches():
+    """Clear every ReadCache (after bulk deletes such as the demo resets)."""
+    for cache in _caches:
+        cache.clear()
@@ -0,0 +1,46 @@
+"""JSON responses built from DB rows without Pydantic validation."""
+
+from typing import Dict, Iterable, List, Optional
+
+import orjson
+from fastapi import Response
+
+
+def _bool_fields(model) -> set:
+    return {name for name, field in model.model_fields.items() if field.annotation is bool}
+
+
+def project_row(model, row: Dict) -> Dict:
+    """
+    Project a DB row onto `model`'s fields, without running validation.
+
+    Rows come straight from our own tables, so they only need SQLite's 0/1
+    booleans converted back to bool. Columns the model lacks are dropped.
+    """
+    bools = _bool_fields(model)
+    return {name: bool(row[name]) if name in bools else row.get(name) for name in model.model_fields}
+
+
+def json_response(
+    payload,
+    headers: Optional[Dict[str, str]] = None,
+    status_code: int = 200
+) -> Response:
+    """Encode an already-shaped payload with orjson, bypassing response_model."""
+    return Response(
+        content=orjson.dumps(payload),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers
+    )
+
+
+def rows_response(model, rows: Iterable[Dict]) -> Response:
+    """Encode DB rows as a list of `model` without running Pydantic validation."""
+    fields = tuple(model.model_fields)
+    bools = _bool_fields(model)
+    payload: List[Dict] = [
+        {name: bool(row[name]) if name in bools else row.get(name) for name in fields}
+        for row in rows
+    ]
+    return json_response(payload)
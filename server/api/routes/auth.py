@@ -11,33 +11,31 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from schemas.user import UserCreate, UserLogin, User, Token, TokenData
 from core.database import ComplianceDatabase
-from core.config import DATABASE_PATH, COOKIE_SECURE, COOKIE_SAMESITE
+from core.config import COOKIE_SECURE, COOKIE_SAMESITE
 from core.auth import (
     hash_password,
     verify_password,
+    password_needs_rehash,
     create_access_token,
     decode_access_token,
     create_token_pair,
     hash_refresh_token,
+    legacy_hash_refresh_token,
     get_refresh_token_expiry
 )
+from api.dependencies import get_db
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 security = HTTPBearer()
 
-# Dependency to get database instance
-def get_db():
-    db = ComplianceDatabase(DATABASE_PATH)
-    try:
-        yield db
-    finally:
-        db.close()
-
 
+# register and refresh_token are sync so FastAPI runs them in the threadpool:
+# db.transaction() takes a blocking write lock (and hashing is CPU-bound),
+# which must not be waited on from the event loop
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
-async def register(
+def register(
     user_data: UserCreate,
     request: Request,
     response: Response,
@@ -63,41 +61,32 @@ async def register(
     # Hash password
     password_hash = hash_password(user_data.password)
 
-    # Create user
-    user_id = db.create_user(
-        email=user_data.email,
-        password_hash=password_hash,
-        full_name=user_data.full_name
-    )
-
-    # Get created user
-    user = db.get_user(user_id=user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create user"
-        )
-
-    # Create token pair (access + refresh)
-    token_pair = create_token_pair(
-        user_data={"user_id": user["id"], "email": user["email"]}
-    )
-
-    # Hash and save refresh token to database
-    refresh_token_hash = hash_refresh_token(token_pair["refresh_token"])
-    refresh_token_expiry = get_refresh_token_expiry()
-
     # Get device info and IP address
     device_info = request.headers.get("user-agent", "Unknown")
     ip_address = request.client.host if request.client else "Unknown"
 
-    db.save_refresh_token(
-        user_id=user["id"],
-        token_hash=refresh_token_hash,
-        expires_at=refresh_token_expiry,
-        device_info=device_info,
-        ip_address=ip_address
-    )
+    # Create user and issue the refresh token in one transaction (single commit)
+    with db.transaction():
+        # INSERT ... RETURNING gives us the stored row without a follow-up SELECT
+        user = db.create_user(
+            email=user_data.email,
+            password_hash=password_hash,
+            full_name=user_data.full_name
+        )
+
+        # Create token pair (access + refresh)
+        token_pair = create_token_pair(
+            user_data={"user_id": user["id"], "email": user["email"]}
+        )
+
+        # Hash and save refresh token to database
+        db.save_refresh_token(
+            user_id=user["id"],
+            token_hash=hash_refresh_token(token_pair["refresh_token"]),
+            expires_at=get_refresh_token_expiry(),
+            device_info=device_info,
+            ip_address=ip_address
+        )
 
     # Set refresh token as httpOnly cookie (XSS protection)
     # Security settings configured via ENVIRONMENT variable
@@ -127,8 +116,10 @@ async def register(
     }
 
 
+# Sync for the same reason: Argon2 verification, and the rehash of users with
+# older parameters, are deliberately slow CPU work
 @router.post("/login", response_model=Token)
-async def login(
+def login(
     credentials: UserLogin,
     request: Request,
     response: Response,
@@ -165,6 +156,10 @@ async def login(
             detail="User account is inactive"
         )
 
+    # Upgrade hashes made with older Argon2 parameters while we have the password
+    if password_needs_rehash(user["password_hash"]):
+        db.update_user(user["id"], password_hash=hash_password(credentials.password))
+
     # Create token pair (access + refresh)
     token_pair = create_token_pair(
         user_data={"user_id": user["id"], "email": user["email"]}
@@ -215,7 +210,7 @@ async def login(
 
 
 @router.post("/refresh", response_model=Token)
-async def refresh_token(
+def refresh_token(
     request: Request,
     response: Response,
     db: ComplianceDatabase = Depends(get_db)
@@ -244,8 +239,12 @@ async def refresh_token(
     # Hash the token to look it up in database
     token_hash = hash_refresh_token(refresh_token)
 
-    # Get token from database
+    # Get token from database, falling back to the pre-BLAKE2b hash so tokens
+    # issued before the switch keep working until they expire
     stored_token = db.get_refresh_token(token_hash)
+    if not stored_token:
+        token_hash = legacy_hash_refresh_token(refresh_token)
+        stored_token = db.get_refresh_token(token_hash)
     if not stored_token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -275,9 +274,6 @@ async def refresh_token(
             detail="User account is inactive"
         )
 
-    # Revoke old refresh token (token rotation)
-    db.revoke_refresh_token(token_hash)
-
     # Create new token pair
     new_token_pair = create_token_pair(
         user_data={"user_id": user["id"], "email": user["email"]}
@@ -291,13 +287,17 @@ async def refresh_token(
     device_info = request.headers.get("user-agent", "Unknown")
     ip_address = request.client.host if request.client else "Unknown"
 
-    db.save_refresh_token(
-        user_id=user["id"],
-        token_hash=new_refresh_token_hash,
-        expires_at=new_refresh_token_expiry,
-        device_info=device_info,
-        ip_address=ip_address
-    )
+    # Revoke the old token and store the new one in a single commit, so a
+    # failure can't leave the user with neither (token rotation)
+    with db.transaction():
+        db.revoke_refresh_token(token_hash)
+        db.save_refresh_token(
+            user_id=user["id"],
+            token_hash=new_refresh_token_hash,
+            expires_at=new_refresh_token_expiry,
+            device_info=device_info,
+            ip_address=ip_address
+        )
 
     # Set new refresh token as httpOnly cookie
     # Security settings configured via ENVIRONMENT variable
@@ -351,7 +351,8 @@ async def logout(
     if refresh_token:
         # Hash and revoke the token
         token_hash = hash_refresh_token(refresh_token)
-        db.revoke_refresh_token(token_hash)
+        if not db.revoke_refresh_token(token_hash):
+            db.revoke_refresh_token(legacy_hash_refresh_token(refresh_token))
         logger.info(f"User logged out, token revoked")
 
     # Clear the refresh token cookie
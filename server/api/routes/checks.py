@@ -1,31 +1,145 @@
 """Compliance check API routes."""
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Depends
-from typing import List, Optional, Dict
-import sys
-from pathlib import Path
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Depends, status
+from typing import Callable, List, Optional
 import asyncio
+from cachetools import TTLCache
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
-from core.database import ComplianceDatabase
-from core.config import DATABASE_PATH
-from core.main_hybrid import HybridComplianceChecker
+from core.config import DATABASE_POOL_TIMEOUT
+from core.database import ComplianceDatabase, PoolTimeout
 from schemas.check import CheckRequest, CheckResponse, ViolationResponse, VisualVerificationResponse
-from api.dependencies import get_current_user
+from api.dependencies import get_current_user, get_db, db_pool
+from api.responses import rows_response
+from services.scan_service import get_checker
+
+router = APIRouter(dependencies=[Depends(get_current_user)])
+
+# Checks and their violations/visual verifications are never modified after
+# POST /checks/ writes them, so reads are cached by check_id. Only the demo
+# reset deletes them (see clear_check_cache). These caches are touched only
+# from async route bodies, i.e. the event loop thread, so need no lock.
+_check_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+_violations_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+_visuals_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+
+
+async def _cached(cache: TTLCache, check_id: int, load: Callable[[int], object]):
+    """
+    Return cache[check_id], loading it on a miss. Missing checks aren't cached.
+
+    The load runs in a worker thread so SQLite I/O doesn't block the event
+    loop; the cache itself is only read and written back on the loop.
+    """
+    value = cache.get(check_id)
+    if value is None:
+        value = await asyncio.to_thread(load, check_id)
+        if value is not None:
+            cache[check_id] = value
+    return value
+
+
+async def _check_exists(db: ComplianceDatabase, check_id: int) -> bool:
+    """True if the check is cached or present, without loading the full row."""
+    if check_id in _check_cache:
+        return True
+    return await asyncio.to_thread(db.check_exists, check_id)
+
+
+def clear_check_cache():
+    """Drop all cached check reads (after bulk deletes)."""
+    _check_cache.clear()
+    _violations_cache.clear()
+    _visuals_cache.clear()
+
+
+def _save_check(db: ComplianceDatabase, check_request: CheckRequest, result: dict) -> int:
+    """Write a finished check and all its child rows in one transaction."""
+    with db.transaction():
+        check_id = db.save_compliance_check(
+            url=check_request.url,
+            state_code=check_request.state_code,
+            template_id=result.get('template_id'),
+            overall_score=result.get('overall_compliance_score', 0),
+            compliance_status=result.get('compliance_status', 'UNKNOWN'),
+            summary=result.get('summary', ''),
+            llm_input_path=result.get('llm_input_path'),
+            report_path=result.get('report_paths', {}).get('markdown'),
+            llm_input_text=result.get('llm_input_text')
+        )
+
+        # Save violations
+        db.save_violations_bulk(check_id, [
+            (v.get('category', 'unknown'), v.get('severity', 'unknown'),
+             v.get('rule_violated', ''), v.get('rule_key'), v.get('confidence'),
+             v.get('needs_visual_verification', False), v.get('explanation'),
+             v.get('evidence'))
+            for v in result.get('violations', ())
+        ])
+
+        # Save visual verifications
+        db.save_visual_verifications_bulk(check_id, [
+            (None, v.get('rule_key', ''), v.get('rule', ''), v.get('is_compliant', False),
+             v.get('confidence', 0.0), v.get('verification_method', 'visual'),
+             v.get('visual_evidence'), v.get('proximity_description'),
+             v.get('screenshot_path'), v.get('cached', False), 0)
+            for v in result.get('visual_verifications', ())
+        ])
+
+        # Save LLM call records
+        # Text analysis call
+        text_token_usage = result.get('text_token_usage', {})
+        if text_token_usage:
+            db.save_llm_call(
+                check_id=check_id,
+                call_type='text_analysis',
+                model=result.get('model_used', 'unknown'),
+                prompt_tokens=text_token_usage.get('prompt_tokens', 0),
+                completion_tokens=text_token_usage.get('completion_tokens', 0),
+                total_tokens=text_token_usage.get('total_tokens', 0)
+            )
+
+        # Visual verification calls
+        for i, visual in enumerate(result.get('visual_verifications', [])):
+            token_usage = visual.get('token_usage', {})
+            if token_usage and not visual.get('cached', False):
+                db.save_llm_call(
+                    check_id=check_id,
+                    call_type='visual_verification',
+                    model=visual.get('model_used', 'gpt-4o'),
+                    prompt_tokens=token_usage.get('prompt_tokens', 0),
+                    completion_tokens=token_usage.get('completion_tokens', 0),
+                    total_tokens=token_usage.get('total_tokens', 0)
+                )
+
+    return check_id
+
+
+def _store_check(check_request: CheckRequest, result: dict) -> CheckResponse:
+    """
+    Save a finished check on a pooled connection and read it back.
 
-router = APIRouter()
+    Runs in a worker thread: acquiring can wait for a free connection and the
+    transaction takes a blocking write lock, neither of which may happen on
+    the event loop.
+    """
+    with db_pool.connection(timeout=DATABASE_POOL_TIMEOUT) as db:
+        check_id = _save_check(db, check_request, result)
 
+        # Fetch complete check with related data
+        check = db.get_compliance_check(check_id)
+        violations = db.get_violations(check_id)
+        visual_verifications = db.get_visual_verifications(check_id)
 
-def get_db():
-    """Get database instance."""
-    return ComplianceDatabase(DATABASE_PATH)
+    return CheckResponse(
+        **check,
+        violations=[ViolationResponse(**v) for v in violations],
+        visual_verifications=[VisualVerificationResponse(**vv) for vv in visual_verifications]
+    )
 
 
 @router.post("/", response_model=CheckResponse, status_code=201)
 async def run_compliance_check(
-    check_request: CheckRequest,
-    current_user: Dict = Depends(get_current_user)
+    check_request: CheckRequest
 ):
     """
     Run a compliance check on a URL.
@@ -40,11 +154,7 @@ async def run_compliance_check(
     The check may take 30-60 seconds depending on visual verification needs.
     """
     try:
-        # Initialize checker
-        checker = HybridComplianceChecker(
-            state_code=check_request.state_code,
-            output_dir="reports"
-        )
+        checker = get_checker(check_request.state_code)
 
         # Run check
         result = await checker.check_url(
@@ -53,89 +163,15 @@ async def run_compliance_check(
             skip_visual=check_request.skip_visual
         )
 
-        # Save to database
-        db = get_db()
-        try:
-            check_id = db.save_compliance_check(
-                url=check_request.url,
-                state_code=check_request.state_code,
-                template_id=result.get('template_id'),
-                overall_score=result.get('overall_compliance_score', 0),
-                compliance_status=result.get('compliance_status', 'UNKNOWN'),
-                summary=result.get('summary', ''),
-                llm_input_path=result.get('llm_input_path'),
-                report_path=result.get('report_paths', {}).get('markdown'),
-                llm_input_text=result.get('llm_input_text')
-            )
-
-            # Save violations
-            for violation in result.get('violations', []):
-                db.save_violation(
-                    check_id=check_id,
-                    category=violation.get('category', 'unknown'),
-                    severity=violation.get('severity', 'unknown'),
-                    rule_violated=violation.get('rule_violated', ''),
-                    rule_key=violation.get('rule_key'),
-                    confidence=violation.get('confidence'),
-                    needs_visual_verification=violation.get('needs_visual_verification', False),
-                    explanation=violation.get('explanation'),
-                    evidence=violation.get('evidence')
-                )
-
-            # Save visual verifications
-            for visual in result.get('visual_verifications', []):
-                db.save_visual_verification(
-                    check_id=check_id,
-                    rule_key=visual.get('rule_key', ''),
-                    rule_text=visual.get('rule', ''),
-                    is_compliant=visual.get('is_compliant', False),
-                    confidence=visual.get('confidence', 0.0),
-                    verification_method=visual.get('verification_method', 'visual'),
-                    visual_evidence=visual.get('visual_evidence'),
-                    proximity_description=visual.get('proximity_description'),
-                    screenshot_path=visual.get('screenshot_path'),
-                    cached=visual.get('cached', False)
-                )
-
-            # Save LLM call records
-            # Text analysis call
-            text_token_usage = result.get('text_token_usage', {})
-            if text_token_usage:
-                db.save_llm_call(
-                    check_id=check_id,
-                    call_type='text_analysis',
-                    model=result.get('model_used', 'unknown'),
-                    prompt_tokens=text_token_usage.get('prompt_tokens', 0),
-                    completion_tokens=text_token_usage.get('completion_tokens', 0),
-                    total_tokens=text_token_usage.get('total_tokens', 0)
-                )
-
-            # Visual verification calls
-            for i, visual in enumerate(result.get('visual_verifications', [])):
-                token_usage = visual.get('token_usage', {})
-                if token_usage and not visual.get('cached', False):
-                    db.save_llm_call(
-                        check_id=check_id,
-                        call_type='visual_verification',
-                        model=visual.get('model_used', 'gpt-4o'),
-                        prompt_tokens=token_usage.get('prompt_tokens', 0),
-                        completion_tokens=token_usage.get('completion_tokens', 0),
-                        total_tokens=token_usage.get('total_tokens', 0)
-                    )
-
-            # Fetch complete check with related data
-            check = db.get_compliance_check(check_id)
-            violations = db.get_violations(check_id)
-            visual_verifications = db.get_visual_verifications(check_id)
-
-            return CheckResponse(
-                **check,
-                violations=[ViolationResponse(**v) for v in violations],
-                visual_verifications=[VisualVerificationResponse(**vv) for vv in visual_verifications]
-            )
-        finally:
-            db.close()
+        # Save to database. The check itself can take a minute, so a pooled
+        # connection is borrowed only for the writes rather than via get_db
+        return await asyncio.to_thread(_store_check, check_request, result)
 
+    except PoolTimeout:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database busy"
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Check failed: {str(e)}")
 
@@ -145,116 +181,98 @@ async def list_checks(
     url_id: Optional[int] = Query(None, description="Filter by URL ID"),
     state_code: Optional[str] = Query(None, description="Filter by state code"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of results"),
-    current_user: Dict = Depends(get_current_user)
+    include_counts: bool = Query(False, description="Include violation and visual verification counts"),
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """
     List compliance checks.
 
     Returns checks ordered by timestamp (newest first).
-    Can be filtered by URL ID and/or state code.
+    Can be filtered by URL ID and/or state code. With include_counts, each
+    check carries violation_count and visual_count from the same query.
     """
-    db = get_db()
-    try:
-        checks = db.list_checks(url_id=url_id, state_code=state_code, limit=limit)
-        return [CheckResponse(**c) for c in checks]
-    finally:
-        db.close()
+    checks = db.list_checks(
+        url_id=url_id, state_code=state_code, limit=limit, include_counts=include_counts
+    )
+    return rows_response(CheckResponse, checks)
 
 
 @router.get("/{check_id}", response_model=CheckResponse)
 async def get_check(
     check_id: int,
     include_details: bool = Query(True, description="Include violations and visual verifications"),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """
     Get a specific compliance check by ID.
 
     Optionally include related violations and visual verifications.
     """
-    db = get_db()
-    try:
-        check = db.get_compliance_check(check_id)
-        if not check:
-            raise HTTPException(status_code=404, detail="Check not found")
+    check = await _cached(_check_cache, check_id, db.get_compliance_check)
+    if not check:
+        raise HTTPException(status_code=404, detail="Check not found")
 
-        if include_details:
-            violations = db.get_violations(check_id)
-            visual_verifications = db.get_visual_verifications(check_id)
+    if include_details:
+        violations = await _cached(_violations_cache, check_id, db.get_violations)
+        visual_verifications = await _cached(_visuals_cache, check_id, db.get_visual_verifications)
 
-            return CheckResponse(
-                **check,
-                violations=[ViolationResponse(**v) for v in violations],
-                visual_verifications=[VisualVerificationResponse(**vv) for vv in visual_verifications]
-            )
-        else:
-            return CheckResponse(**check)
-    finally:
-        db.close()
+        return CheckResponse(
+            **check,
+            violations=[ViolationResponse(**v) for v in violations],
+            visual_verifications=[VisualVerificationResponse(**vv) for vv in visual_verifications]
+        )
+    else:
+        return CheckResponse(**check)
 
 
 @router.get("/{check_id}/violations", response_model=List[ViolationResponse])
 async def get_check_violations(
     check_id: int,
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """
     Get all violations for a specific check.
     """
-    db = get_db()
-    try:
-        check = db.get_compliance_check(check_id)
-        if not check:
-            raise HTTPException(status_code=404, detail="Check not found")
+    if not await _check_exists(db, check_id):
+        raise HTTPException(status_code=404, detail="Check not found")
 
-        violations = db.get_violations(check_id)
-        return [ViolationResponse(**v) for v in violations]
-    finally:
-        db.close()
+    violations = await _cached(_violations_cache, check_id, db.get_violations)
+    return rows_response(ViolationResponse, violations)
 
 
 @router.get("/{check_id}/visual-verifications", response_model=List[VisualVerificationResponse])
 async def get_check_visual_verifications(
     check_id: int,
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """
     Get all visual verifications for a specific check.
     """
-    db = get_db()
-    try:
-        check = db.get_compliance_check(check_id)
-        if not check:
-            raise HTTPException(status_code=404, detail="Check not found")
+    if not await _check_exists(db, check_id):
+        raise HTTPException(status_code=404, detail="Check not found")
 
-        visual_verifications = db.get_visual_verifications(check_id)
-        return [VisualVerificationResponse(**vv) for vv in visual_verifications]
-    finally:
-        db.close()
+    visual_verifications = await _cached(_visuals_cache, check_id, db.get_visual_verifications)
+    return rows_response(VisualVerificationResponse, visual_verifications)
 
 
 @router.get("/url/{url}", response_model=CheckResponse)
 async def get_latest_check_for_url(
     url: str,
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """
     Get the most recent compliance check for a specific URL.
     """
-    db = get_db()
-    try:
-        check = db.get_latest_check(url)
-        if not check:
-            raise HTTPException(status_code=404, detail="No checks found for this URL")
-
-        check_id = check['id']
-        violations = db.get_violations(check_id)
-        visual_verifications = db.get_visual_verifications(check_id)
-
-        return CheckResponse(
-            **check,
-            violations=[ViolationResponse(**v) for v in violations],
-            visual_verifications=[VisualVerificationResponse(**vv) for vv in visual_verifications]
-        )
-    finally:
-        db.close()
+    check = await asyncio.to_thread(db.get_latest_check, url)
+    if not check:
+        raise HTTPException(status_code=404, detail="No checks found for this URL")
+
+    check_id = check['id']
+    violations = await _cached(_violations_cache, check_id, db.get_violations)
+    visual_verifications = await _cached(_visuals_cache, check_id, db.get_visual_verifications)
+
+    return CheckResponse(
+        **check,
+        violations=[ViolationResponse(**v) for v in violations],
+        visual_verifications=[VisualVerificationResponse(**vv) for vv in visual_verifications]
+    )
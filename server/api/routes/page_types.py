@@ -1,21 +1,64 @@
 """Page types API endpoints."""
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Response
+from typing import Dict, List
+import orjson
+from cachetools import TTLCache
 from core.database import ComplianceDatabase
 from schemas.page_type import PageTypeCreate, PageTypeUpdate, PageTypeResponse
 from api.dependencies import get_current_user, get_db
 
-router = APIRouter(prefix="/api/page-types", tags=["page-types"])
+router = APIRouter(prefix="/api/page-types", tags=["page-types"], dependencies=[Depends(get_current_user)])
+
+# Encoded GET /api/page-types payloads keyed by active_only. Page types are
+# configuration that changes only through the write routes below, which clear
+# this; the TTL bounds staleness in other worker processes.
+_page_types_cache: TTLCache = TTLCache(maxsize=2, ttl=60)
+
+SQL_UPDATE_PAGE_TYPE = """
+    UPDATE page_types SET
+        name = COALESCE(?, name),
+        description = COALESCE(?, description),
+        active = COALESCE(?, active),
+        preamble = COALESCE(?, preamble),
+        extraction_template = COALESCE(?, extraction_template),
+        requires_llm_visual_confirmation = COALESCE(?, requires_llm_visual_confirmation),
+        requires_human_confirmation = COALESCE(?, requires_human_confirmation),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+
+def _page_type_from_row(row) -> Dict:
+    """
+    Map a page_types row (in the column order selected below) to the
+    PageTypeResponse shape, converting SQLite 0/1 flags to booleans.
+    """
+    return {
+        "id": row[0],
+        "code": row[1],
+        "name": row[2],
+        "description": row[3],
+        "active": bool(row[4]),
+        "preamble": row[5],
+        "extraction_template": row[6],
+        "requires_llm_visual_confirmation": bool(row[7]),
+        "requires_human_confirmation": bool(row[8]),
+        "created_at": row[9],
+        "updated_at": row[10]
+    }
 
 
 @router.get("", response_model=List[PageTypeResponse])
 async def get_page_types(
     active_only: bool = False,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Get all page types."""
+    cached = _page_types_cache.get(active_only)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     cursor = db.conn.cursor()
 
     if active_only:
@@ -36,15 +79,18 @@ async def get_page_types(
             ORDER BY name
         """)
 
-    page_types = [dict(row) for row in cursor.fetchall()]
-    return page_types
+    # Rows are mapped by position and encoded with orjson directly, skipping
+    # the per-row dict(row) copy and response_model validation
+    page_types = [_page_type_from_row(row) for row in cursor.fetchall()]
+    payload = orjson.dumps(page_types)
+    _page_types_cache[active_only] = payload
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/{page_type_id}", response_model=PageTypeResponse)
 async def get_page_type(
     page_type_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Get a specific page type."""
     cursor = db.conn.cursor()
@@ -66,8 +112,7 @@ async def get_page_type(
 @router.post("", response_model=PageTypeResponse, status_code=201)
 async def create_page_type(
     page_type: PageTypeCreate,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Create a new page type."""
     cursor = db.conn.cursor()
@@ -83,17 +128,17 @@ async def create_page_type(
     """, (page_type.code, page_type.name, page_type.description))
 
     db.conn.commit()
+    _page_types_cache.clear()
     page_type_id = cursor.lastrowid
 
-    return await get_page_type(page_type_id, db, current_user)
+    return await get_page_type(page_type_id, db)
 
 
 @router.patch("/{page_type_id}", response_model=PageTypeResponse)
 async def update_page_type(
     page_type_id: int,
     page_type: PageTypeUpdate,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Update a page type."""
     cursor = db.conn.cursor()
@@ -103,71 +148,51 @@ async def update_page_type(
     if not cursor.fetchone():
         raise HTTPException(status_code=404, detail="Page type not found")
 
-    # Build update query dynamically
-    updates = []
-    params = []
-
-    if page_type.name is not None:
-        updates.append("name = ?")
-        params.append(page_type.name)
-
-    if page_type.description is not None:
-        updates.append("description = ?")
-        params.append(page_type.description)
-
-    if page_type.active is not None:
-        updates.append("active = ?")
-        params.append(page_type.active)
-
-    if page_type.preamble is not None:
-        updates.append("preamble = ?")
-        params.append(page_type.preamble)
-
-    if page_type.extraction_template is not None:
-        updates.append("extraction_template = ?")
-        params.append(page_type.extraction_template)
-
-    if page_type.requires_llm_visual_confirmation is not None:
-        updates.append("requires_llm_visual_confirmation = ?")
-        params.append(page_type.requires_llm_visual_confirmation)
-
-    if page_type.requires_human_confirmation is not None:
-        updates.append("requires_human_confirmation = ?")
-        params.append(page_type.requires_human_confirmation)
-
-    if updates:
-        updates.append("updated_at = CURRENT_TIMESTAMP")
-        params.append(page_type_id)
-
-        query = f"UPDATE page_types SET {', '.join(updates)} WHERE id = ?"
-        cursor.execute(query, params)
+    # One fixed statement for every combination of fields, so sqlite3's
+    # statement cache can reuse it; unset fields bind NULL and keep their value
+    fields = (
+        page_type.name,
+        page_type.description,
+        page_type.active,
+        page_type.preamble,
+        page_type.extraction_template,
+        page_type.requires_llm_visual_confirmation,
+        page_type.requires_human_confirmation
+    )
+
+    if any(value is not None for value in fields):
+        cursor.execute(SQL_UPDATE_PAGE_TYPE, (*fields, page_type_id))
         db.conn.commit()
+        _page_types_cache.clear()
 
-    return await get_page_type(page_type_id, db, current_user)
+    return await get_page_type(page_type_id, db)
 
 
 @router.delete("/{page_type_id}", status_code=204)
 async def delete_page_type(
     page_type_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Delete a page type."""
     cursor = db.conn.cursor()
 
-    # Check if page type exists
-    cursor.execute("SELECT id FROM page_types WHERE id = ?", (page_type_id,))
-    if not cursor.fetchone():
-        raise HTTPException(status_code=404, detail="Page type not found")
-
-    # Check if page type is in use
-    cursor.execute("SELECT COUNT(*) as count FROM urls WHERE url_type = (SELECT code FROM page_types WHERE id = ?)", (page_type_id,))
-    result = cursor.fetchone()
-    if result and result['count'] > 0:
+    # Delete only if no URL uses the type; look up why only when nothing was deleted
+    cursor.execute("""
+        DELETE FROM page_types
+        WHERE id = ? AND NOT EXISTS (SELECT 1 FROM urls WHERE urls.url_type = page_types.code)
+    """, (page_type_id,))
+    if cursor.rowcount == 0:
+        cursor.execute("""
+            SELECT (SELECT COUNT(*) FROM urls WHERE urls.url_type = page_types.code) AS count
+            FROM page_types WHERE id = ?
+        """, (page_type_id,))
+        result = cursor.fetchone()
+        if not result:
+            raise HTTPException(status_code=404, detail="Page type not found")
         raise HTTPException(
             status_code=400,
             detail=f"Cannot delete page type: {result['count']} URLs are using this type"
         )
 
-    cursor.execute("DELETE FROM page_types WHERE id = ?", (page_type_id,))
     db.conn.commit()
+    _page_types_cache.clear()
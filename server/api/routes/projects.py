@@ -2,33 +2,31 @@
 
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from typing import List
-import sys
-from pathlib import Path
 import asyncio
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
-from schemas.project import ProjectCreate, ProjectResponse, ProjectSummary, IntelligentSetupRequest, IntelligentSetupResponse
+from schemas.project import (
+    ProjectCreate, ProjectResponse, ProjectSummary,
+    IntelligentSetupRequest, IntelligentSetupJobResponse
+)
 from services.project_service import ProjectService
-from services.screenshot_service import ScreenshotService
+from services.screenshot_service import run_screenshot_job
 from services.intelligent_setup_service import IntelligentSetupService
-from api.dependencies import get_project_service, get_current_user
+from api.dependencies import get_project_service, get_current_user, get_db
 from core.database import ComplianceDatabase
 from core.config import DATABASE_PATH
 from typing import Dict
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(get_current_user)])
 
 
 @router.post("/", response_model=ProjectResponse, status_code=201)
 async def create_project(
     project: ProjectCreate,
-    service: ProjectService = Depends(get_project_service),
-    current_user: Dict = Depends(get_current_user)
+    service: ProjectService = Depends(get_project_service)
 ):
     """
     Create a new project.
@@ -43,8 +41,7 @@ async def create_project(
 
 @router.get("/", response_model=List[ProjectResponse])
 async def list_projects(
-    service: ProjectService = Depends(get_project_service),
-    current_user: Dict = Depends(get_current_user)
+    service: ProjectService = Depends(get_project_service)
 ):
     """
     List all projects.
@@ -57,8 +54,7 @@ async def list_projects(
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: int,
-    service: ProjectService = Depends(get_project_service),
-    current_user: Dict = Depends(get_current_user)
+    service: ProjectService = Depends(get_project_service)
 ):
     """
     Get a specific project by ID.
@@ -72,8 +68,7 @@ async def get_project(
 @router.get("/{project_id}/summary", response_model=ProjectSummary)
 async def get_project_summary(
     project_id: int,
-    service: ProjectService = Depends(get_project_service),
-    current_user: Dict = Depends(get_current_user)
+    service: ProjectService = Depends(get_project_service)
 ):
     """
     Get project summary statistics.
@@ -94,8 +89,7 @@ async def get_project_summary(
 @router.delete("/{project_id}", status_code=204)
 async def delete_project(
     project_id: int,
-    service: ProjectService = Depends(get_project_service),
-    current_user: Dict = Depends(get_current_user)
+    service: ProjectService = Depends(get_project_service)
 ):
     """
     Delete a project.
@@ -120,7 +114,7 @@ async def capture_project_screenshot(
     project_id: int,
     background_tasks: BackgroundTasks,
     service: ProjectService = Depends(get_project_service),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """
     Capture a screenshot of the project's base URL.
@@ -135,32 +129,25 @@ async def capture_project_screenshot(
     if not project.base_url:
         raise HTTPException(status_code=400, detail="Project has no base_url set")
 
-    # Capture screenshot in background
-    async def capture_screenshot():
-        db = ComplianceDatabase(DATABASE_PATH)
-        try:
-            screenshot_service = ScreenshotService(db)
-            await screenshot_service.capture_project_screenshot(
-                project_id=project_id,
-                url=project.base_url
-            )
-        finally:
-            db.close()
-
-    background_tasks.add_task(capture_screenshot)
+    # Record the job first so it survives a worker restart (see
+    # resume_screenshot_jobs), then capture it after the response is sent
+    job_id = db.create_screenshot_job(project_id, project.base_url)
+    background_tasks.add_task(run_screenshot_job, job_id, project_id, project.base_url)
 
     return project
 
 
-@router.post("/intelligent-setup", response_model=IntelligentSetupResponse, status_code=201)
+@router.post("/intelligent-setup", response_model=IntelligentSetupJobResponse, status_code=202)
 async def intelligent_project_setup(
     request: IntelligentSetupRequest,
+    background_tasks: BackgroundTasks,
+    db: ComplianceDatabase = Depends(get_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """
     Intelligently set up a project from a single URL.
 
-    This endpoint:
+    This endpoint starts a background job that:
     1. Scrapes the provided URL
     2. Uses LLM to analyze and extract dealership information (name, location, platform)
     3. Attempts to find the inventory page
@@ -171,17 +158,51 @@ async def intelligent_project_setup(
        - Inventory: once every 7 days (168 hours)
        - VDP: scrape once only (9999 hours)
 
-    Returns the created project and summary of the setup process.
+    Returns the job ID immediately; poll GET /intelligent-setup/{job_id}
+    for progress and the created project.
     """
-    db = ComplianceDatabase(DATABASE_PATH)
-    try:
-        service = IntelligentSetupService(db)
-        result = await service.setup_from_url(request.url)
-        return result
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Intelligent setup failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Setup failed: {str(e)}")
-    finally:
-        db.close()
+    job_id = db.create_setup_job(request.url, created_by=current_user.get("user_id"))
+
+    # Runs after the response is sent, so it opens its own connection
+    # (as run_screenshot_job does) rather than reusing the request's
+    async def run_setup():
+        job_db = ComplianceDatabase(DATABASE_PATH)
+        try:
+            job_db.update_setup_job(job_id, status="running")
+            service = IntelligentSetupService(job_db)
+            result = await service.setup_from_url(
+                request.url,
+                on_progress=lambda step: job_db.update_setup_job(job_id, progress=step)
+            )
+            job_db.update_setup_job(job_id, status="completed", result=result.model_dump(mode="json"))
+        except Exception as e:
+            logger.error(f"Intelligent setup job {job_id} failed: {str(e)}")
+            job_db.update_setup_job(job_id, status="failed", error=str(e))
+        finally:
+            job_db.close()
+
+    background_tasks.add_task(run_setup)
+
+    return IntelligentSetupJobResponse(job_id=job_id, status="pending")
+
+
+@router.get("/intelligent-setup/{job_id}", response_model=IntelligentSetupJobResponse)
+async def get_intelligent_setup_job(
+    job_id: int,
+    db: ComplianceDatabase = Depends(get_db),
+    current_user: Dict = Depends(get_current_user)
+):
+    """Get the status of an intelligent setup job started by the current user."""
+    # A job whose worker died stops updating; fail it so the poll ends
+    db.fail_stale_setup_jobs(job_id=job_id)
+    job = db.get_setup_job(job_id)
+    if not job or job["created_by"] != current_user.get("user_id"):
+        raise HTTPException(status_code=404, detail="Setup job not found")
+
+    return IntelligentSetupJobResponse(
+        job_id=job["id"],
+        status=job["status"],
+        progress=job["progress"],
+        result=job["result"],
+        error=job["error"]
+    )
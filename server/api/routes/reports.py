@@ -1,103 +1,141 @@
 """Reporting API routes."""
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import FileResponse
-from typing import List, Optional
-import sys
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Optional
 from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+import aiofiles
 
 from core.database import ComplianceDatabase
-from core.config import DATABASE_PATH
+from api.dependencies import get_db
 
 router = APIRouter()
 
+# Reports, LLM inputs and screenshots are written once under timestamped
+# filenames and never rewritten, so clients may cache them indefinitely.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
-def get_db():
-    """Get database instance."""
-    return ComplianceDatabase(DATABASE_PATH)
+# Resolved once; requested screenshot paths must stay inside it
+SCREENSHOTS_ROOT = Path("screenshots").resolve()
 
+FILE_CHUNK_SIZE = 64 * 1024
 
-@router.get("/{check_id}/markdown")
-async def get_markdown_report(check_id: int):
+
+async def _iter_file(path: Path) -> AsyncIterator[bytes]:
+    """Read a file in chunks via aiofiles."""
+    async with aiofiles.open(path, 'rb') as f:
+        while chunk := await f.read(FILE_CHUNK_SIZE):
+            yield chunk
+
+
+def _cached_file_response(request: Request, path: Path, media_type: str, filename: str) -> Response:
     """
-    Download the Markdown report for a compliance check.
+    Serve a file with long-lived cache headers and an mtime/size ETag.
 
-    Returns the generated Markdown report file.
+    Returns 304 Not Modified when the client already holds the current version.
+    The body is streamed with aiofiles, whose reads run on the asyncio
+    executor rather than the anyio threadpool that sync dependencies such
+    as get_db share.
     """
-    db = get_db()
-    try:
-        check = db.get_compliance_check(check_id)
-        if not check:
-            raise HTTPException(status_code=404, detail="Check not found")
+    stat = path.stat()
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": etag}
 
-        report_path = check.get('report_path')
-        if not report_path:
-            raise HTTPException(status_code=404, detail="Report not available")
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_etags = {tag.strip() for tag in if_none_match.split(",")}
+        if etag in client_etags or "*" in client_etags:
+            return Response(status_code=304, headers=headers)
 
-        report_file = Path(report_path)
-        if not report_file.exists():
-            raise HTTPException(status_code=404, detail="Report file not found")
+    headers["Content-Length"] = str(stat.st_size)
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return StreamingResponse(_iter_file(path), media_type=media_type, headers=headers)
 
-        return FileResponse(
-            path=str(report_file),
-            media_type='text/markdown',
-            filename=report_file.name
-        )
-    finally:
-        db.close()
+
+@router.get("/{check_id}/markdown")
+async def get_markdown_report(
+    check_id: int,
+    request: Request,
+    db: ComplianceDatabase = Depends(get_db)
+):
+    """
+    Download the Markdown report for a compliance check.
+
+    Returns the generated Markdown report file.
+    """
+    check = db.get_compliance_check(check_id)
+    if not check:
+        raise HTTPException(status_code=404, detail="Check not found")
+
+    report_path = check.get('report_path')
+    if not report_path:
+        raise HTTPException(status_code=404, detail="Report not available")
+
+    report_file = Path(report_path)
+    if not report_file.exists():
+        raise HTTPException(status_code=404, detail="Report file not found")
+
+    return _cached_file_response(
+        request,
+        report_file,
+        media_type='text/markdown',
+        filename=report_file.name
+    )
 
 
 @router.get("/{check_id}/llm-input")
-async def get_llm_input(check_id: int):
+async def get_llm_input(
+    check_id: int,
+    request: Request,
+    db: ComplianceDatabase = Depends(get_db)
+):
     """
     Download the LLM input file for a compliance check.
 
     Returns the formatted input that was sent to the LLM for analysis.
     Useful for debugging and understanding what data the LLM saw.
     """
-    db = get_db()
-    try:
-        check = db.get_compliance_check(check_id)
-        if not check:
-            raise HTTPException(status_code=404, detail="Check not found")
-
-        llm_input_path = check.get('llm_input_path')
-        if not llm_input_path:
-            raise HTTPException(status_code=404, detail="LLM input not available")
-
-        input_file = Path(llm_input_path)
-        if not input_file.exists():
-            raise HTTPException(status_code=404, detail="LLM input file not found")
-
-        return FileResponse(
-            path=str(input_file),
-            media_type='text/markdown',
-            filename=input_file.name
-        )
-    finally:
-        db.close()
+    check = db.get_compliance_check(check_id)
+    if not check:
+        raise HTTPException(status_code=404, detail="Check not found")
+
+    llm_input_path = check.get('llm_input_path')
+    if not llm_input_path:
+        raise HTTPException(status_code=404, detail="LLM input not available")
+
+    input_file = Path(llm_input_path)
+    if not input_file.exists():
+        raise HTTPException(status_code=404, detail="LLM input file not found")
+
+    return _cached_file_response(
+        request,
+        input_file,
+        media_type='text/markdown',
+        filename=input_file.name
+    )
 
 
 @router.get("/screenshots/{screenshot_filename}")
-async def get_screenshot(screenshot_filename: str):
+async def get_screenshot(screenshot_filename: str, request: Request):
     """
     Download a screenshot from visual verification.
 
     Screenshots are stored in the screenshots/ directory.
     """
-    screenshot_path = Path("screenshots") / screenshot_filename
-
-    if not screenshot_path.exists():
-        raise HTTPException(status_code=404, detail="Screenshot not found")
+    screenshot_path = (SCREENSHOTS_ROOT / screenshot_filename).resolve()
 
-    # Security: prevent path traversal
-    if not str(screenshot_path.resolve()).startswith(str(Path("screenshots").resolve())):
+    # Security: prevent path traversal, before touching the file itself.
+    # "." resolves to the root itself, which is_relative_to() accepts
+    if screenshot_path == SCREENSHOTS_ROOT or not screenshot_path.is_relative_to(SCREENSHOTS_ROOT):
         raise HTTPException(status_code=403, detail="Access denied")
 
-    return FileResponse(
-        path=str(screenshot_path),
+    # Only regular files; a subdirectory can't be served
+    if not screenshot_path.is_file():
+        raise HTTPException(status_code=404, detail="Screenshot not found")
+
+    return _cached_file_response(
+        request,
+        screenshot_path,
         media_type='image/png',
         filename=screenshot_filename
     )
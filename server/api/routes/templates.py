@@ -1,123 +1,157 @@
 """Template management API routes."""
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from typing import Dict, List, Optional
 
 from core.database import ComplianceDatabase
-from core.config import DATABASE_PATH
 from schemas.template import TemplateResponse, TemplateRuleResponse, TemplateRuleUpdate
+from api.dependencies import get_db
+from api.http_cache import make_etag, etag_matches, set_cache_headers, not_modified
+from api.read_cache import ReadCache
+from api.responses import json_response, project_row, rows_response
 
 router = APIRouter()
 
+# Single-row reads, collapsed across bursts of requests for the same key.
+# GET /{template_id} isn't cached: its ETag comes from the live row, and a
+# cached body could lag behind it.
+_template_rule_cache = ReadCache()
+
 
-def get_db():
-    """Get database instance."""
-    return ComplianceDatabase(DATABASE_PATH)
+def _template_payload(template: Dict, rules: List[Dict]) -> Dict:
+    """Shape a template row and its rule rows like TemplateResponse."""
+    payload = project_row(TemplateResponse, template)
+    payload['rules'] = [project_row(TemplateRuleResponse, r) for r in rules]
+    return payload
 
 
 @router.get("/", response_model=List[TemplateResponse])
-async def list_templates():
+def list_templates(
+    request: Request,
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of templates"),
+    after: Optional[str] = Query(None, description="Return templates after this template_id"),
+    db: ComplianceDatabase = Depends(get_db)
+):
     """
-    List all templates.
+    List templates, ordered by template_id.
 
-    Returns all known templates with their cached compliance rules.
+    Returns templates with their cached compliance rules, one page at a time.
+    If there are more, the X-Next-After header holds the value to pass as
+    `after` for the next page. Sends an ETag; a matching If-None-Match gets
+    304 without loading rows.
     """
-    db = get_db()
-    try:
-        cursor = db.conn.cursor()
-        cursor.execute("SELECT * FROM templates ORDER BY template_id")
-        templates = [dict(row) for row in cursor.fetchall()]
+    etag = make_etag(db.get_templates_version(), after, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-        result = []
-        for template in templates:
-            rules = db.get_template_rules(template['template_id'])
-            template['rules'] = [TemplateRuleResponse(**r) for r in rules]
-            result.append(TemplateResponse(**template))
+    # One extra row tells us whether there's a next page
+    templates = db.list_templates_with_rules(after_template_id=after, limit=limit + 1)
+    next_after = None
+    if len(templates) > limit:
+        templates = templates[:limit]
+        next_after = templates[-1]['template_id']
 
-        return result
-    finally:
-        db.close()
+    response = json_response([_template_payload(t, t['rules']) for t in templates])
+    set_cache_headers(response, etag)
+    if next_after is not None:
+        response.headers["X-Next-After"] = next_after
+    return response
 
 
 @router.get("/{template_id}", response_model=TemplateResponse)
-async def get_template(template_id: str):
+def get_template(
+    template_id: str,
+    request: Request,
+    db: ComplianceDatabase = Depends(get_db)
+):
     """
     Get a specific template by ID.
 
     Returns template details including all cached compliance rules.
     """
-    db = get_db()
-    try:
-        template = db.get_template(template_id)
-        if not template:
-            raise HTTPException(status_code=404, detail="Template not found")
+    version = db.get_template_version(template_id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Template not found")
 
-        rules = db.get_template_rules(template_id)
-        template['rules'] = [TemplateRuleResponse(**r) for r in rules]
+    etag = make_etag(version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-        return TemplateResponse(**template)
-    finally:
-        db.close()
+    template = db.get_template(template_id)
+    if not template:
+        raise HTTPException(status_code=404, detail="Template not found")
+
+    response = json_response(_template_payload(template, db.get_template_rules(template_id)))
+    set_cache_headers(response, etag)
+    return response
 
 
 @router.get("/{template_id}/rules", response_model=List[TemplateRuleResponse])
-async def get_template_rules(template_id: str):
+def get_template_rules(
+    template_id: str,
+    request: Request,
+    db: ComplianceDatabase = Depends(get_db)
+):
     """
     Get all cached rules for a template.
 
     Rules are compliance decisions that have been verified and cached
     to avoid expensive re-verification on similar pages.
     """
-    db = get_db()
-    try:
-        template = db.get_template(template_id)
-        if not template:
-            raise HTTPException(status_code=404, detail="Template not found")
+    version = db.get_template_version(template_id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Template not found")
+
+    etag = make_etag("rules", version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-        rules = db.get_template_rules(template_id)
-        return [TemplateRuleResponse(**r) for r in rules]
-    finally:
-        db.close()
+    response = rows_response(TemplateRuleResponse, db.get_template_rules(template_id))
+    set_cache_headers(response, etag)
+    return response
 
 
 @router.get("/{template_id}/rules/{rule_key}", response_model=TemplateRuleResponse)
-async def get_template_rule(template_id: str, rule_key: str):
+def get_template_rule(
+    template_id: str,
+    rule_key: str,
+    request: Request,
+    db: ComplianceDatabase = Depends(get_db)
+):
     """
     Get a specific cached rule for a template.
     """
-    db = get_db()
-    try:
-        rule = db.get_template_rule(template_id, rule_key)
-        if not rule:
-            raise HTTPException(status_code=404, detail="Rule not found")
+    rule = _template_rule_cache.get(
+        (template_id, rule_key), lambda: db.get_template_rule(template_id, rule_key)
+    )
+    if not rule:
+        raise HTTPException(status_code=404, detail="Rule not found")
 
-        return TemplateRuleResponse(**rule)
-    finally:
-        db.close()
+    etag = make_etag(rule)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response = json_response(project_row(TemplateRuleResponse, rule))
+    set_cache_headers(response, etag)
+    return response
 
 
 @router.put("/{template_id}/rules/{rule_key}", response_model=TemplateRuleResponse)
-async def update_template_rule(template_id: str, rule_key: str, rule_update: TemplateRuleUpdate):
+def update_template_rule(
+    template_id: str,
+    rule_key: str,
+    rule_update: TemplateRuleUpdate,
+    db: ComplianceDatabase = Depends(get_db)
+):
     """
     Update or create a cached rule for a template.
 
     This is typically done automatically during compliance checks,
     but can be manually updated for overrides or corrections.
     """
-    db = get_db()
     try:
-        # Ensure template exists
-        template = db.get_template(template_id)
-        if not template:
-            # Create template if it doesn't exist
-            db.save_template(template_id, "custom")
-
-        # Save rule
-        db.save_template_rule(
+        # Creates the template as "custom" if it doesn't exist yet
+        rule = db.upsert_template_rule(
             template_id=template_id,
             rule_key=rule_key,
             status=rule_update.status,
@@ -125,40 +159,31 @@ async def update_template_rule(template_id: str, rule_key: str, rule_update: Tem
             verification_method=rule_update.verification_method,
             notes=rule_update.notes
         )
-
-        # Fetch updated rule
-        rule = db.get_template_rule(template_id, rule_key)
+        _template_rule_cache.evict((template_id, rule_key))
         return TemplateRuleResponse(**rule)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
-    finally:
-        db.close()
 
 
 @router.delete("/{template_id}/rules/{rule_key}", status_code=204)
-async def delete_template_rule(template_id: str, rule_key: str):
+def delete_template_rule(
+    template_id: str,
+    rule_key: str,
+    db: ComplianceDatabase = Depends(get_db)
+):
     """
     Delete a cached rule.
 
     This will force re-verification on the next check.
     """
-    db = get_db()
     try:
-        rule = db.get_template_rule(template_id, rule_key)
-        if not rule:
+        deleted = db.delete_template_rule(template_id, rule_key)
+        _template_rule_cache.evict((template_id, rule_key))
+        if not deleted:
             raise HTTPException(status_code=404, detail="Rule not found")
-
-        cursor = db.conn.cursor()
-        cursor.execute(
-            "DELETE FROM template_rules WHERE template_id = ? AND rule_key = ?",
-            (template_id, rule_key)
-        )
-        db.conn.commit()
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
-    finally:
-        db.close()
@@ -1,39 +1,35 @@
 """URL management API routes."""
 
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import List, Optional, Dict
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from typing import List, Optional
 
 from core.database import ComplianceDatabase
 from core.config import DATABASE_PATH
-from schemas.url import URLCreate, URLResponse, URLUpdate
+from schemas.url import URLCreate, URLResponse, URLUpdate, URLRescanRequest
 from services.scan_service import ScanService
-from api.dependencies import get_current_user
-
-router = APIRouter()
+from api.dependencies import get_current_user, get_db
+from api.http_cache import make_etag, etag_matches, set_cache_headers, not_modified
+from api.read_cache import ReadCache
+from api.responses import json_response, project_row, rows_response
 
+router = APIRouter(dependencies=[Depends(get_current_user)])
 
-def get_db():
-    """Get database instance."""
-    return ComplianceDatabase(DATABASE_PATH)
+# get_url reads by id, collapsed across bursts (UI polling, scheduler)
+_url_cache = ReadCache()
 
 
 @router.post("/", response_model=URLResponse, status_code=201)
-async def add_url(
+def add_url(
     url_data: URLCreate,
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """
     Add a new URL to monitor.
 
     URLs represent specific pages to check for compliance.
     """
-    db = get_db()
     try:
-        url_id = db.add_url(
+        created = db.create_url(
             url=url_data.url,
             project_id=url_data.project_id,
             url_type=url_data.url_type,
@@ -41,141 +37,124 @@ async def add_url(
             platform=url_data.platform,
             check_frequency_hours=url_data.check_frequency_hours
         )
-
-        # Fetch created URL
-        created = db.get_url(url_id=url_id)
-        if not created:
-            raise HTTPException(status_code=500, detail="Failed to retrieve created URL")
-
         return URLResponse(**created)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
-    finally:
-        db.close()
 
 
 @router.get("/", response_model=List[URLResponse])
-async def list_urls(
+def list_urls(
+    request: Request,
     project_id: Optional[int] = Query(None, description="Filter by project ID"),
     active_only: bool = Query(True, description="Only return active URLs"),
-    current_user: Dict = Depends(get_current_user)
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of URLs"),
+    after_id: Optional[int] = Query(None, description="Return URLs with an ID above this"),
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """
-    List URLs.
+    List URLs, ordered by ID.
 
-    Optionally filter by project and/or active status.
+    Optionally filter by project and/or active status. If there are more
+    URLs than `limit`, the X-Next-After header holds the `after_id` for the
+    next page.
     """
-    db = get_db()
-    try:
-        urls = db.list_urls(project_id=project_id, active_only=active_only)
-        return [URLResponse(**u) for u in urls]
-    finally:
-        db.close()
+    # One extra row tells us whether there's a next page
+    urls = db.list_urls(
+        project_id=project_id, active_only=active_only, after_id=after_id, limit=limit + 1
+    )
+    next_after = None
+    if len(urls) > limit:
+        urls = urls[:limit]
+        next_after = urls[-1]['id']
+
+    # urls has no updated_at to version on, so the ETag hashes the rows
+    etag = make_etag(urls, next_after)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response = rows_response(URLResponse, urls)
+    set_cache_headers(response, etag)
+    if next_after is not None:
+        response.headers["X-Next-After"] = str(next_after)
+    return response
 
 
 @router.get("/{url_id}", response_model=URLResponse)
-async def get_url(
+def get_url(
     url_id: int,
-    current_user: Dict = Depends(get_current_user)
+    request: Request,
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """
     Get a specific URL by ID.
     """
-    db = get_db()
-    try:
-        url = db.get_url(url_id=url_id)
-        if not url:
-            raise HTTPException(status_code=404, detail="URL not found")
-        return URLResponse(**url)
-    finally:
-        db.close()
+    url = _url_cache.get(url_id, lambda: db.get_url(url_id=url_id))
+    if not url:
+        raise HTTPException(status_code=404, detail="URL not found")
+
+    etag = make_etag(url)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response = json_response(project_row(URLResponse, url))
+    set_cache_headers(response, etag)
+    return response
 
 
 @router.patch("/{url_id}", response_model=URLResponse)
-async def update_url(
+def update_url(
     url_id: int,
     url_update: URLUpdate,
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """
     Update a URL's settings.
 
     Can update active status, check frequency, and template ID.
     """
-    db = get_db()
     try:
-        # Check if URL exists
-        url = db.get_url(url_id=url_id)
-        if not url:
+        updated = db.update_url_settings(
+            url_id,
+            active=url_update.active,
+            check_frequency_hours=url_update.check_frequency_hours,
+            template_id=url_update.template_id
+        )
+        _url_cache.evict(url_id)
+        if not updated:
             raise HTTPException(status_code=404, detail="URL not found")
-
-        # Update fields
-        cursor = db.conn.cursor()
-        updates = []
-        params = []
-
-        if url_update.active is not None:
-            updates.append("active = ?")
-            params.append(url_update.active)
-
-        if url_update.check_frequency_hours is not None:
-            updates.append("check_frequency_hours = ?")
-            params.append(url_update.check_frequency_hours)
-
-        if url_update.template_id is not None:
-            updates.append("template_id = ?")
-            params.append(url_update.template_id)
-
-        if updates:
-            params.append(url_id)
-            query = f"UPDATE urls SET {', '.join(updates)} WHERE id = ?"
-            cursor.execute(query, params)
-            db.conn.commit()
-
-        # Fetch updated URL
-        updated = db.get_url(url_id=url_id)
         return URLResponse(**updated)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
-    finally:
-        db.close()
 
 
 @router.delete("/{url_id}", status_code=204)
-async def delete_url(
+def delete_url(
     url_id: int,
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """
     Delete a URL.
 
     Note: Marks as inactive rather than deleting to preserve historical data.
     """
-    db = get_db()
     try:
-        url = db.get_url(url_id=url_id)
-        if not url:
-            raise HTTPException(status_code=404, detail="URL not found")
-
         # Mark as inactive instead of deleting
-        cursor = db.conn.cursor()
-        cursor.execute("UPDATE urls SET active = 0 WHERE id = ?", (url_id,))
-        db.conn.commit()
+        deactivated = db.deactivate_url(url_id)
+        _url_cache.evict(url_id)
+        if not deactivated:
+            raise HTTPException(status_code=404, detail="URL not found")
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
-    finally:
-        db.close()
 
 
 @router.post("/{url_id}/rescan")
 async def force_rescan_url(
     url_id: int,
-    skip_visual: bool = Query(False, description="Skip visual verification"),
-    current_user: Dict = Depends(get_current_user)
+    skip_visual: bool = Query(False, description="Skip visual verification")
 ):
     """
     Force an immediate rescan of a URL.
@@ -194,7 +173,9 @@ async def force_rescan_url(
     - Processes asynchronously via OpenAI Batch API
     - Results available within 24 hours
     """
-    db = get_db()
+    # A scan can run for a minute, so it uses its own connection rather
+    # than holding a pooled one for the whole request
+    db = ComplianceDatabase(DATABASE_PATH)
     try:
         url = db.get_url(url_id=url_id)
         if not url:
@@ -239,4 +220,32 @@ async def force_rescan_url(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Rescan failed: {str(e)}")
     finally:
+        # The scan updates last_checked and adds a check
+        _url_cache.evict(url_id)
+        db.close()
+
+
+@router.post("/rescan")
+async def force_rescan_urls(
+    rescan_request: URLRescanRequest
+):
+    """
+    Force a rescan of several URLs at once.
+
+    Inventory URLs are scheduled together as one batch scan; all other URLs
+    are scanned immediately in parallel (up to RESCAN_CONCURRENCY at a time).
+    URLs that are missing or whose scan fails are listed under `failed`
+    rather than failing the whole request.
+    """
+    # Like the single rescan, this can run for minutes: use an own connection
+    db = ComplianceDatabase(DATABASE_PATH)
+    try:
+        scan_service = ScanService(db)
+        return await scan_service.rescan_urls(
+            url_ids=rescan_request.url_ids,
+            skip_visual=rescan_request.skip_visual
+        )
+    finally:
+        for url_id in rescan_request.url_ids:
+            _url_cache.evict(url_id)
         db.close()
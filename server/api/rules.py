@@ -2,10 +2,13 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List, Optional, Dict
+import asyncio
 import logging
 
 from core.database import ComplianceDatabase
-from api.dependencies import get_db, get_current_user
+from api.dependencies import get_db, get_current_user, get_document_parser
+from api.read_cache import ReadCache
+from api.responses import json_response
 from services.rule_service import RuleService
 from services.state_service import StateService
 from services.document_parser_service import DocumentParserService
@@ -15,31 +18,33 @@ from schemas.rule import (
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/rules", tags=["rules"])
+router = APIRouter(prefix="/rules", tags=["rules"], dependencies=[Depends(get_current_user)])
+
+# get_rule reads by id, collapsed across bursts of requests for the same rule
+_rule_cache = ReadCache()
 
 
 # Rule CRUD operations
 @router.post("", response_model=RuleResponse, status_code=status.HTTP_201_CREATED)
-async def create_rule(
+def create_rule(
     rule_data: RuleCreate,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Create a new rule."""
     service = RuleService(db)
     try:
-        return service.create_rule(rule_data)
+        rule = service.create_rule(rule_data)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return json_response(rule.model_dump(), status_code=status.HTTP_201_CREATED)
 
 
 @router.get("", response_model=RulesListResponse)
-async def list_rules(
+def list_rules(
     state_code: Optional[str] = None,
     active_only: bool = False,
     approved_only: bool = False,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """
     List rules with optional filters.
@@ -54,29 +59,27 @@ async def list_rules(
         active_only=active_only,
         approved_only=approved_only
     )
-    return RulesListResponse(rules=rules, total=len(rules))
+    return json_response({"rules": [r.model_dump() for r in rules], "total": len(rules)})
 
 
 @router.get("/{rule_id}", response_model=RuleResponse)
-async def get_rule(
+def get_rule(
     rule_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Get a single rule by ID."""
     service = RuleService(db)
-    rule = service.get_rule(rule_id)
+    rule = _rule_cache.get(rule_id, lambda: service.get_rule(rule_id))
     if not rule:
         raise HTTPException(status_code=404, detail="Rule not found")
-    return rule
+    return json_response(rule.model_dump())
 
 
 @router.patch("/{rule_id}", response_model=RuleResponse)
-async def update_rule(
+def update_rule(
     rule_id: int,
     rule_data: RuleUpdate,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Update a rule."""
     service = RuleService(db)
@@ -87,16 +90,18 @@ async def update_rule(
         raise HTTPException(status_code=404, detail="Rule not found")
 
     try:
-        return service.update_rule(rule_id, rule_data)
+        rule = service.update_rule(rule_id, rule_data)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        _rule_cache.evict(rule_id)
+    return json_response(rule.model_dump())
 
 
 @router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_rule(
+def delete_rule(
     rule_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Delete a rule."""
     service = RuleService(db)
@@ -110,14 +115,15 @@ async def delete_rule(
         service.delete_rule(rule_id)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        _rule_cache.evict(rule_id)
 
 
 # Bulk operations
 @router.delete("/states/{state_code}/rules", response_model=Dict)
-async def delete_rules_by_state(
+def delete_rules_by_state(
     state_code: str,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """
     Delete all rules for a specific state.
@@ -126,6 +132,7 @@ async def delete_rules_by_state(
     service = RuleService(db)
     try:
         count = service.delete_rules_by_state(state_code)
+        _rule_cache.clear()
         return {
             "message": f"Deleted {count} rules for state {state_code}",
             "count": count,
@@ -137,63 +144,34 @@ async def delete_rules_by_state(
 
 # Get rules by legislation source
 @router.get("/legislation/{source_id}", response_model=RulesListResponse)
-async def get_rules_by_legislation(
+def get_rules_by_legislation(
     source_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """
     Get all rules associated with a specific legislation source.
     This includes rules from all digest versions (active and inactive).
     """
     service = RuleService(db)
-    cursor = db.conn.cursor()
-
-    # Get all rules for this legislation source
-    cursor.execute("""
-        SELECT * FROM rules
-        WHERE legislation_source_id = ?
-        ORDER BY created_at DESC
-    """, (source_id,))
-
-    rows = cursor.fetchall()
-    rules = []
+    rules = service.list_rules_by_legislation(source_id)
+    return json_response({"rules": [r.model_dump() for r in rules], "total": len(rules)})
 
-    for row in rows:
-        rule_dict = dict(zip([col[0] for col in cursor.description], row))
-        rules.append(rule_dict)
 
-    return RulesListResponse(rules=rules, total=len(rules))
-
-
-# Re-digest legislation source into rules
-@router.post("/legislation/{source_id}/digest", response_model=Dict, status_code=status.HTTP_201_CREATED)
-async def digest_legislation_to_rules(
+def _swap_digest(
+    db: ComplianceDatabase,
+    rule_service: RuleService,
     source_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
-):
+    state_code: str,
+    parsed_rules: List[Dict]
+) -> Dict:
     """
-    Digest or re-digest a legislation source into rules using LLM.
-
-    **First digest**: Creates new digest and rules
-    **Re-digest**: Preserves approved/manually-modified rules, replaces unapproved ones
+    Replace a legislation source's active digest and its unprotected rules.
 
-    Protected rules (approved=1 OR is_manually_modified=1) are NOT deleted.
+    Runs in one transaction: deactivates the current digest (if any), deletes
+    its unprotected rules, creates the next digest version and inserts the
+    parsed rules linked to it.
     """
-    logger.info(f"Digesting legislation source {source_id} into rules")
-
-    # Get the legislation source
-    state_service = StateService(db)
-    legislation_source = state_service.get_legislation_source(source_id)
-
-    if not legislation_source:
-        raise HTTPException(status_code=404, detail="Legislation source not found")
-
-    try:
-        rule_service = RuleService(db)
-
-        # Get or create legislation digest
+    with db.transaction():
         cursor = db.conn.cursor()
 
         # Check for existing active digest
@@ -206,16 +184,7 @@ async def digest_legislation_to_rules(
 
         if existing_digest:
             old_digest_id = existing_digest[0]
-            old_version = existing_digest[1]
-            new_version = old_version + 1
-
-            # Get protected rules count before deletion
-            cursor.execute("""
-                SELECT COUNT(*) FROM rules
-                WHERE legislation_digest_id = ?
-                AND (approved = 1 OR is_manually_modified = 1)
-            """, (old_digest_id,))
-            protected_count = cursor.fetchone()[0]
+            new_version = existing_digest[1] + 1
 
             # Mark old digest as inactive
             cursor.execute("""
@@ -226,6 +195,7 @@ async def digest_legislation_to_rules(
             # Delete only unprotected rules from old digest
             deletion_result = rule_service.delete_rules_by_digest(old_digest_id)
             deleted_count = deletion_result["deleted"]
+            protected_count = deletion_result["protected"]
 
             logger.info(f"Re-digest: Deleted {deleted_count} unprotected rules, preserved {protected_count} protected rules")
         else:
@@ -243,23 +213,12 @@ async def digest_legislation_to_rules(
         """, (source_id, 'universal', new_version, 1))
 
         new_digest_id = cursor.lastrowid
-        db.conn.commit()
-
         logger.info(f"Created new digest version {new_version} with id {new_digest_id}")
 
-        # Parse legislation into rules using LLM
-        parser = DocumentParserService()
-        parsed_rules = await parser.parse_legislation_to_rules(
-            legislation_text=legislation_source.full_text,
-            state_code=legislation_source.state_code,
-            statute_number=legislation_source.statute_number
-        )
-
         # Create new rules linked to new digest
-        created_rules = []
-        for rule_data in parsed_rules:
-            rule_create = RuleCreate(
-                state_code=legislation_source.state_code,
+        created_rules = rule_service.create_rules_bulk([
+            RuleCreate(
+                state_code=state_code,
                 legislation_source_id=source_id,
                 legislation_digest_id=new_digest_id,  # Link to new digest
                 rule_text=rule_data["rule_text"],
@@ -269,19 +228,73 @@ async def digest_legislation_to_rules(
                 is_manually_modified=False,
                 status='active'
             )
+            for rule_data in parsed_rules
+        ])
+
+    return {
+        "digest_id": new_digest_id,
+        "version": new_version,
+        "deleted_count": deleted_count,
+        "protected_count": protected_count,
+        "rules": created_rules
+    }
+
+
+# Re-digest legislation source into rules
+@router.post("/legislation/{source_id}/digest", response_model=Dict, status_code=status.HTTP_201_CREATED)
+async def digest_legislation_to_rules(
+    source_id: int,
+    db: ComplianceDatabase = Depends(get_db),
+    parser: DocumentParserService = Depends(get_document_parser)
+):
+    """
+    Digest or re-digest a legislation source into rules using LLM.
+
+    **First digest**: Creates new digest and rules
+    **Re-digest**: Preserves approved/manually-modified rules, replaces unapproved ones
+
+    Protected rules (approved=1 OR is_manually_modified=1) are NOT deleted.
+    """
+    logger.info(f"Digesting legislation source {source_id} into rules")
+
+    # Get the legislation source
+    state_service = StateService(db)
+    legislation_source = await asyncio.to_thread(state_service.get_legislation_source, source_id)
+
+    if not legislation_source:
+        raise HTTPException(status_code=404, detail="Legislation source not found")
+
+    try:
+        rule_service = RuleService(db)
+
+        # Parse legislation into rules using LLM. This runs before any writes
+        # so the slow call never holds the write lock, and a failed parse
+        # leaves the current digest and its rules untouched.
+        parsed_rules = await parser.parse_legislation_to_rules(
+            legislation_text=legislation_source.full_text,
+            state_code=legislation_source.state_code,
+            statute_number=legislation_source.statute_number
+        )
+
+        # The DB phase runs in a worker thread so it doesn't block the loop
+        swap = await asyncio.to_thread(
+            _swap_digest, db, rule_service, source_id, legislation_source.state_code, parsed_rules
+        )
+        new_digest_id = swap["digest_id"]
+        created_rules = swap["rules"]
 
-            rule = rule_service.create_rule(rule_create)
-            created_rules.append(rule)
-            logger.info(f"Created rule {rule.id} linked to digest {new_digest_id}")
+        # The old digest's unprotected rules are gone
+        _rule_cache.clear()
+        logger.info(f"Created {len(created_rules)} rules linked to digest {new_digest_id}")
 
         return {
             "message": f"Successfully digested legislation into {len(created_rules)} new rules",
             "legislation_source_id": source_id,
             "statute_number": legislation_source.statute_number,
             "digest_id": new_digest_id,
-            "digest_version": new_version,
-            "deleted_count": deleted_count,
-            "protected_count": protected_count,
+            "digest_version": swap["version"],
+            "deleted_count": swap["deleted_count"],
+            "protected_count": swap["protected_count"],
             "created_count": len(created_rules),
             "rules": created_rules,
             "requires_review": True
@@ -1,31 +1,45 @@
 """API routes for states and legislation management."""
 
+import asyncio
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from typing import List, Optional, Dict
+import tempfile
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status, UploadFile, File, Form
+from typing import BinaryIO, List, Optional, Dict
 from datetime import date
 
+from core.config import DATABASE_PATH
 from core.database import ComplianceDatabase
-from api.dependencies import get_db, get_current_user
+from api.dependencies import get_db, get_current_user, get_document_parser
+from api.responses import json_response
 from services.state_service import StateService
+from services.rule_service import RuleService
 from services.document_parser_service import DocumentParserService
 from schemas.state import (
     StateCreate, StateUpdate, StateResponse, StatesListResponse,
     LegislationSourceCreate, LegislationSourceUpdate, LegislationSourceResponse,
     LegislationSourcesListResponse,
     LegislationDigestCreate, LegislationDigestUpdate, LegislationDigestResponse,
-    LegislationDigestsListResponse
+    LegislationDigestsListResponse,
+    LegislationUploadResult, LegislationUploadJobResponse
 )
+from schemas.rule import RuleCreate
 
-router = APIRouter(prefix="/states", tags=["states"])
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/states", tags=["states"], dependencies=[Depends(get_current_user)])
+
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_BYTES = 64 * 1024
+UPLOAD_SPOOL_BYTES = 1024 * 1024  # Larger uploads spill to a temp file
+ALLOWED_UPLOAD_TYPES = frozenset({"application/pdf", "text/markdown", "text/plain"})
+ALLOWED_UPLOAD_EXTENSIONS = frozenset({"pdf", "md", "txt"})
 
 
 # States
 @router.post("", response_model=StateResponse, status_code=status.HTTP_201_CREATED)
 async def create_state(
     state_data: StateCreate,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Create a new state."""
     service = StateService(db)
@@ -38,8 +52,7 @@ async def create_state(
 @router.get("", response_model=StatesListResponse)
 async def list_states(
     active_only: bool = False,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """List all states."""
     service = StateService(db)
@@ -50,8 +63,7 @@ async def list_states(
 @router.get("/code/{state_code}", response_model=StateResponse)
 async def get_state_by_code(
     state_code: str,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Get a state by code."""
     service = StateService(db)
@@ -63,69 +75,38 @@ async def get_state_by_code(
 
 
 # Legislation Sources
-@router.post("/legislation/upload", response_model=Dict, status_code=status.HTTP_201_CREATED)
-async def upload_legislation_document(
-    file: UploadFile = File(...),
-    state_code: str = Form(...),
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
-):
-    """
-    Upload and digest a legislation document (PDF, Markdown, or Plain Text).
-    The document will be digested using AI and legislation sources with digests will be created.
-    """
-    logger = logging.getLogger(__name__)
-    logger.info(f"Upload started for file: {file.filename}, state: {state_code}")
-
-    # Validate file type
-    allowed_types = ["application/pdf", "text/markdown", "text/plain"]
-    allowed_extensions = [".pdf", ".md", ".txt"]
-
-    file_extension = file.filename.lower().split(".")[-1] if "." in file.filename else ""
-    logger.info(f"File extension: {file_extension}, content_type: {file.content_type}")
-
-    if file.content_type not in allowed_types and f".{file_extension}" not in allowed_extensions:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported file type. Allowed: PDF, Markdown (.md), Plain Text (.txt)"
-        )
-
-    # Read file content
-    try:
-        logger.info("Reading file content...")
-        file_content = await file.read()
-        logger.info(f"File read successfully, size: {len(file_content)} bytes")
-        if len(file_content) == 0:
-            raise HTTPException(status_code=400, detail="File is empty")
-
-        if len(file_content) > 10 * 1024 * 1024:  # 10MB limit
-            raise HTTPException(status_code=400, detail="File too large. Maximum size is 10MB")
-
-    except Exception as e:
-        logger.error(f"Failed to read file: {str(e)}")
-        raise HTTPException(status_code=400, detail=f"Failed to read file: {str(e)}")
-
-    # Digest document with AI
-    try:
-        logger.info("Starting document parsing with AI...")
-        parser = DocumentParserService()
-        logger.info("DocumentParserService instantiated")
-        parsed_data = await parser.parse_document(
-            file_content=file_content,
-            filename=file.filename,
-            state_code=state_code,
-            mime_type=file.content_type or ""
-        )
-        logger.info("Document parsed successfully")
-    except ValueError as e:
-        logger.error(f"ValueError during parsing: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Exception during parsing: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Failed to digest document: {str(e)}")
+async def _process_upload(
+    db: ComplianceDatabase,
+    job_id: int,
+    spool: BinaryIO,
+    filename: str,
+    mime_type: str,
+    state_code: str,
+    created_by: Optional[int],
+    parser: DocumentParserService
+) -> Dict:
+    """Digest an uploaded document into a legislation source, digest and rules."""
+    db.update_legislation_upload_job(job_id, progress="Digesting document")
+    parsed_data = await parser.parse_document(
+        file=spool,
+        filename=filename,
+        state_code=state_code,
+        mime_type=mime_type
+    )
+    logger.info(f"Upload job {job_id}: document parsed successfully")
+
+    # Rule generation only needs the parsed text, so start that LLM call now
+    # and let it run while the source and digest are written
+    rules_task = None
+    if parsed_data.get("digests"):
+        rules_task = asyncio.create_task(parser.parse_legislation_to_rules(
+            legislation_text=parsed_data["full_text"],
+            state_code=state_code.upper(),
+            statute_number=parsed_data["statute_number"]
+        ))
 
-    # Create legislation source
     try:
+        db.update_legislation_upload_job(job_id, progress="Creating legislation source")
         service = StateService(db)
 
         # Create the legislation source
@@ -140,52 +121,53 @@ async def upload_legislation_document(
             applies_to_page_types=parsed_data.get("applies_to_page_types")
         )
 
-        legislation_source = service.create_legislation_source(source_create)
+        try:
+            legislation_source = service.create_legislation_source(source_create)
+        except Exception as e:
+            # Provide user-friendly error for duplicate legislation
+            if "UNIQUE constraint failed" in str(e) and "legislation_sources" in str(e):
+                raise ValueError(
+                    f"Legislation source '{parsed_data['statute_number']}' already exists for state {state_code}. "
+                    "Please delete the existing source first or use manual entry to update it."
+                )
+            raise
         logger.info(f"Created legislation source ID: {legislation_source.id}")
 
         # Create single digest with combined requirements
         digest = None
+        created_rules = []
         if parsed_data.get("digests"):
             logger.info(f"Parser returned {len(parsed_data['digests'])} digest sections")
 
             # Combine all interpreted requirements into one digest
-            all_requirements = []
-            for digest_data in parsed_data["digests"]:
-                requirements = digest_data.get("interpreted_requirements", "")
-                if requirements:
-                    all_requirements.append(requirements)
-
-            combined_requirements = "\n\n".join(all_requirements)
+            combined_requirements = "\n\n".join(
+                digest_data["interpreted_requirements"]
+                for digest_data in parsed_data["digests"]
+                if digest_data.get("interpreted_requirements")
+            )
 
             logger.info("Creating single digest with combined requirements")
             digest_create = LegislationDigestCreate(
                 legislation_source_id=legislation_source.id,
                 interpreted_requirements=combined_requirements,
                 approved=False,  # Requires manual review
-                created_by=current_user.get("id")
+                created_by=created_by
             )
 
             digest = service.create_legislation_digest(digest_create)
             logger.info(f"Created digest successfully with ID: {digest.id}")
 
             # Generate rules from the digest using LLM
-            from services.rule_service import RuleService
-            from schemas.rule import RuleCreate
-
+            db.update_legislation_upload_job(job_id, progress="Generating rules")
             rule_service = RuleService(db)
-            parser = DocumentParserService()
 
             logger.info(f"Generating rules from digest {digest.id}")
-            parsed_rules = await parser.parse_legislation_to_rules(
-                legislation_text=legislation_source.full_text,
-                state_code=legislation_source.state_code,
-                statute_number=legislation_source.statute_number
-            )
+            parsed_rules = await rules_task
 
-            # Create rules linked to the digest
-            created_rules = []
-            for rule_data in parsed_rules:
-                rule_create = RuleCreate(
+            # Create rules linked to the digest in one insert. It's a
+            # transaction (blocking write lock), so not on the event loop.
+            created_rules = await asyncio.to_thread(rule_service.create_rules_bulk, [
+                RuleCreate(
                     state_code=legislation_source.state_code,
                     legislation_source_id=legislation_source.id,
                     legislation_digest_id=digest.id,
@@ -196,42 +178,170 @@ async def upload_legislation_document(
                     is_manually_modified=False,
                     status='active'
                 )
-                rule = rule_service.create_rule(rule_create)
-                created_rules.append(rule)
-                logger.info(f"Created rule {rule.id} linked to digest {digest.id}")
+                for rule_data in parsed_rules
+            ])
 
             logger.info(f"Generated {len(created_rules)} rules from digest {digest.id}")
 
-        return {
-            "message": "Document uploaded and digested successfully",
-            "legislation_source": legislation_source,
-            "digest": digest,
-            "rules_created": len(created_rules) if digest else 0,
-            "requires_review": True
-        }
+        return LegislationUploadResult(
+            legislation_source=legislation_source,
+            digest=digest,
+            rules_created=len(created_rules),
+            requires_review=True
+        ).model_dump(mode="json")
 
-    except ValueError as e:
-        logger.error(f"ValueError in upload: {str(e)}")
-        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        # Don't leave the rule generation call running if the writes failed
+        if rules_task is not None and not rules_task.done():
+            rules_task.cancel()
+
+
+async def _run_upload_job(
+    job_id: int,
+    spool: BinaryIO,
+    filename: str,
+    mime_type: str,
+    state_code: str,
+    created_by: Optional[int],
+    parser: DocumentParserService
+):
+    """
+    Run a legislation upload job after the response is sent.
+
+    Opens its own database connection (as the intelligent setup job does)
+    and owns the spooled upload, closing it when done.
+    """
+    job_db = ComplianceDatabase(DATABASE_PATH)
+    try:
+        job_db.update_legislation_upload_job(job_id, status="running")
+        result = await _process_upload(
+            job_db, job_id, spool, filename, mime_type, state_code, created_by, parser
+        )
+        job_db.update_legislation_upload_job(job_id, status="completed", result=result)
     except Exception as e:
-        logger.error(f"Exception in upload: {str(e)}", exc_info=True)
-        error_msg = str(e)
-
-        # Provide user-friendly error for duplicate legislation
-        if "UNIQUE constraint failed" in error_msg and "legislation_sources" in error_msg:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Legislation source '{parsed_data['statute_number']}' already exists for state {state_code}. Please delete the existing source first or use manual entry to update it."
-            )
+        logger.error(f"Legislation upload job {job_id} failed: {str(e)}", exc_info=True)
+        error = str(e) if isinstance(e, ValueError) else f"Failed to digest document: {str(e)}"
+        job_db.update_legislation_upload_job(job_id, status="failed", error=error)
+    finally:
+        spool.close()
+        job_db.close()
+
+
+@router.post(
+    "/legislation/upload",
+    response_model=LegislationUploadJobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def upload_legislation_document(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    state_code: str = Form(...),
+    db: ComplianceDatabase = Depends(get_db),
+    parser: DocumentParserService = Depends(get_document_parser),
+    current_user: Dict = Depends(get_current_user)
+):
+    """
+    Upload and digest a legislation document (PDF, Markdown, or Plain Text).
+
+    The file is validated and stored, then digested in a background job that
+    creates the legislation source, its digest and rules. Returns the job ID
+    immediately; poll GET /states/legislation/jobs/{job_id} for progress and
+    the created source.
+    """
+    logger.info(f"Upload started for file: {file.filename}, state: {state_code}")
+
+    # Validate file type
+    file_extension = file.filename.lower().rpartition(".")[2] if "." in file.filename else ""
+    logger.info(f"File extension: {file_extension}, content_type: {file.content_type}")
+
+    if file.content_type not in ALLOWED_UPLOAD_TYPES and file_extension not in ALLOWED_UPLOAD_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Allowed: PDF, Markdown (.md), Plain Text (.txt)"
+        )
+
+    # Starlette records the size of each uploaded file as it parses the form,
+    # so an oversize file is rejected here without copying or parsing it
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File too large. Maximum size is 10MB"
+        )
+
+    # Stream the upload in chunks, rejecting oversize files as soon as they
+    # cross the limit (in case the size wasn't recorded). The spool is handed
+    # to the background job, which closes it.
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES)
+    try:
+        logger.info("Reading file content...")
+        size = 0
+        while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+            size += len(chunk)
+            if size > MAX_UPLOAD_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="File too large. Maximum size is 10MB"
+                )
+            spool.write(chunk)
+        logger.info(f"File read successfully, size: {size} bytes")
+        if size == 0:
+            raise HTTPException(status_code=400, detail="File is empty")
+        spool.seek(0)
+
+        job_id = db.create_legislation_upload_job(
+            state_code.upper(), file.filename, created_by=current_user.get("user_id")
+        )
+
+    except HTTPException:
+        spool.close()
+        raise
+    except Exception as e:
+        spool.close()
+        logger.error(f"Failed to read file: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to read file: {str(e)}")
+
+    background_tasks.add_task(
+        _run_upload_job,
+        job_id, spool, file.filename, file.content_type or "", state_code,
+        current_user.get("user_id"), parser
+    )
+
+    return LegislationUploadJobResponse(
+        job_id=job_id,
+        status="pending",
+        status_url=request.url_for("get_legislation_upload_job", job_id=job_id).path
+    )
+
 
-        raise HTTPException(status_code=500, detail=f"Failed to create legislation: {error_msg}")
+@router.get("/legislation/jobs/{job_id}", response_model=LegislationUploadJobResponse)
+async def get_legislation_upload_job(
+    job_id: int,
+    request: Request,
+    db: ComplianceDatabase = Depends(get_db),
+    current_user: Dict = Depends(get_current_user)
+):
+    """Get the status of a legislation upload job started by the current user."""
+    # A job whose worker died stops updating; fail it so the poll ends
+    db.fail_stale_legislation_upload_jobs(job_id=job_id)
+    job = db.get_legislation_upload_job(job_id)
+    if not job or job["created_by"] != current_user.get("user_id"):
+        raise HTTPException(status_code=404, detail="Upload job not found")
+
+    return LegislationUploadJobResponse(
+        job_id=job["id"],
+        status=job["status"],
+        status_url=request.url.path,
+        progress=job["progress"],
+        result=job["result"],
+        error=job["error"]
+    )
 
 
 @router.post("/legislation", response_model=LegislationSourceResponse, status_code=status.HTTP_201_CREATED)
 async def create_legislation_source(
     source_data: LegislationSourceCreate,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Create a new legislation source."""
     service = StateService(db)
@@ -245,28 +355,26 @@ async def create_legislation_source(
 @router.get("/legislation", response_model=LegislationSourcesListResponse)
 async def list_legislation_sources(
     state_code: Optional[str] = None,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """List legislation sources, optionally filtered by state."""
     service = StateService(db)
     sources = service.list_legislation_sources(state_code=state_code)
-    return LegislationSourcesListResponse(sources=sources, total=len(sources))
+    return json_response(LegislationSourcesListResponse(sources=sources, total=len(sources)).model_dump())
 
 
 
 @router.get("/legislation/{source_id}", response_model=LegislationSourceResponse)
 async def get_legislation_source(
     source_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Get a legislation source by ID."""
     service = StateService(db)
     source = service.get_legislation_source(source_id)
     if not source:
         raise HTTPException(status_code=404, detail="Legislation source not found")
-    return source
+    return json_response(source.model_dump())
 
 
 
@@ -274,8 +382,7 @@ async def get_legislation_source(
 async def update_legislation_source(
     source_id: int,
     source_data: LegislationSourceUpdate,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Update a legislation source."""
     service = StateService(db)
@@ -288,8 +395,7 @@ async def update_legislation_source(
 @router.delete("/legislation/{source_id}", status_code=status.HTTP_200_OK)
 async def delete_legislation_source(
     source_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """
     Delete a legislation source and all associated data.
@@ -319,8 +425,7 @@ async def delete_legislation_source(
 async def create_legislation_digest(
     source_id: int,
     digest_data: LegislationDigestCreate,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Create a new legislation digest."""
     service = StateService(db)
@@ -343,8 +448,7 @@ async def create_legislation_digest(
 async def list_legislation_digests(
     source_id: int,
     approved_only: bool = False,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """List legislation digests for a source."""
     service = StateService(db)
@@ -352,22 +456,21 @@ async def list_legislation_digests(
         legislation_source_id=source_id,
         approved_only=approved_only
     )
-    return LegislationDigestsListResponse(digests=digests, total=len(digests))
+    return json_response(LegislationDigestsListResponse(digests=digests, total=len(digests)).model_dump())
 
 
 
 @router.get("/digests/{digest_id}", response_model=LegislationDigestResponse)
 async def get_legislation_digest(
     digest_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Get a legislation digest by ID."""
     service = StateService(db)
     digest = service.get_legislation_digest(digest_id)
     if not digest:
         raise HTTPException(status_code=404, detail="Legislation digest not found")
-    return digest
+    return json_response(digest.model_dump())
 
 
 
@@ -375,8 +478,7 @@ async def get_legislation_digest(
 async def update_legislation_digest(
     digest_id: int,
     digest_data: LegislationDigestUpdate,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Update a legislation digest."""
     service = StateService(db)
@@ -389,8 +491,7 @@ async def update_legislation_digest(
 @router.get("/{state_id}", response_model=StateResponse)
 async def get_state(
     state_id: int,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Get a state by ID."""
     service = StateService(db)
@@ -405,8 +506,7 @@ async def get_state(
 async def update_state(
     state_id: int,
     state_data: StateUpdate,
-    db: ComplianceDatabase = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: ComplianceDatabase = Depends(get_db)
 ):
     """Update a state."""
     service = StateService(db)
@@ -1,13 +1,22 @@
 """LLM-based compliance analysis using OpenAI API."""
 
 import os
-from typing import Dict, List, Optional
-from openai import AsyncOpenAI
+import asyncio
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 import json
 import logging
+import orjson
 from dotenv import load_dotenv
 
-from .config import StateRules, OPENAI_MODEL, MAX_TOKENS, TEMPERATURE
+from .config import (
+    StateRules, OPENAI_MODEL, MAX_TOKENS, TEMPERATURE, LOG_PROMPTS,
+    OPENAI_CONCURRENCY, OPENAI_MAX_RETRIES
+)
 from .url_type_preambles import get_preamble, get_url_type_name
 from .page_type_rules import format_rules_for_prompt
 
@@ -16,6 +25,195 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# The analysis prompt is assembled from these pieces. Only _PROMPT_HEAD and
+# _STATE_RULES_SECTION are interpolated per request; the guidelines and
+# output instructions are fixed and joined in as-is.
+_SYSTEM_MESSAGE = "You are an expert in automotive dealership compliance and advertising regulations. Analyze the provided content for compliance violations with precision and cite specific examples."
+
+# Fixed parts of every analysis request; the SDK only reads these
+_SYSTEM_MESSAGE_PARAM = {"role": "system", "content": _SYSTEM_MESSAGE}
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+_PROMPT_HEAD = """Analyze the following auto dealership website content for compliance with {state} regulations.
+
+URL: {url}
+Page Type: {page_type}
+
+{page_rules_context}
+
+{url_type_context}
+
+"""
+
+_GUIDELINES = """# General Analysis Guidelines
+
+When evaluating compliance, apply these principles:
+
+**Interpretation of Terms:**
+- "Adjacent to price" means within the same visual section or pricing module. If vehicle identification appears as a HEADING above the price section (even with a few lines between), it counts as adjacent. The key test: would a consumer looking at the price also see the vehicle identification without scrolling or changing focus? If yes, it's adjacent.
+- "Conspicuous" means reasonably visible and readable to a typical consumer. Information doesn't need to be in the largest font or highlighted - it just needs to be in a logical location where consumers would naturally find it when reviewing the vehicle and pricing information.
+- **Important**: If vehicle year/make/model appears in the page title, section heading, or within 10 lines of the price, consider it adjacent unless it's obviously hidden or in an unrelated section.
+- Focus on the **spirit and intent** of regulations, not overly technical or pedantic interpretations. Regulations aim to prevent consumer deception, not punish reasonable layout choices.
+
+**Evaluation Approach:**
+- Give credit when information is present and reasonably accessible, even if placement isn't perfect.
+- Distinguish between **substantive violations** (missing required information) and **technical violations** (information present but formatting could be improved).
+- Flag as violations only when information is truly missing, misleading, or so poorly positioned that consumers would likely miss it.
+- If a dealership has made a good-faith effort to comply and information is available, note areas for improvement rather than strict violations.
+
+**Severity Assessment:**
+- **Critical**: Required information completely missing or actively misleading
+- **High**: Information present but poorly positioned/formatted, likely to cause consumer confusion
+- **Medium**: Information present but could be more prominent or clear
+- **Low**: Minor formatting improvements that would enhance compliance
+
+**Balanced Reporting:**
+- Actively look for and acknowledge compliant items - don't only focus on violations.
+- Consider the overall user experience and whether consumers can reasonably find important information.
+- Avoid flagging violations where the dealership has substantially met the requirement.
+
+"""
+
+_STATE_RULES_SECTION = """# State-Specific Requirements for {state}
+
+## Required Disclosures
+{required_disclosures}
+
+## Pricing Rules
+{pricing_rules}
+
+## Financing Rules
+{financing_rules}
+
+# Website Content to Analyze
+
+"""
+
+_INSTRUCTIONS = """
+
+# Analysis Instructions
+
+Please provide a compliance analysis in JSON format with the following structure:
+
+{
+    "overall_compliance_score": <number 0-100>,
+    "compliance_status": "<compliant|needs_review|non_compliant>",
+    "violations": [
+        {
+            "category": "<disclosure|pricing|financing>",
+            "severity": "<critical|high|medium|low>",
+            "rule_violated": "<specific rule from requirements>",
+            "rule_key": "<short_snake_case_key_for_this_rule>",
+            "confidence": <number 0.0-1.0 indicating confidence in this violation>,
+            "description": "<what the violation is>",
+            "evidence": "<quote from content showing the violation>",
+            "recommendation": "<how to fix it>",
+            "needs_visual_verification": <true/false - true if spatial/visual judgment is uncertain>
+        }
+    ],
+    "compliant_items": [
+        {
+            "category": "<disclosure|pricing|financing>",
+            "rule": "<specific rule>",
+            "evidence": "<quote showing compliance>"
+        }
+    ],
+    "missing_information": [
+        "<list of required items not found on the page>"
+    ],
+    "recommendations": [
+        "<general recommendations for improving compliance>"
+    ],
+    "summary": "<brief 2-3 sentence summary of compliance status>"
+}
+
+**Confidence and Visual Verification Guidelines:**
+- Set "confidence" based on how certain you are from text alone:
+  - 0.9-1.0: Extremely confident (information clearly present or clearly missing)
+  - 0.7-0.9: Confident (likely correct but some ambiguity)
+  - 0.5-0.7: Moderate confidence (text suggests violation but spatial/visual layout unclear)
+  - 0.0-0.5: Low confidence (requires visual confirmation)
+
+- Set "needs_visual_verification" to true when:
+  - Judging spatial proximity ("adjacent to", "conspicuous")
+  - Assessing visual hierarchy (font size, prominence)
+  - Layout/positioning is critical to compliance
+  - Confidence < 0.7 on HIGH or CRITICAL severity violations
+
+- Set "rule_key" as a short identifier (e.g., "vehicle_id_adjacent", "dealer_name_conspicuous")
+
+Be thorough and cite specific examples from the content. If information is not found, note it in missing_information.
+"""
+
+# One client (and its HTTP connection pool) per process for the default key.
+_CLIENT: Optional[AsyncOpenAI] = None
+
+# HTTP/2 lets concurrent analyses (batch_analyze, parallel rescans) share a
+# few TLS connections to the API instead of opening one per request
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+_HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+
+def _new_client(api_key: str) -> AsyncOpenAI:
+    """Create an AsyncOpenAI client on an HTTP/2 connection pool."""
+    return AsyncOpenAI(
+        api_key=api_key,
+        max_retries=OPENAI_MAX_RETRIES,
+        http_client=DefaultAsyncHttpxClient(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    )
+
+
+def _get_client(api_key: str) -> AsyncOpenAI:
+    """Return the shared AsyncOpenAI client, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = _new_client(api_key)
+    elif _CLIENT.api_key != api_key:
+        # A caller-supplied key gets its own client rather than the shared one
+        return _new_client(api_key)
+    return _CLIENT
+
+
+async def close_client():
+    """Close the shared AsyncOpenAI client (on shutdown)."""
+    global _CLIENT
+    if _CLIENT is not None:
+        client, _CLIENT = _CLIENT, None
+        await client.close()
+
+
+def _save_prompt(prompt: str, url: str, state: str, url_type: str) -> Path:
+    """Write the full prompt sent to the model to llm_inputs/ for review."""
+    input_dir = Path("llm_inputs")
+    input_dir.mkdir(exist_ok=True)
+
+    now = datetime.now()
+    url_slug = url.split('://', 1)[-1].replace('/', '_')[:50]
+    prompt_filename = input_dir / f"full_prompt_{url_slug}_{now.strftime('%Y%m%d_%H%M%S')}.txt"
+
+    rule = "=" * 80
+    prompt_filename.write_text("".join((
+        "# Complete Prompt Sent to GPT-4.1-nano\n\n",
+        f"**URL:** {url}\n",
+        f"**State:** {state}\n",
+        f"**URL Type:** {get_url_type_name(url_type)}\n",
+        f"**Timestamp:** {now.strftime('%Y-%m-%d %H:%M:%S')}\n",
+        f"**Model:** {OPENAI_MODEL}\n",
+        f"**Character Count:** {len(prompt)}\n\n",
+        f"{rule}\nSYSTEM MESSAGE:\n{rule}\n\n",
+        _SYSTEM_MESSAGE + "\n\n",
+        f"{rule}\nUSER PROMPT:\n{rule}\n\n",
+        prompt,
+    )), encoding='utf-8')
+    return prompt_filename
+
+
+@lru_cache(maxsize=64)
+def _format_rules(rules: Tuple[str, ...]) -> str:
+    """Format a list of rules as markdown (cached; state rules rarely change)."""
+    return "\n".join([f"- {rule}" for rule in rules])
+
+
 class ComplianceAnalyzer:
     """Analyzes dealership content for compliance using LLM."""
 
@@ -30,7 +228,7 @@ class ComplianceAnalyzer:
         if not self.api_key:
             raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY environment variable.")
 
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        self.client = _get_client(self.api_key)
         logger.info("ComplianceAnalyzer initialized")
 
     async def analyze_compliance(
@@ -57,52 +255,26 @@ class ComplianceAnalyzer:
         # Build the analysis prompt
         prompt = self._build_analysis_prompt(content, state_rules, url, url_type)
 
-        # Save the full prompt with rules for review
-        from datetime import datetime
-        from pathlib import Path
-
-        input_dir = Path("llm_inputs")
-        input_dir.mkdir(exist_ok=True)
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        url_slug = url.replace('https://', '').replace('http://', '').replace('/', '_')[:50]
-        prompt_filename = input_dir / f"full_prompt_{url_slug}_{timestamp}.txt"
-
-        with open(prompt_filename, 'w', encoding='utf-8') as f:
-            f.write(f"# Complete Prompt Sent to GPT-4.1-nano\n\n")
-            f.write(f"**URL:** {url}\n")
-            f.write(f"**State:** {state_rules.state}\n")
-            f.write(f"**URL Type:** {get_url_type_name(url_type)}\n")
-            f.write(f"**Timestamp:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"**Model:** {OPENAI_MODEL}\n")
-            f.write(f"**Character Count:** {len(prompt)}\n\n")
-            f.write("="*80 + "\n")
-            f.write("SYSTEM MESSAGE:\n")
-            f.write("="*80 + "\n\n")
-            f.write("You are an expert in automotive dealership compliance and advertising regulations. Analyze the provided content for compliance violations with precision and cite specific examples.\n\n")
-            f.write("="*80 + "\n")
-            f.write("USER PROMPT:\n")
-            f.write("="*80 + "\n\n")
-            f.write(prompt)
-
-        logger.info(f"Full prompt saved to: {prompt_filename}")
+        # Save the full prompt with rules for review (off the event loop)
+        if LOG_PROMPTS:
+            prompt_filename = await asyncio.to_thread(
+                _save_prompt, prompt, url, state_rules.state, url_type
+            )
+            logger.info(f"Full prompt saved to: {prompt_filename}")
 
         try:
             # Call OpenAI API with structured output
             response = await self.client.chat.completions.create(
                 model=OPENAI_MODEL,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert in automotive dealership compliance and advertising regulations. Analyze the provided content for compliance violations with precision and cite specific examples."
-                    },
+                    _SYSTEM_MESSAGE_PARAM,
                     {
                         "role": "user",
                         "content": prompt
                     }
                 ],
                 max_completion_tokens=MAX_TOKENS,
-                response_format={"type": "json_object"}
+                response_format=_JSON_RESPONSE_FORMAT
             )
 
             # Parse the response
@@ -112,7 +284,7 @@ class ComplianceAnalyzer:
             if not result_text:
                 raise ValueError("Empty response from API")
 
-            result = json.loads(result_text)
+            result = orjson.loads(result_text)
 
             # Add metadata
             result["url"] = url
@@ -157,115 +329,29 @@ class ComplianceAnalyzer:
             base_rules=[]  # Not used currently
         )
 
-        prompt = f"""Analyze the following auto dealership website content for compliance with {state_rules.state} regulations.
-
-URL: {url}
-Page Type: {get_url_type_name(url_type)}
-
-{page_rules_context}
-
-{url_type_context}
-
-# General Analysis Guidelines
-
-When evaluating compliance, apply these principles:
-
-**Interpretation of Terms:**
-- "Adjacent to price" means within the same visual section or pricing module. If vehicle identification appears as a HEADING above the price section (even with a few lines between), it counts as adjacent. The key test: would a consumer looking at the price also see the vehicle identification without scrolling or changing focus? If yes, it's adjacent.
-- "Conspicuous" means reasonably visible and readable to a typical consumer. Information doesn't need to be in the largest font or highlighted - it just needs to be in a logical location where consumers would naturally find it when reviewing the vehicle and pricing information.
-- **Important**: If vehicle year/make/model appears in the page title, section heading, or within 10 lines of the price, consider it adjacent unless it's obviously hidden or in an unrelated section.
-- Focus on the **spirit and intent** of regulations, not overly technical or pedantic interpretations. Regulations aim to prevent consumer deception, not punish reasonable layout choices.
-
-**Evaluation Approach:**
-- Give credit when information is present and reasonably accessible, even if placement isn't perfect.
-- Distinguish between **substantive violations** (missing required information) and **technical violations** (information present but formatting could be improved).
-- Flag as violations only when information is truly missing, misleading, or so poorly positioned that consumers would likely miss it.
-- If a dealership has made a good-faith effort to comply and information is available, note areas for improvement rather than strict violations.
-
-**Severity Assessment:**
-- **Critical**: Required information completely missing or actively misleading
-- **High**: Information present but poorly positioned/formatted, likely to cause consumer confusion
-- **Medium**: Information present but could be more prominent or clear
-- **Low**: Minor formatting improvements that would enhance compliance
-
-**Balanced Reporting:**
-- Actively look for and acknowledge compliant items - don't only focus on violations.
-- Consider the overall user experience and whether consumers can reasonably find important information.
-- Avoid flagging violations where the dealership has substantially met the requirement.
-
-# State-Specific Requirements for {state_rules.state}
-
-## Required Disclosures
-{self._format_rules_list(state_rules.required_disclosures)}
-
-## Pricing Rules
-{self._format_rules_list(state_rules.pricing_rules)}
-
-## Financing Rules
-{self._format_rules_list(state_rules.financing_rules)}
-
-# Website Content to Analyze
-
-{content}
-
-# Analysis Instructions
-
-Please provide a compliance analysis in JSON format with the following structure:
-
-{{
-    "overall_compliance_score": <number 0-100>,
-    "compliance_status": "<compliant|needs_review|non_compliant>",
-    "violations": [
-        {{
-            "category": "<disclosure|pricing|financing>",
-            "severity": "<critical|high|medium|low>",
-            "rule_violated": "<specific rule from requirements>",
-            "rule_key": "<short_snake_case_key_for_this_rule>",
-            "confidence": <number 0.0-1.0 indicating confidence in this violation>,
-            "description": "<what the violation is>",
-            "evidence": "<quote from content showing the violation>",
-            "recommendation": "<how to fix it>",
-            "needs_visual_verification": <true/false - true if spatial/visual judgment is uncertain>
-        }}
-    ],
-    "compliant_items": [
-        {{
-            "category": "<disclosure|pricing|financing>",
-            "rule": "<specific rule>",
-            "evidence": "<quote showing compliance>"
-        }}
-    ],
-    "missing_information": [
-        "<list of required items not found on the page>"
-    ],
-    "recommendations": [
-        "<general recommendations for improving compliance>"
-    ],
-    "summary": "<brief 2-3 sentence summary of compliance status>"
-}}
-
-**Confidence and Visual Verification Guidelines:**
-- Set "confidence" based on how certain you are from text alone:
-  - 0.9-1.0: Extremely confident (information clearly present or clearly missing)
-  - 0.7-0.9: Confident (likely correct but some ambiguity)
-  - 0.5-0.7: Moderate confidence (text suggests violation but spatial/visual layout unclear)
-  - 0.0-0.5: Low confidence (requires visual confirmation)
-
-- Set "needs_visual_verification" to true when:
-  - Judging spatial proximity ("adjacent to", "conspicuous")
-  - Assessing visual hierarchy (font size, prominence)
-  - Layout/positioning is critical to compliance
-  - Confidence < 0.7 on HIGH or CRITICAL severity violations
-
-- Set "rule_key" as a short identifier (e.g., "vehicle_id_adjacent", "dealer_name_conspicuous")
-
-Be thorough and cite specific examples from the content. If information is not found, note it in missing_information.
-"""
+        prompt = "".join((
+            _PROMPT_HEAD.format_map({
+                "state": state_rules.state,
+                "url": url,
+                "page_type": get_url_type_name(url_type),
+                "page_rules_context": page_rules_context,
+                "url_type_context": url_type_context,
+            }),
+            _GUIDELINES,
+            _STATE_RULES_SECTION.format_map({
+                "state": state_rules.state,
+                "required_disclosures": self._format_rules_list(state_rules.required_disclosures),
+                "pricing_rules": self._format_rules_list(state_rules.pricing_rules),
+                "financing_rules": self._format_rules_list(state_rules.financing_rules),
+            }),
+            content,
+            _INSTRUCTIONS,
+        ))
         return prompt
 
-    def _format_rules_list(self, rules: List[str]) -> str:
+    def _format_rules_list(self, rules: Tuple[str, ...]) -> str:
         """Format a list of rules as markdown."""
-        return "\n".join([f"- {rule}" for rule in rules])
+        return _format_rules(rules)
 
     async def batch_analyze(
         self,
@@ -282,32 +368,34 @@ Be thorough and cite specific examples from the content. If information is not f
         Returns:
             List of analysis results
         """
-        import asyncio
-
-        tasks = [
-            self.analyze_compliance(
-                content=item["content"],
-                state_rules=state_rules,
-                url=item.get("url", "")
-            )
-            for item in contents
-        ]
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Filter out exceptions
-        valid_results = []
-        for i, result in enumerate(results):
+        # Gate the fan-out so a large batch doesn't hit the rate limit with
+        # hundreds of simultaneous requests; results keep input order.
+        semaphore = asyncio.Semaphore(OPENAI_CONCURRENCY)
+
+        async def analyze(i: int, item: Dict[str, str]):
+            async with semaphore:
+                try:
+                    return i, await self.analyze_compliance(
+                        content=item["content"],
+                        state_rules=state_rules,
+                        url=item.get("url", "")
+                    )
+                except Exception as e:
+                    return i, e
+
+        results: List[Optional[Dict]] = [None] * len(contents)
+        for next_result in asyncio.as_completed([analyze(i, item) for i, item in enumerate(contents)]):
+            i, result = await next_result
             if isinstance(result, Exception):
                 logger.error(f"Failed to analyze {contents[i].get('url', 'unknown')}: {result}")
-                valid_results.append({
+                results[i] = {
                     "error": str(result),
                     "url": contents[i].get("url", "")
-                })
+                }
             else:
-                valid_results.append(result)
+                results[i] = result
 
-        return valid_results
+        return results
 
 
 async def main():
@@ -340,5 +428,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
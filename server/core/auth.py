@@ -2,24 +2,114 @@
 
 import os
 import jwt
+import orjson
+import base64
 import secrets
 import hashlib
+import hmac
+import threading
+import time
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Optional, Dict
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
+from argon2 import PasswordHasher, extract_parameters
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
+from cachetools import TTLCache
 import logging
 
+from .config import DATABASE_PATH
+
 logger = logging.getLogger(__name__)
 
+# Argon2 parameters start from the OWASP 2023 baseline (19 MiB, t=2, p=1);
+# memory_cost is then raised until one hash takes at least ~40ms on this host.
+ARGON2_TIME_COST = 2
+ARGON2_PARALLELISM = 1
+ARGON2_MIN_MEMORY_COST = 19456  # KiB, OWASP minimum; never calibrated below
+ARGON2_MAX_MEMORY_COST = 262144  # KiB (256 MiB)
+ARGON2_MIN_HASH_MS = 40
+
+# The calibrated memory_cost is saved next to the database, so every worker
+# and every restart uses the same parameters (ARGON2_MEMORY_COST overrides)
+ARGON2_CALIBRATION_PATH = Path(
+    os.getenv("ARGON2_CALIBRATION_PATH", str(Path(DATABASE_PATH).parent / "argon2_memory_cost"))
+)
+
+
+def _calibrate_memory_cost() -> int:
+    """
+    Time hashes from the OWASP minimum upwards, doubling memory_cost while
+    a hash takes under ARGON2_MIN_HASH_MS. Only ever grows, so it takes at
+    most a handful of probes.
+    """
+    memory_cost = ARGON2_MIN_MEMORY_COST
+    while memory_cost * 2 <= ARGON2_MAX_MEMORY_COST:
+        hasher = PasswordHasher(
+            time_cost=ARGON2_TIME_COST, memory_cost=memory_cost, parallelism=ARGON2_PARALLELISM
+        )
+        start = time.perf_counter()
+        hasher.hash("x")
+        if (time.perf_counter() - start) * 1000 >= ARGON2_MIN_HASH_MS:
+            break
+        memory_cost *= 2
+    return memory_cost
+
+
+def _load_memory_cost() -> int:
+    """Return the pinned, saved or (first time only) freshly calibrated memory_cost."""
+    pinned = os.getenv("ARGON2_MEMORY_COST")
+    if pinned:
+        return int(pinned)
+
+    path = ARGON2_CALIBRATION_PATH
+    try:
+        return int(path.read_text())
+    except (FileNotFoundError, ValueError):
+        pass
+
+    memory_cost = _calibrate_memory_cost()
+
+    # Publish with an atomic link: when workers start together, the first
+    # one to link wins and the others adopt its value
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(str(memory_cost))
+        os.link(tmp, path)
+        logger.info(f"Argon2 calibrated: memory_cost={memory_cost} KiB (saved to {path})")
+    except FileExistsError:
+        memory_cost = int(path.read_text())
+    except OSError as e:
+        logger.warning(f"Could not save Argon2 calibration to {path}: {e}")
+    finally:
+        tmp.unlink(missing_ok=True)
+    return memory_cost
+
+
 # Initialize Argon2 password hasher
-ph = PasswordHasher()
+ph = PasswordHasher(
+    time_cost=ARGON2_TIME_COST, memory_cost=_load_memory_cost(), parallelism=ARGON2_PARALLELISM
+)
 
 # JWT Configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 15  # 15 minutes (short-lived)
 REFRESH_TOKEN_EXPIRE_DAYS = 30  # 30 days (long-lived)
+REFRESH_TOKEN_HASH_PREFIX = "b2$"  # BLAKE2b token hashes; unprefixed ones are SHA-256
+
+# Access tokens are HS256 with a fixed header, so they are signed and checked
+# with one HMAC over precomputed parts instead of going through PyJWT on every
+# request. PyJWT still handles any token not in exactly that shape.
+_SECRET_BYTES = SECRET_KEY.encode()
+_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=").decode()
+_PYJWT_ONLY_CLAIMS = frozenset(("nbf", "aud", "iss"))
+
+# Recent successful Argon2 verifications, so a burst of logins with the same
+# credential pays for the memory-hard hash once. Keyed on an HMAC of the
+# password and hash, never the plaintext; only matches are cached, so failed
+# attempts always pay the full cost. Locked so it is safe from any thread.
+_verified_cache: TTLCache = TTLCache(maxsize=1024, ttl=60)
+_verified_lock = threading.Lock()
 
 
 def hash_password(password: str) -> str:
@@ -46,15 +136,44 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
+    key = hmac.digest(
+        SECRET_KEY.encode(),
+        plain_password.encode() + b"\0" + hashed_password.encode(),
+        "sha256",
+    )
+    with _verified_lock:
+        if key in _verified_cache:
+            return True
+
     try:
         ph.verify(hashed_password, plain_password)
-        # Check if hash needs rehashing (Argon2 handles this automatically)
-        if ph.check_needs_rehash(hashed_password):
-            logger.info("Password hash needs rehashing")
-        return True
     except VerifyMismatchError:
         return False
 
+    with _verified_lock:
+        _verified_cache[key] = True
+    return True
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash was made with weaker Argon2 parameters.
+
+    Only weaker hashes are upgraded, so a hash made with stronger settings
+    (e.g. before ARGON2_MEMORY_COST was lowered) isn't rewritten on every login.
+
+    Args:
+        hashed_password: Hashed password from database
+
+    Returns:
+        True if the password should be re-hashed with the current parameters
+    """
+    try:
+        params = extract_parameters(hashed_password)
+    except InvalidHashError:
+        return False
+    return params.memory_cost < ph.memory_cost or params.time_cost < ph.time_cost
+
 
 def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -68,18 +187,17 @@ def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -
         Encoded JWT token string
     """
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
+    now = int(time.time())
     to_encode.update({
-        "exp": expire,
-        "iat": datetime.utcnow()
+        "exp": now + int(expires_delta.total_seconds()),
+        "iat": now
     })
 
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    signing_input = f"{_HEADER_B64}.{_b64url_encode(orjson.dumps(to_encode))}"
+    return f"{signing_input}.{_sign(signing_input)}"
 
 
 def decode_access_token(token: str) -> Optional[Dict]:
@@ -92,6 +210,57 @@ def decode_access_token(token: str) -> Optional[Dict]:
     Returns:
         Decoded token data if valid, None otherwise
     """
+    parts = token.split(".")
+    if len(parts) != 3 or parts[0] != _HEADER_B64:
+        return _decode_with_pyjwt(token)
+
+    header_b64, payload_b64, signature_b64 = parts
+    expected = _sign(f"{header_b64}.{payload_b64}")
+    if not hmac.compare_digest(expected.encode(), signature_b64.encode()):
+        logger.warning("Invalid token: Signature verification failed")
+        return None
+
+    try:
+        payload = orjson.loads(_b64url_decode(payload_b64))
+    except ValueError as e:
+        logger.warning(f"Invalid token: {e}")
+        return None
+
+    if (
+        not isinstance(payload, dict)
+        or type(payload.get("exp")) is not int
+        or type(payload.get("iat")) is not int
+        or not _PYJWT_ONLY_CLAIMS.isdisjoint(payload)
+    ):
+        return _decode_with_pyjwt(token)
+
+    now = int(time.time())
+    if payload["exp"] <= now:
+        logger.warning("Token has expired")
+        return None
+    if payload["iat"] > now:
+        logger.warning("Invalid token: The token is not yet valid (iat)")
+        return None
+    return payload
+
+
+def _b64url_encode(data: bytes) -> str:
+    """Unpadded base64url, as used in JWT segments."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64url_decode(data: str) -> bytes:
+    """Decode an unpadded base64url JWT segment."""
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(signing_input: str) -> str:
+    """HS256 signature of a JWT signing input, base64url-encoded."""
+    return _b64url_encode(hmac.digest(_SECRET_BYTES, signing_input.encode(), "sha256"))
+
+
+def _decode_with_pyjwt(token: str) -> Optional[Dict]:
+    """Decode a token the fast path doesn't handle, with PyJWT's full checks."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
@@ -117,6 +286,26 @@ def hash_refresh_token(token: str) -> str:
     """
     Hash a refresh token for secure database storage.
 
+    The hash is only a lookup key (the token itself is the random secret), so
+    BLAKE2b is used for speed. The "b2$" prefix tells it apart from hashes
+    stored before the switch (see legacy_hash_refresh_token).
+
+    Args:
+        token: Plain refresh token
+
+    Returns:
+        "b2$" followed by the BLAKE2b-256 hash of the token (hex string)
+    """
+    return REFRESH_TOKEN_HASH_PREFIX + hashlib.blake2b(token.encode(), digest_size=32).hexdigest()
+
+
+def legacy_hash_refresh_token(token: str) -> str:
+    """
+    Hash a refresh token the way tokens issued before BLAKE2b were stored.
+
+    Only needed to look up those tokens until they expire
+    (REFRESH_TOKEN_EXPIRE_DAYS after the switch).
+
     Args:
         token: Plain refresh token
 
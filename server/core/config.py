@@ -1,117 +1,61 @@
 """Configuration settings for the auto dealership compliance checker."""
 
-from typing import Dict, List
-from pydantic import BaseModel
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
 
+import orjson
 
-class StateRules(BaseModel):
-    """State-specific compliance rules."""
+
+@dataclass(frozen=True, slots=True)
+class StateRules:
+    """State-specific compliance rules (static, so a plain frozen dataclass)."""
     state: str
-    required_disclosures: List[str]
-    pricing_rules: List[str]
-    financing_rules: List[str]
-
-
-# Sample state rules - expand this based on actual regulations
-STATE_REGULATIONS: Dict[str, StateRules] = {
-    "CA": StateRules(
-        state="California",
-        required_disclosures=[
-            "Vehicle history report availability",
-            "Smog certification status",
-            "Lemon law buyback disclosure",
-            "Advertised price must include all dealer-imposed fees except government fees",
-        ],
-        pricing_rules=[
-            "Must disclose documentary fees separately",
-            "No misleading 'discount' claims without substantiation",
-            "Sales tax must be clearly stated or excluded from advertised price",
-        ],
-        financing_rules=[
-            "APR must be disclosed if financing terms mentioned",
-            "Down payment requirements must be clearly stated",
-            "Total cost of financing must be calculable from advertisement",
-        ],
-    ),
-    "TX": StateRules(
-        state="Texas",
-        required_disclosures=[
-            "Inventory tax disclosure for used vehicles",
-            "Title status (clean, salvage, rebuilt)",
-            "Odometer reading accuracy statement",
-        ],
-        pricing_rules=[
-            "Out-the-door pricing requirements for online ads",
-            "Documentary fee limits and disclosure",
-        ],
-        financing_rules=[
-            "Truth in lending disclosures required",
-            "Buy here pay here specific requirements",
-        ],
-    ),
-    "NY": StateRules(
-        state="New York",
-        required_disclosures=[
-            "Lemon law coverage information",
-            "Vehicle history availability",
-            "Warranty information (new and used)",
-        ],
-        pricing_rules=[
-            "All mandatory fees must be disclosed",
-            "No bait-and-switch advertising",
-        ],
-        financing_rules=[
-            "Interest rate disclosure requirements",
-            "Payment terms clarity",
-        ],
-    ),
-    "OK": StateRules(
-        state="Oklahoma",
-        required_disclosures=[
-            "Vehicle identification (year, make, model) must be conspicuously disclosed adjacent to price (465:15-3-8)",
-            "Stock number required for single vehicle ads, or quantity disclosure for multiple vehicles (465:15-3-2)",
-            "Prior service disclosure required (demonstrator, service loaner, factory program vehicle, etc.) (465:15-3-8(a)(4))",
-            "Dealership name must be conspicuously displayed in all advertisements (465:15-3-15)",
-            "Lease advertisements must clearly disclose the word 'lease' (465:15-3-12)",
-            "Number of vehicles available for advertised price must be disclosed (465:15-3-2)",
-            "TV/video disclosures must appear continuously for minimum 10 seconds (465:15-1-2)",
-            "Vehicles must be in possession or obtainable from manufacturer with disclosure (465:15-3-2)",
-            "Illustration must be of actual vehicle or same make/model/year/style (465:15-3-8(b))",
-        ],
-        pricing_rules=[
-            "Most conspicuous price must be full selling price (only excluding tax, title, license) (465:15-3-7(a))",
-            "No price qualifications like 'with trade', 'with acceptable trade', 'with dealer-arranged financing' (465:15-3-7(b))",
-            "Rebates or incentives included in price must be clearly disclosed (465:15-3-7(c))",
-            "Select consumer rebates must be shown separately or clearly identified (465:15-3-7(d))",
-            "No bait-and-switch advertising (465:15-3-4)",
-            "Savings claims only allowed from MSRP sticker price, not including Monroney discounts (465:15-3-14(5))",
-            "Terms 'up to', 'as much as', 'from' prohibited with savings claims unless stock number provided (465:15-3-14(5))",
-            "Prohibited: 'dealer's cost', 'invoice', 'invoice price' terminology (465:15-3-14(7))",
-            "No trade-in amounts or ranges in advertisements (465:15-3-14(8))",
-            "Prohibited: 'we pay tag, tax and license' or similar statements (465:15-3-14(10))",
-            "No 'free' or 'complimentary' offers requiring purchase (465:15-3-14(6))",
-            "MSRP cannot be inflated or misrepresented (465:15-3-6)",
-            "No misleading layouts, headlines, or type sizes (465:15-3-5)",
-            "Used vehicles cannot be advertised as new (465:15-3-14(9))",
-            "Terms like 'factory direct prices', 'wholesale prices' prohibited (465:15-3-14(4))",
-            "No claims about exclusive arrangements not available to other dealers (465:15-3-14(4))",
-            "No false claims about trade-in allowances compared to competitors (465:15-3-14(2))",
-            "No false claims about volume purchasing advantages (465:15-3-14(3))",
-            "'Liquidation', 'going out of business' only if actually closing (465:15-3-14(11))",
-        ],
-        financing_rules=[
-            "Must comply with FTC Regulation M (Lease Regulation) (465:15-3-13)",
-            "Must comply with FTC Regulation Z (Truth in Lending Act) (465:15-3-13)",
-            "Prohibited: 'everybody financed', 'no credit rejected', 'guaranteed approval' (465:15-3-14(1))",
-            "Buy-down rates require disclaimer about effect on vehicle price (465:15-3-14(12))",
-            "'We will pay off your trade' requires disclosure that amount is added to contract (465:15-3-14(13))",
-            "Payment deferral claims must match actual finance contract terms (465:15-3-14(14))",
-            "Lease terms not available to general public cannot be in general ads (465:15-3-12)",
-            "All lease limitations and qualifications must be clearly disclosed (465:15-3-12)",
-            "Statements like 'alternative financial plan' without 'lease' are inadequate (465:15-3-12)",
-        ],
-    ),
-}
+    required_disclosures: Tuple[str, ...]
+    pricing_rules: Tuple[str, ...]
+    financing_rules: Tuple[str, ...]
+
+
+class LazyStateRules(Mapping):
+    """
+    State rules read from core/rules/{code}.json on first access.
+
+    Only the states a worker actually checks are parsed and kept; the keys
+    come from the directory listing.
+    """
+
+    def __init__(self, rules_dir: Path):
+        self._dir = rules_dir
+        self._codes = tuple(sorted(p.stem for p in rules_dir.glob("*.json")))
+        self._cache: Dict[str, StateRules] = {}
+
+    def __getitem__(self, state_code: str) -> StateRules:
+        rules = self._cache.get(state_code)
+        if rules is None:
+            if state_code not in self._codes:
+                raise KeyError(state_code)
+            data = orjson.loads((self._dir / f"{state_code}.json").read_bytes())
+            rules = self._cache[state_code] = StateRules(
+                state=data["state"],
+                required_disclosures=tuple(data["required_disclosures"]),
+                pricing_rules=tuple(data["pricing_rules"]),
+                financing_rules=tuple(data["financing_rules"]),
+            )
+        return rules
+
+    def __contains__(self, state_code) -> bool:
+        return state_code in self._codes
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._codes)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+
+# Sample state rules - expand this based on actual regulations (core/rules/)
+STATE_REGULATIONS: Mapping[str, StateRules] = LazyStateRules(Path(__file__).parent / "rules")
 
 
 # LLM Configuration
@@ -134,6 +78,31 @@ IS_PRODUCTION = ENVIRONMENT == "production"
 
 # Database
 DATABASE_PATH = os.getenv("DATABASE_PATH", "compliance.db")
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "8"))  # Connections kept open per worker
+DATABASE_POOL_MIN_SIZE = int(os.getenv("DATABASE_POOL_MIN_SIZE", "2"))  # Opened at startup
+DATABASE_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", "2.0"))  # Seconds to wait before 503
+
+# OpenAI
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "8"))  # Parallel analyses per batch_analyze call
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))  # SDK retries (with backoff) on 429/5xx
+
+# Reuse a cached decision for identical content for this many days
+DECISION_CACHE_TTL_DAYS = int(os.getenv("DECISION_CACHE_TTL_DAYS", "30"))
+
+# Write every analysis prompt to llm_inputs/ (debugging aid; off by default)
+LOG_PROMPTS = os.getenv("AUTOAUDIT_LOG_PROMPTS", "").lower() in ("1", "true", "yes")
+
+# Screenshots
+SCREENSHOT_CONCURRENCY = int(os.getenv("SCREENSHOT_CONCURRENCY", "2"))  # Parallel captures per worker
+SCREENSHOT_MAX_ATTEMPTS = int(os.getenv("SCREENSHOT_MAX_ATTEMPTS", "3"))  # Captures tried before a job fails
+SCREENSHOT_RETRY_DELAY = float(os.getenv("SCREENSHOT_RETRY_DELAY", "30"))  # Seconds before the first retry, doubling after
+
+# Scans
+RESCAN_CONCURRENCY = int(os.getenv("RESCAN_CONCURRENCY", "8"))  # Parallel immediate rescans per bulk request
+
+# Document parsing
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 1)))  # Processes extracting PDF pages per worker
+PDF_PAGES_PER_JOB = int(os.getenv("PDF_PAGES_PER_JOB", "16"))  # Pages handed to each extraction process at a time
 
 # JWT Configuration
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-secret-key-change-in-production")
@@ -8,6 +8,39 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Common navigation/footer noise (matched case-insensitively)
+NOISE_PATTERNS = (
+    r'(Skip to|Jump to) (main content|navigation)',
+    r'Copyright \d{4}.*',
+    r'All rights reserved',
+    r'Privacy Policy.*Terms.*',
+    r'\[Image\]',  # Image placeholders
+    r'\* \* \*',  # Decorative separators
+)
+
+# _clean_markdown runs on every converted page, so its work is fused into two
+# compiled passes. The first collapses newline runs and drops noise and
+# script remnants; the second normalizes spaces. Spaces come last because
+# the removals leave doubled spaces behind.
+_REMOVE_RE = re.compile(
+    r'(?P<nl>\n{3,})'
+    r'|(?i:' + '|'.join(f'(?:{p})' for p in NOISE_PATTERNS) + ')'
+    r'|var \w+\s*=.*?;'  # Script/style remnants
+    r'|(?s:function.*?\{.*?\})'
+)
+# ' +' -> ' ' then '\n ' -> '\n', in one pass
+_WHITESPACE_RE = re.compile(r'(?P<nl>\n) +| +')
+
+
+def _replace_removed(match: re.Match) -> str:
+    """Collapse a newline run to a blank line; drop anything else."""
+    return '\n\n' if match.lastgroup == 'nl' else ''
+
+
+def _replace_whitespace(match: re.Match) -> str:
+    """A newline swallows the spaces after it; other space runs become one."""
+    return '\n' if match.lastgroup == 'nl' else ' '
+
 
 class ContentConverter:
     """Converts HTML content to clean Markdown suitable for LLM processing."""
@@ -53,30 +86,8 @@ class ContentConverter:
         Returns:
             Cleaned markdown
         """
-        # Remove excessive newlines (more than 2 consecutive)
-        markdown = re.sub(r'\n{3,}', '\n\n', markdown)
-
-        # Remove common navigation/footer noise patterns
-        noise_patterns = [
-            r'(Skip to|Jump to) (main content|navigation)',
-            r'Copyright \d{4}.*',
-            r'All rights reserved',
-            r'Privacy Policy.*Terms.*',
-            r'\[Image\]',  # Image placeholders
-            r'\* \* \*',  # Decorative separators
-        ]
-
-        for pattern in noise_patterns:
-            markdown = re.sub(pattern, '', markdown, flags=re.IGNORECASE)
-
-        # Remove script/style remnants
-        markdown = re.sub(r'var \w+\s*=.*?;', '', markdown)
-        markdown = re.sub(r'function.*?\{.*?\}', '', markdown, flags=re.DOTALL)
-
-        # Clean up extra whitespace
-        markdown = re.sub(r' +', ' ', markdown)
-        markdown = re.sub(r'\n ', '\n', markdown)
-
+        markdown = _REMOVE_RE.sub(_replace_removed, markdown)
+        markdown = _WHITESPACE_RE.sub(_replace_whitespace, markdown)
         return markdown.strip()
 
     def extract_sections(self, markdown: str, scraped_data: Dict) -> Dict[str, str]:
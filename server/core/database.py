@@ -2,6 +2,10 @@
 
 import sqlite3
 import json
+import queue
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -10,6 +14,54 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# sqlite3 keeps a per-connection LRU of prepared statements keyed on the exact
+# SQL text. The default (128) is easily churned by the ad-hoc queries in the
+# route modules, so give it enough room to keep the hot statements resident.
+STATEMENT_CACHE_SIZE = 256
+
+# Statements issued on every auth request. Sharing one SQL string per statement
+# guarantees a statement-cache hit after the first execution on a connection.
+SQL_FIND_USER_BY_ID = "SELECT * FROM users WHERE id = ?"
+SQL_FIND_USER_BY_EMAIL = "SELECT * FROM users WHERE email = ?"
+SQL_INSERT_REFRESH_TOKEN = (
+    "INSERT INTO refresh_tokens (user_id, token_hash, device_info, ip_address, expires_at) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+SQL_FIND_REFRESH_TOKEN = "SELECT * FROM refresh_tokens WHERE token_hash = ? AND revoked_at IS NULL"
+SQL_REVOKE_REFRESH_TOKEN = "UPDATE refresh_tokens SET revoked_at = CURRENT_TIMESTAMP WHERE token_hash = ?"
+
+# INSERT/UPDATE ... RETURNING (SQLite 3.35+) hands back the written row in the
+# same statement, saving the follow-up SELECT
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+SQL_RETURNING_URL = (
+    "RETURNING *, (SELECT COUNT(*) FROM compliance_checks c WHERE c.url_id = urls.id) AS check_count"
+)
+
+# One fixed statement for every combination of URL settings, so it stays in
+# the statement cache; unset settings bind NULL and keep their value
+SQL_UPDATE_URL_SETTINGS = """
+    UPDATE urls SET
+        active = COALESCE(?, active),
+        check_frequency_hours = COALESCE(?, check_frequency_hours),
+        template_id = COALESCE(?, template_id)
+    WHERE id = ?
+"""
+
+# SQLite allows one writer at a time. Write transactions from this process
+# queue on this lock instead of retrying SQLITE_BUSY in the busy handler's
+# sleep/backoff loop; other worker processes still meet at SQLite's lock.
+# Reentrant so a thread that already holds it can open nested transactions
+# on another connection.
+_write_lock = threading.RLock()
+
+# Read-only hot statements that can be compiled ahead of time on a fresh
+# connection without side effects (see ConnectionPool.warm).
+PRIMED_STATEMENTS = (
+    SQL_FIND_USER_BY_ID,
+    SQL_FIND_USER_BY_EMAIL,
+    SQL_FIND_REFRESH_TOKEN,
+)
+
 
 class ComplianceDatabase:
     """Manages SQLite database for compliance checking system."""
@@ -23,15 +75,21 @@ class ComplianceDatabase:
         """
         self.db_path = db_path
         # check_same_thread=False allows connection to be used across threads
-        # This is safe with FastAPI's dependency injection since each request gets its own instance
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        # This is safe because ConnectionPool hands each instance to one request at a time
+        self.conn = sqlite3.connect(
+            db_path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
         self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        self._transaction_depth = 0
 
         # Enable WAL mode for better concurrency and performance
         self.conn.execute("PRAGMA journal_mode=WAL")
         self.conn.execute("PRAGMA synchronous=NORMAL")  # Faster commits with WAL
         self.conn.execute("PRAGMA cache_size=-64000")  # 64MB cache
         self.conn.execute("PRAGMA temp_store=MEMORY")  # Use memory for temp tables
+        self.conn.execute("PRAGMA mmap_size=268435456")  # 256MB memory-mapped reads
 
         self._create_tables()
         self._run_migrations()
@@ -103,11 +161,18 @@ class ComplianceDatabase:
                 platform TEXT NOT NULL,
                 template_type TEXT DEFAULT 'compliance',
                 config JSON,
+                version INTEGER NOT NULL DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
 
+        # Migration: Add the change counter behind template ETags
+        cursor.execute("PRAGMA table_info(templates)")
+        if 'version' not in [row[1] for row in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE templates ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            logger.info("Added version column to templates table")
+
         # Template rules (cached compliance decisions)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS template_rules (
@@ -214,9 +279,135 @@ class ComplianceDatabase:
             )
         """)
 
+        # Decision cache (migration 20251029_004); created here too so a
+        # database that hasn't been migrated yet can still run checks
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS decision_cache (
+                template_id TEXT NOT NULL,
+                state_code TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (template_id, state_code, content_hash)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_decision_cache_created ON decision_cache(created_at)")
+
+        # Screenshot jobs (migration 20251029_006); resumed by a startup hook,
+        # which can run before `alembic upgrade head`
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS screenshot_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                project_id INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending'
+                    CHECK(status IN ('pending', 'running', 'completed', 'failed')),
+                screenshot_path TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (project_id) REFERENCES projects(id)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_screenshot_jobs_status ON screenshot_jobs(status)")
+
+        # Migration: Add the retry counter (migration 20251029_013)
+        cursor.execute("PRAGMA table_info(screenshot_jobs)")
+        if 'attempts' not in [row[1] for row in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE screenshot_jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+            logger.info("Added attempts column to screenshot_jobs table")
+
+        # Intelligent setup jobs (also created by migration 20251029_003), so
+        # the startup sweep and the setup route work on an unmigrated DB
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS setup_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending'
+                    CHECK(status IN ('pending', 'running', 'completed', 'failed')),
+                progress TEXT,
+                result TEXT,
+                error TEXT,
+                created_by INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (created_by) REFERENCES users(id)
+            )
+        """)
+
+        # Legislation upload jobs (also created by migration 20251029_008)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS legislation_upload_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                state_code TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending'
+                    CHECK(status IN ('pending', 'running', 'completed', 'failed')),
+                progress TEXT,
+                result TEXT,
+                error TEXT,
+                created_by INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (created_by) REFERENCES users(id)
+            )
+        """)
+
         self.conn.commit()
         logger.info("Database schema created/verified")
 
+    def _commit(self):
+        """Commit unless a surrounding transaction() block owns the commit."""
+        if not self._transaction_depth:
+            self.conn.commit()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into a single commit.
+
+        Database methods called inside the block skip their own commit; the
+        block is committed once on exit, or rolled back if it raises.
+        Nested blocks join the outermost transaction.
+
+        The outermost block takes the process-wide write lock and starts with
+        BEGIN IMMEDIATE, so its reads and writes see one snapshot and it can't
+        fail with SQLITE_BUSY when its first write upgrades a read lock.
+
+        Usage:
+            with db.transaction():
+                user = db.create_user(...)
+                db.save_refresh_token(...)
+        """
+        outermost = not self._transaction_depth
+        if outermost:
+            _write_lock.acquire()
+            try:
+                if not self.conn.in_transaction:
+                    self.conn.execute("BEGIN IMMEDIATE")
+            except BaseException:
+                _write_lock.release()
+                raise
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            if outermost:
+                try:
+                    self.conn.rollback()
+                finally:
+                    _write_lock.release()
+            raise
+        else:
+            self._transaction_depth -= 1
+            if outermost:
+                try:
+                    self.conn.commit()
+                finally:
+                    _write_lock.release()
+
     def _run_migrations(self):
         """Run any pending database migrations."""
         try:
@@ -227,24 +418,26 @@ class ComplianceDatabase:
 
     # ==================== User Management ====================
 
-    def create_user(self, email: str, password_hash: str, full_name: str = None) -> int:
-        """Create a new user."""
+    def create_user(self, email: str, password_hash: str, full_name: str = None) -> Dict:
+        """Create a new user and return the stored row (id, email, full_name, is_active, created_at)."""
         cursor = self.conn.cursor()
         cursor.execute("""
             INSERT INTO users (email, password_hash, full_name)
             VALUES (?, ?, ?)
+            RETURNING id, email, full_name, is_active, created_at
         """, (email, password_hash, full_name))
-        self.conn.commit()
+        user = dict(cursor.fetchone())
+        self._commit()
         logger.info(f"Created user: {email}")
-        return cursor.lastrowid
+        return user
 
     def get_user(self, user_id: int = None, email: str = None) -> Optional[Dict]:
         """Get user by ID or email."""
         cursor = self.conn.cursor()
         if user_id:
-            cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+            cursor.execute(SQL_FIND_USER_BY_ID, (user_id,))
         elif email:
-            cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
+            cursor.execute(SQL_FIND_USER_BY_EMAIL, (email,))
         else:
             return None
 
@@ -267,7 +460,7 @@ class ComplianceDatabase:
             cursor.execute("""
                 UPDATE users SET password_hash = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?
             """, (password_hash, user_id))
-        self.conn.commit()
+        self._commit()
 
     # ==================== Refresh Token Management ====================
 
@@ -281,33 +474,26 @@ class ComplianceDatabase:
     ) -> int:
         """Save a refresh token to the database."""
         cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT INTO refresh_tokens (user_id, token_hash, device_info, ip_address, expires_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, (user_id, token_hash, device_info, ip_address, expires_at))
-        self.conn.commit()
+        cursor.execute(
+            SQL_INSERT_REFRESH_TOKEN,
+            (user_id, token_hash, device_info, ip_address, expires_at)
+        )
+        self._commit()
         logger.info(f"Created refresh token for user {user_id}")
         return cursor.lastrowid
 
     def get_refresh_token(self, token_hash: str) -> Optional[Dict]:
         """Get refresh token by hash."""
         cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM refresh_tokens
-            WHERE token_hash = ? AND revoked_at IS NULL
-        """, (token_hash,))
+        cursor.execute(SQL_FIND_REFRESH_TOKEN, (token_hash,))
         row = cursor.fetchone()
         return dict(row) if row else None
 
     def revoke_refresh_token(self, token_hash: str) -> bool:
         """Revoke a refresh token."""
         cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE refresh_tokens
-            SET revoked_at = CURRENT_TIMESTAMP
-            WHERE token_hash = ?
-        """, (token_hash,))
-        self.conn.commit()
+        cursor.execute(SQL_REVOKE_REFRESH_TOKEN, (token_hash,))
+        self._commit()
         success = cursor.rowcount > 0
         if success:
             logger.info(f"Revoked refresh token")
@@ -321,7 +507,7 @@ class ComplianceDatabase:
             SET revoked_at = CURRENT_TIMESTAMP
             WHERE user_id = ? AND revoked_at IS NULL
         """, (user_id,))
-        self.conn.commit()
+        self._commit()
         count = cursor.rowcount
         logger.info(f"Revoked {count} refresh tokens for user {user_id}")
         return count
@@ -334,7 +520,7 @@ class ComplianceDatabase:
             WHERE expires_at < CURRENT_TIMESTAMP
             OR revoked_at IS NOT NULL
         """)
-        self.conn.commit()
+        self._commit()
         count = cursor.rowcount
         if count > 0:
             logger.info(f"Cleaned up {count} expired/revoked tokens")
@@ -349,7 +535,7 @@ class ComplianceDatabase:
             INSERT INTO projects (name, state_code, description, base_url)
             VALUES (?, ?, ?, ?)
         """, (name, state_code, description, base_url))
-        self.conn.commit()
+        self._commit()
         logger.info(f"Created project: {name}")
         return cursor.lastrowid
 
@@ -383,7 +569,7 @@ class ComplianceDatabase:
             SET screenshot_path = ?, updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         """, (screenshot_path, project_id))
-        self.conn.commit()
+        self._commit()
         logger.info(f"Updated screenshot for project {project_id}: {screenshot_path}")
         return cursor.rowcount > 0
 
@@ -403,7 +589,7 @@ class ComplianceDatabase:
             SET deleted_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
             WHERE id = ? AND deleted_at IS NULL
         """, (project_id,))
-        self.conn.commit()
+        self._commit()
         success = cursor.rowcount > 0
         if success:
             logger.info(f"Soft deleted project {project_id}")
@@ -420,9 +606,10 @@ class ComplianceDatabase:
             ON CONFLICT(template_id) DO UPDATE SET
                 platform = excluded.platform,
                 config = excluded.config,
+                version = version + 1,
                 updated_at = CURRENT_TIMESTAMP
         """, (template_id, platform, json.dumps(config) if config else None))
-        self.conn.commit()
+        self._commit()
         return cursor.lastrowid
 
     def get_template(self, template_id: str) -> Optional[Dict]:
@@ -437,6 +624,34 @@ class ComplianceDatabase:
             return result
         return None
 
+    def _bump_template_version(self, template_id: str):
+        """Count a change to a template's rules in its version."""
+        self.conn.execute(
+            "UPDATE templates SET version = version + 1 WHERE template_id = ?",
+            (template_id,)
+        )
+
+    def get_templates_version(self) -> tuple:
+        """
+        Cheap fingerprint of all templates and their rules, for ETags.
+
+        Every template or rule write bumps its template's version, so the sum
+        changes even for several writes within the same second.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT COUNT(*), MAX(id), TOTAL(version) FROM templates")
+        return tuple(cursor.fetchone())
+
+    def get_template_version(self, template_id: str) -> Optional[tuple]:
+        """Cheap fingerprint of one template and its rules, or None if it doesn't exist."""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT id, version FROM templates WHERE template_id = ?",
+            (template_id,)
+        )
+        row = cursor.fetchone()
+        return tuple(row) if row else None
+
     def save_template_rule(
         self,
         template_id: str,
@@ -459,9 +674,51 @@ class ComplianceDatabase:
                 notes = excluded.notes,
                 verified_date = CURRENT_TIMESTAMP
         """, (template_id, rule_key, status, confidence, verification_method, notes))
-        self.conn.commit()
+        self._bump_template_version(template_id)
+        self._commit()
         logger.info(f"Saved rule {rule_key} for template {template_id}: {status}")
 
+    def upsert_template_rule(
+        self,
+        template_id: str,
+        rule_key: str,
+        status: str,
+        confidence: float,
+        verification_method: str = None,
+        notes: str = None,
+        platform: str = "custom"
+    ) -> Dict:
+        """
+        Save a cached rule decision and return the saved row.
+
+        Creates the template (with the given platform) if it doesn't exist,
+        in the same transaction, so concurrent writers can't race on it.
+        """
+        with self.transaction():
+            self.conn.execute("""
+                INSERT INTO templates (template_id, platform) VALUES (?, ?)
+                ON CONFLICT(template_id) DO NOTHING
+            """, (template_id, platform))
+
+            if not SQLITE_HAS_RETURNING:
+                self.save_template_rule(template_id, rule_key, status, confidence, verification_method, notes)
+                return self.get_template_rule(template_id, rule_key)
+
+            rows = self.conn.execute("""
+                INSERT INTO template_rules
+                (template_id, rule_key, status, confidence, verification_method, notes, verified_date)
+                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(template_id, rule_key) DO UPDATE SET
+                    status = excluded.status,
+                    confidence = excluded.confidence,
+                    verification_method = excluded.verification_method,
+                    notes = excluded.notes,
+                    verified_date = CURRENT_TIMESTAMP
+                RETURNING *
+            """, (template_id, rule_key, status, confidence, verification_method, notes)).fetchall()
+            self._bump_template_version(template_id)
+        return dict(rows[0])
+
     def get_template_rule(self, template_id: str, rule_key: str) -> Optional[Dict]:
         """Get cached rule decision for a template."""
         cursor = self.conn.cursor()
@@ -472,6 +729,19 @@ class ComplianceDatabase:
         row = cursor.fetchone()
         return dict(row) if row else None
 
+    def delete_template_rule(self, template_id: str, rule_key: str) -> bool:
+        """Delete a cached rule decision. Returns False if it doesn't exist."""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "DELETE FROM template_rules WHERE template_id = ? AND rule_key = ?",
+            (template_id, rule_key)
+        )
+        deleted = cursor.rowcount > 0
+        if deleted:
+            self._bump_template_version(template_id)
+        self._commit()
+        return deleted
+
     def get_template_rules(self, template_id: str) -> List[Dict]:
         """Get all cached rules for a template."""
         cursor = self.conn.cursor()
@@ -482,6 +752,55 @@ class ComplianceDatabase:
         """, (template_id,))
         return [dict(row) for row in cursor.fetchall()]
 
+    def list_templates_with_rules(
+        self,
+        after_template_id: str = None,
+        limit: int = None
+    ) -> List[Dict]:
+        """
+        List templates ordered by template_id, each with its cached rules under 'rules'.
+
+        Loads templates and rules with one query each and groups the rules in
+        Python, instead of one get_template_rules query per template. Pass the
+        last template_id seen as after_template_id to page through (keyset
+        pagination, so no OFFSET scan).
+        """
+        cursor = self.conn.cursor()
+        query = "SELECT * FROM templates"
+        params = []
+        if after_template_id is not None:
+            query += " WHERE template_id > ?"
+            params.append(after_template_id)
+        query += " ORDER BY template_id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        cursor.execute(query, params)
+
+        templates = {}
+        for row in cursor.fetchall():
+            template = dict(row)
+            if template['config']:
+                template['config'] = json.loads(template['config'])
+            template['rules'] = []
+            templates[template['template_id']] = template
+        if not templates:
+            return []
+
+        # Only the rules for this page: template_ids are contiguous in order
+        query = "SELECT * FROM template_rules WHERE template_id <= ?"
+        params = [next(reversed(templates))]
+        if after_template_id is not None:
+            query += " AND template_id > ?"
+            params.append(after_template_id)
+        cursor.execute(query + " ORDER BY template_id, verified_date DESC", params)
+        for row in cursor.fetchall():
+            template = templates.get(row['template_id'])
+            if template is not None:
+                template['rules'].append(dict(row))
+
+        return list(templates.values())
+
     # ==================== URL Management ====================
 
     def add_url(
@@ -504,9 +823,38 @@ class ComplianceDatabase:
                 platform = excluded.platform,
                 check_frequency_hours = excluded.check_frequency_hours
         """, (project_id, url, url_type, template_id, platform, check_frequency_hours))
-        self.conn.commit()
+        self._commit()
         return cursor.lastrowid
 
+    def create_url(
+        self,
+        url: str,
+        project_id: int = None,
+        url_type: str = "vdp",
+        template_id: str = None,
+        platform: str = None,
+        check_frequency_hours: int = 24
+    ) -> Dict:
+        """Add a URL to monitor and return its row (as get_url would)."""
+        if not SQLITE_HAS_RETURNING:
+            url_id = self.add_url(url, project_id, url_type, template_id, platform, check_frequency_hours)
+            return self.get_url(url_id=url_id)
+
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            INSERT INTO urls (project_id, url, url_type, template_id, platform, check_frequency_hours)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                project_id = excluded.project_id,
+                template_id = excluded.template_id,
+                platform = excluded.platform,
+                check_frequency_hours = excluded.check_frequency_hours
+            {SQL_RETURNING_URL}
+        """, (project_id, url, url_type, template_id, platform, check_frequency_hours))
+        row = cursor.fetchall()[0]
+        self._commit()
+        return dict(row)
+
     def get_url(self, url_id: int = None, url: str = None) -> Optional[Dict]:
         """Get URL by ID or URL string with check count."""
         cursor = self.conn.cursor()
@@ -531,33 +879,45 @@ class ComplianceDatabase:
         row = cursor.fetchone()
         return dict(row) if row else None
 
-    def list_urls(self, project_id: int = None, active_only: bool = True) -> List[Dict]:
-        """List URLs with check count, optionally filtered by project."""
+    def list_urls(
+        self,
+        project_id: int = None,
+        active_only: bool = True,
+        after_id: int = None,
+        limit: int = None
+    ) -> List[Dict]:
+        """
+        List URLs with check count, ordered by id, optionally filtered by project.
+
+        Pass the last id seen as after_id to page through (keyset pagination).
+        """
         cursor = self.conn.cursor()
 
-        base_query = """
+        query = """
             SELECT
                 u.*,
                 COUNT(c.id) as check_count
             FROM urls u
             LEFT JOIN compliance_checks c ON c.url_id = u.id
         """
-
+        conditions = []
+        params = []
         if project_id:
-            if active_only:
-                query = base_query + " WHERE u.project_id = ? AND u.active = 1 GROUP BY u.id"
-                cursor.execute(query, (project_id,))
-            else:
-                query = base_query + " WHERE u.project_id = ? GROUP BY u.id"
-                cursor.execute(query, (project_id,))
-        else:
-            if active_only:
-                query = base_query + " WHERE u.active = 1 GROUP BY u.id"
-                cursor.execute(query)
-            else:
-                query = base_query + " GROUP BY u.id"
-                cursor.execute(query)
+            conditions.append("u.project_id = ?")
+            params.append(project_id)
+        if active_only:
+            conditions.append("u.active = 1")
+        if after_id is not None:
+            conditions.append("u.id > ?")
+            params.append(after_id)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " GROUP BY u.id ORDER BY u.id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
 
+        cursor.execute(query, params)
         return [dict(row) for row in cursor.fetchall()]
 
     def update_url_last_checked(self, url_id: int):
@@ -566,7 +926,7 @@ class ComplianceDatabase:
         cursor.execute("""
             UPDATE urls SET last_checked = CURRENT_TIMESTAMP WHERE id = ?
         """, (url_id,))
-        self.conn.commit()
+        self._commit()
 
     def update_url(self, url_id: int, active: bool = None, check_frequency_hours: int = None, template_id: str = None) -> bool:
         """
@@ -581,30 +941,49 @@ class ComplianceDatabase:
         Returns:
             True if updated, False otherwise
         """
-        updates = []
-        params = []
+        if active is None and check_frequency_hours is None and template_id is None:
+            return False
 
-        if active is not None:
-            updates.append("active = ?")
-            params.append(1 if active else 0)
+        cursor = self.conn.cursor()
+        cursor.execute(SQL_UPDATE_URL_SETTINGS, (
+            None if active is None else int(active), check_frequency_hours, template_id, url_id
+        ))
+        self._commit()
+        return cursor.rowcount > 0
 
-        if check_frequency_hours is not None:
-            updates.append("check_frequency_hours = ?")
-            params.append(check_frequency_hours)
+    def update_url_settings(
+        self,
+        url_id: int,
+        active: bool = None,
+        check_frequency_hours: int = None,
+        template_id: str = None
+    ) -> Optional[Dict]:
+        """
+        Update URL settings and return the updated row (as get_url would).
 
-        if template_id is not None:
-            updates.append("template_id = ?")
-            params.append(template_id)
+        Returns:
+            Updated URL, or None if it doesn't exist
+        """
+        if active is None and check_frequency_hours is None and template_id is None:
+            return self.get_url(url_id=url_id)
 
-        if not updates:
-            return False
+        if not SQLITE_HAS_RETURNING:
+            self.update_url(url_id, active, check_frequency_hours, template_id)
+            return self.get_url(url_id=url_id)
 
-        params.append(url_id)
         cursor = self.conn.cursor()
-        cursor.execute(f"""
-            UPDATE urls SET {', '.join(updates)} WHERE id = ?
-        """, params)
-        self.conn.commit()
+        cursor.execute(SQL_UPDATE_URL_SETTINGS + SQL_RETURNING_URL, (
+            None if active is None else int(active), check_frequency_hours, template_id, url_id
+        ))
+        rows = cursor.fetchall()
+        self._commit()
+        return dict(rows[0]) if rows else None
+
+    def deactivate_url(self, url_id: int) -> bool:
+        """Mark a URL inactive. Returns False if it doesn't exist."""
+        cursor = self.conn.cursor()
+        cursor.execute("UPDATE urls SET active = 0 WHERE id = ?", (url_id,))
+        self._commit()
         return cursor.rowcount > 0
 
     # ==================== Compliance Check Management ====================
@@ -645,7 +1024,7 @@ class ComplianceDatabase:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (url_id, url, state_code, template_id, overall_score, compliance_status,
               summary, llm_input_path, report_path, text_analysis_tokens, visual_tokens, total_tokens, llm_input_text))
-        self.conn.commit()
+        self._commit()
         logger.info(f"Saved compliance check for {url}: {overall_score}/100")
         return cursor.lastrowid
 
@@ -656,6 +1035,12 @@ class ComplianceDatabase:
         row = cursor.fetchone()
         return dict(row) if row else None
 
+    def check_exists(self, check_id: int) -> bool:
+        """Check whether a compliance check exists without loading its row."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT 1 FROM compliance_checks WHERE id = ? LIMIT 1", (check_id,))
+        return cursor.fetchone() is not None
+
     def get_latest_check(self, url: str) -> Optional[Dict]:
         """Get most recent compliance check for a URL."""
         cursor = self.conn.cursor()
@@ -672,11 +1057,25 @@ class ComplianceDatabase:
         self,
         url_id: int = None,
         state_code: str = None,
-        limit: int = 100
+        limit: int = 100,
+        include_counts: bool = False
     ) -> List[Dict]:
-        """List compliance checks with optional filters."""
+        """
+        List compliance checks with optional filters.
+
+        With include_counts, each check also carries violation_count and
+        visual_count, counted per row from the check_id indexes.
+        """
         cursor = self.conn.cursor()
-        query = "SELECT * FROM compliance_checks WHERE 1=1"
+        if include_counts:
+            query = """
+                SELECT c.*,
+                    (SELECT COUNT(*) FROM violations v WHERE v.check_id = c.id) AS violation_count,
+                    (SELECT COUNT(*) FROM visual_verifications vv WHERE vv.check_id = c.id) AS visual_count
+                FROM compliance_checks c WHERE 1=1
+            """
+        else:
+            query = "SELECT * FROM compliance_checks WHERE 1=1"
         params = []
 
         if url_id:
@@ -715,9 +1114,26 @@ class ComplianceDatabase:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (check_id, category, severity, rule_violated, rule_key, confidence,
               needs_visual_verification, explanation, evidence))
-        self.conn.commit()
+        self._commit()
         return cursor.lastrowid
 
+    def save_violations_bulk(self, check_id: int, rows: List[tuple]) -> None:
+        """
+        Save many violations for a check with a single executemany.
+
+        Each row is (category, severity, rule_violated, rule_key, confidence,
+        needs_visual_verification, explanation, evidence).
+        """
+        if not rows:
+            return
+        self.conn.executemany("""
+            INSERT INTO violations
+            (check_id, category, severity, rule_violated, rule_key, confidence,
+             needs_visual_verification, explanation, evidence)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(check_id,) + row for row in rows])
+        self._commit()
+
     def get_violations(self, check_id: int) -> List[Dict]:
         """Get all violations for a compliance check."""
         cursor = self.conn.cursor()
@@ -754,9 +1170,28 @@ class ComplianceDatabase:
         """, (check_id, violation_id, rule_key, rule_text, is_compliant, confidence,
               verification_method, visual_evidence, proximity_description,
               screenshot_path, cached, tokens_used))
-        self.conn.commit()
+        self._commit()
         return cursor.lastrowid
 
+    def save_visual_verifications_bulk(self, check_id: int, rows: List[tuple]) -> None:
+        """
+        Save many visual verifications for a check with a single executemany.
+
+        Each row is (violation_id, rule_key, rule_text, is_compliant, confidence,
+        verification_method, visual_evidence, proximity_description,
+        screenshot_path, cached, tokens_used).
+        """
+        if not rows:
+            return
+        self.conn.executemany("""
+            INSERT INTO visual_verifications
+            (check_id, violation_id, rule_key, rule_text, is_compliant, confidence,
+             verification_method, visual_evidence, proximity_description,
+             screenshot_path, cached, tokens_used)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(check_id,) + row for row in rows])
+        self._commit()
+
     def get_visual_verifications(self, check_id: int) -> List[Dict]:
         """Get all visual verifications for a compliance check."""
         cursor = self.conn.cursor()
@@ -790,7 +1225,7 @@ class ComplianceDatabase:
         """, (template_id, platform, json.dumps(selectors),
               json.dumps(cleanup_rules) if cleanup_rules else None,
               json.dumps(extraction_order) if extraction_order else None))
-        self.conn.commit()
+        self._commit()
         logger.info(f"Saved extraction template: {template_id}")
 
     def get_extraction_template(self, template_id: str) -> Optional[Dict]:
@@ -810,6 +1245,270 @@ class ComplianceDatabase:
             return result
         return None
 
+    # ==================== Decision Cache ====================
+
+    def get_cached_decision(
+        self,
+        template_id: str,
+        state_code: str,
+        content_hash: str,
+        max_age_days: int = 30
+    ) -> Optional[Dict]:
+        """Get a cached analysis result for identical content on a template, if fresh."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT result FROM decision_cache
+            WHERE template_id = ? AND state_code = ? AND content_hash = ?
+              AND created_at >= datetime('now', ?)
+        """, (template_id, state_code, content_hash, f"-{max_age_days} days"))
+        row = cursor.fetchone()
+        return json.loads(row['result']) if row else None
+
+    def save_cached_decision(
+        self,
+        template_id: str,
+        state_code: str,
+        content_hash: str,
+        result: Dict,
+        max_age_days: int = 30
+    ):
+        """
+        Cache an analysis result for identical content on a template.
+
+        Entries older than max_age_days are never read again, so they are
+        deleted here rather than left to grow the table.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "DELETE FROM decision_cache WHERE created_at < datetime('now', ?)",
+            (f"-{max_age_days} days",)
+        )
+        cursor.execute("""
+            INSERT OR REPLACE INTO decision_cache (template_id, state_code, content_hash, result)
+            VALUES (?, ?, ?, ?)
+        """, (template_id, state_code, content_hash, json.dumps(result)))
+        self._commit()
+
+    # ==================== Background Job Helpers ====================
+    # Shared by setup_jobs and legislation_upload_jobs, which have the same
+    # status/progress/result/error columns. `table` is always one of those
+    # fixed names, never user input.
+
+    def _update_job(
+        self,
+        table: str,
+        job_id: int,
+        status: str = None,
+        progress: str = None,
+        result: Dict = None,
+        error: str = None
+    ) -> bool:
+        """Update a background job's status, progress, result or error."""
+        updates = []
+        params = []
+
+        if status is not None:
+            updates.append("status = ?")
+            params.append(status)
+        if progress is not None:
+            updates.append("progress = ?")
+            params.append(progress)
+        if result is not None:
+            updates.append("result = ?")
+            params.append(json.dumps(result))
+        if error is not None:
+            updates.append("error = ?")
+            params.append(error)
+
+        if not updates:
+            return False
+
+        updates.append("updated_at = CURRENT_TIMESTAMP")
+        params.append(job_id)
+
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"UPDATE {table} SET {', '.join(updates)} WHERE id = ?",
+            params
+        )
+        self._commit()
+        return cursor.rowcount > 0
+
+    def _get_job(self, table: str, job_id: int) -> Optional[Dict]:
+        """Get a background job by ID, with its result JSON decoded."""
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT * FROM {table} WHERE id = ?", (job_id,))
+        row = cursor.fetchone()
+        if row:
+            job = dict(row)
+            if job['result']:
+                job['result'] = json.loads(job['result'])
+            return job
+        return None
+
+    def _fail_stale_jobs(self, table: str, error: str, stale_minutes: int, job_id: int = None) -> int:
+        """
+        Mark pending/running jobs as failed once they have gone stale_minutes
+        without an update (the worker running them died).
+
+        Limited to job_id when given. Returns the number of jobs failed.
+        """
+        query = f"""
+            UPDATE {table}
+            SET status = 'failed', error = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE status IN ('pending', 'running') AND updated_at < datetime('now', ?)
+        """
+        params = [error, f"-{stale_minutes} minutes"]
+        if job_id is not None:
+            query += " AND id = ?"
+            params.append(job_id)
+
+        cursor = self.conn.cursor()
+        cursor.execute(query, params)
+        self._commit()
+        return cursor.rowcount
+
+    # ==================== Setup Job Management ====================
+
+    def create_setup_job(self, url: str, created_by: int = None) -> int:
+        """Create a pending intelligent setup job."""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "INSERT INTO setup_jobs (url, created_by) VALUES (?, ?)",
+            (url, created_by)
+        )
+        self._commit()
+        return cursor.lastrowid
+
+    def update_setup_job(
+        self,
+        job_id: int,
+        status: str = None,
+        progress: str = None,
+        result: Dict = None,
+        error: str = None
+    ) -> bool:
+        """Update an intelligent setup job's status, progress, result or error."""
+        return self._update_job("setup_jobs", job_id, status, progress, result, error)
+
+    def get_setup_job(self, job_id: int) -> Optional[Dict]:
+        """Get an intelligent setup job by ID."""
+        return self._get_job("setup_jobs", job_id)
+
+    def fail_stale_setup_jobs(self, stale_minutes: int = 15, job_id: int = None) -> int:
+        """Fail setup jobs left unfinished by a dead worker; see _fail_stale_jobs."""
+        return self._fail_stale_jobs(
+            "setup_jobs", "Setup was interrupted; please try again", stale_minutes, job_id
+        )
+
+    # ==================== Legislation Upload Job Management ====================
+
+    def create_legislation_upload_job(self, state_code: str, filename: str, created_by: int = None) -> int:
+        """Create a pending legislation upload job."""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "INSERT INTO legislation_upload_jobs (state_code, filename, created_by) VALUES (?, ?, ?)",
+            (state_code, filename, created_by)
+        )
+        self._commit()
+        return cursor.lastrowid
+
+    def update_legislation_upload_job(
+        self,
+        job_id: int,
+        status: str = None,
+        progress: str = None,
+        result: Dict = None,
+        error: str = None
+    ) -> bool:
+        """Update a legislation upload job's status, progress, result or error."""
+        return self._update_job("legislation_upload_jobs", job_id, status, progress, result, error)
+
+    def get_legislation_upload_job(self, job_id: int) -> Optional[Dict]:
+        """Get a legislation upload job by ID."""
+        return self._get_job("legislation_upload_jobs", job_id)
+
+    def fail_stale_legislation_upload_jobs(self, stale_minutes: int = 15, job_id: int = None) -> int:
+        """Fail upload jobs left unfinished by a dead worker; see _fail_stale_jobs."""
+        return self._fail_stale_jobs(
+            "legislation_upload_jobs",
+            "Upload was interrupted; please upload the document again",
+            stale_minutes,
+            job_id
+        )
+
+    # ==================== Screenshot Job Management ====================
+
+    def create_screenshot_job(self, project_id: int, url: str) -> int:
+        """Queue a project screenshot capture."""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "INSERT INTO screenshot_jobs (project_id, url) VALUES (?, ?)",
+            (project_id, url)
+        )
+        self._commit()
+        return cursor.lastrowid
+
+    def claim_screenshot_job(self, job_id: int, stale_minutes: int = 10) -> bool:
+        """
+        Mark a screenshot job as running if no one else holds it, counting
+        the attempt.
+
+        A job left 'running' for longer than stale_minutes (its worker died
+        mid-capture) may be claimed again.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            UPDATE screenshot_jobs
+            SET status = 'running', attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND (
+                status = 'pending'
+                OR (status = 'running' AND updated_at < datetime('now', ?))
+            )
+        """, (job_id, f"-{stale_minutes} minutes"))
+        self._commit()
+        return cursor.rowcount > 0
+
+    def finish_screenshot_job(self, job_id: int, screenshot_path: str = None, error: str = None):
+        """Mark a screenshot job completed (with its path) or failed (with an error)."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            UPDATE screenshot_jobs
+            SET status = ?, screenshot_path = ?, error = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, ('completed' if screenshot_path else 'failed', screenshot_path, error, job_id))
+        self._commit()
+
+    def requeue_screenshot_job(self, job_id: int, error: str, max_attempts: int) -> Optional[int]:
+        """
+        Put a failed screenshot job back to pending, or fail it for good once
+        it has been attempted max_attempts times.
+
+        Returns:
+            The number of attempts made if the job was requeued, else None
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            UPDATE screenshot_jobs
+            SET status = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END,
+                error = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (max_attempts, error, job_id))
+        cursor.execute("SELECT status, attempts FROM screenshot_jobs WHERE id = ?", (job_id,))
+        row = cursor.fetchone()
+        self._commit()
+        return row['attempts'] if row and row['status'] == 'pending' else None
+
+    def list_unfinished_screenshot_jobs(self) -> List[Dict]:
+        """List screenshot jobs that are pending or were interrupted while running."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT * FROM screenshot_jobs
+            WHERE status IN ('pending', 'running')
+            ORDER BY id
+        """)
+        return [dict(row) for row in cursor.fetchall()]
+
     # ==================== Reporting ====================
 
     def get_project_summary(self, project_id: int) -> Dict:
@@ -921,7 +1620,7 @@ class ComplianceDatabase:
             (check_id, call_type, model, prompt_tokens, completion_tokens, total_tokens)
             VALUES (?, ?, ?, ?, ?, ?)
         """, (check_id, call_type, model, prompt_tokens, completion_tokens, total_tokens))
-        self.conn.commit()
+        self._commit()
         return cursor.lastrowid
 
     def get_llm_calls(self, check_id: int) -> List[Dict]:
@@ -997,6 +1696,158 @@ class ComplianceDatabase:
             logger.info("Database connection closed")
 
 
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes free within the timeout."""
+
+
+class ConnectionPool:
+    """
+    Process-wide pool of ComplianceDatabase instances.
+
+    Opening a ComplianceDatabase sets pragmas, creates tables and checks
+    migrations, so connections are kept open and reused across requests.
+    Instances are created lazily up to max_size; once all are in use,
+    acquire() blocks until one is released. Call warm() at startup to open
+    min_size of them before the first request arrives.
+    """
+
+    def __init__(self, db_path: str, max_size: int = 8, min_size: int = 2):
+        """
+        Initialize an empty pool.
+
+        Args:
+            db_path: Path to SQLite database file
+            max_size: Maximum number of open connections
+            min_size: Number of connections opened by warm()
+        """
+        self.db_path = db_path
+        self.max_size = max_size
+        self.min_size = min(min_size, max_size)
+        # LIFO so the most recently used (warmest) connection is reused first
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> ComplianceDatabase:
+        """
+        Take a connection from the pool, opening one if under max_size.
+
+        Idle connections are pinged before being handed out; one that no
+        longer responds is discarded and replaced.
+
+        Args:
+            timeout: Seconds to wait for a free connection (None waits forever)
+
+        Raises:
+            PoolTimeout: If no connection became free within timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            try:
+                db = self._idle.get_nowait()
+            except queue.Empty:
+                db = None
+
+            if db is None:
+                with self._lock:
+                    can_open = self._size < self.max_size
+                    if can_open:
+                        self._size += 1
+
+                if can_open:
+                    try:
+                        return ComplianceDatabase(self.db_path)
+                    except Exception:
+                        with self._lock:
+                            self._size -= 1
+                        raise
+
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    db = self._idle.get(timeout=remaining)
+                except queue.Empty:
+                    raise PoolTimeout(
+                        f"No database connection available after {timeout}s"
+                    )
+
+            if self._ping(db):
+                return db
+            self._discard(db)
+
+    def _ping(self, db: ComplianceDatabase) -> bool:
+        """Check that a pooled connection is still usable."""
+        try:
+            db.conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, db: ComplianceDatabase):
+        """Drop a broken connection and free its slot."""
+        logger.warning("Discarding unusable pooled database connection")
+        try:
+            db.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._size -= 1
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """
+        Borrow a connection for the duration of a with block.
+
+        For work outside a request's get_db scope, e.g. saving the result of
+        a long-running check without holding a connection while it runs.
+        """
+        db = self.acquire(timeout=timeout)
+        try:
+            yield db
+        finally:
+            self.release(db)
+
+    def warm(self):
+        """
+        Open min_size connections and compile the hot auth statements on each.
+
+        Each connection is opened (pragmas, table checks, migrations) and its
+        statement cache primed, so early requests after a deploy don't pay for it.
+        """
+        warmed = [self.acquire() for _ in range(self.min_size)]
+        try:
+            for db in warmed:
+                db.conn.execute("SELECT 1").fetchone()
+                for sql in PRIMED_STATEMENTS:
+                    db.conn.execute(sql, (None,)).fetchall()
+        finally:
+            for db in warmed:
+                self.release(db)
+        logger.info(f"Database pool warmed with {len(warmed)} connection(s)")
+
+    def release(self, db: ComplianceDatabase):
+        """Return a connection to the pool, discarding any open transaction."""
+        try:
+            if db.conn.in_transaction:
+                db.conn.rollback()
+        except sqlite3.Error:
+            self._discard(db)
+            return
+        db._transaction_depth = 0
+        self._idle.put(db)
+
+    def close(self):
+        """Close all idle connections."""
+        while True:
+            try:
+                db = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            db.close()
+            with self._lock:
+                self._size -= 1
+
+
 def main():
     """Example usage and testing."""
     db = ComplianceDatabase("test_compliance.db")
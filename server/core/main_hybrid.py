@@ -2,18 +2,21 @@
 
 import asyncio
 import argparse
+import hashlib
 import sys
 import logging
+from datetime import datetime
+from pathlib import Path
 from typing import Optional, List, Dict
 
 from .scraper import DealershipScraper
 from .converter import ContentConverter
-from .analyzer import ComplianceAnalyzer
+from .analyzer import ComplianceAnalyzer, close_client as close_analyzer_client
 from .visual_analyzer import VisualComplianceAnalyzer
 from .template_manager import TemplateManager
 from .extraction_templates import ExtractionTemplateManager
 from .reporter import ComplianceReporter
-from .config import STATE_REGULATIONS
+from .config import STATE_REGULATIONS, OPENAI_MODEL, DECISION_CACHE_TTL_DAYS, DATABASE_PATH
 
 logging.basicConfig(
     level=logging.INFO,
@@ -25,6 +28,12 @@ logger = logging.getLogger(__name__)
 class HybridComplianceChecker:
     """Multi-tier compliance checker with text + visual verification."""
 
+    # Result keys that belong to a single check rather than to the decision
+    UNCACHED_RESULT_KEYS = frozenset({
+        'url', 'llm_input_path', 'llm_input_text', 'report_paths',
+        'token_usage', 'text_token_usage', 'visual_token_usages',
+    })
+
     def __init__(self, state_code: str, output_dir: str = "reports"):
         """
         Initialize the hybrid compliance checker.
@@ -41,8 +50,9 @@ class HybridComplianceChecker:
         self.converter = ContentConverter()
         self.analyzer = ComplianceAnalyzer()
         self.visual_analyzer = VisualComplianceAnalyzer()
-        self.template_manager = TemplateManager()
-        self.extraction_manager = ExtractionTemplateManager()
+        # Same database file as the API and the migrations (decision_cache etc.)
+        self.template_manager = TemplateManager(DATABASE_PATH)
+        self.extraction_manager = ExtractionTemplateManager(DATABASE_PATH)
         self.reporter = ComplianceReporter(output_dir)
 
         logger.info(f"HybridComplianceChecker initialized for {self.state_rules.state}")
@@ -122,28 +132,32 @@ class HybridComplianceChecker:
 
             logger.info(f"✓ Converted to Markdown ({len(llm_input)} characters)")
 
-            # Save LLM input
-            from datetime import datetime
-            from pathlib import Path
-
-            input_dir = Path("llm_inputs")
-            input_dir.mkdir(exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            url_slug = url.replace('https://', '').replace('http://', '').replace('/', '_')[:50]
-            input_filename = input_dir / f"llm_input_{url_slug}_{timestamp}.md"
-
-            with open(input_filename, 'w', encoding='utf-8') as f:
-                f.write(f"# LLM Input for Compliance Analysis\n\n")
-                f.write(f"**URL:** {url}\n")
-                f.write(f"**State:** {self.state_rules.state}\n")
-                f.write(f"**Template:** {template_id}\n")
-                f.write(f"**Timestamp:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"**Character Count:** {len(llm_input)}\n\n")
-                f.write("---\n\n")
-                f.write(llm_input)
+            # Save LLM input (written in a worker thread, off the event loop)
+            input_filename = await asyncio.to_thread(
+                self._save_llm_input, url, template_id, llm_input
+            )
 
             logger.info(f"✓ LLM input saved to: {input_filename}")
 
+            # Identical content on the same template gets the same decision, so
+            # a cache hit skips text analysis and visual verification entirely.
+            force_visual_for_homepage = url_type.upper() == 'HOMEPAGE'
+            content_hash = self._content_hash(
+                llm_input, url_type, not skip_visual or force_visual_for_homepage
+            )
+            cached_result = self.template_manager.db.get_cached_decision(
+                template_id, self.state_code, content_hash, max_age_days=DECISION_CACHE_TTL_DAYS
+            )
+            if cached_result is not None:
+                logger.info(f"✓ Using cached decision for identical content on template {template_id}")
+                text_result = cached_result
+                text_result['url'] = url
+                text_result['llm_input_path'] = str(input_filename)
+                text_result['llm_input_text'] = llm_input
+                for v in text_result.get('visual_verifications', []):
+                    v['cached'] = True
+                return self._save_reports(text_result, save_formats)
+
             # Step 3: Text Analysis
             logger.info("Step 3/5: Analyzing compliance with LLM (text)...")
             text_result = await self.analyzer.analyze_compliance(
@@ -161,7 +175,6 @@ class HybridComplianceChecker:
 
             # Step 4: Visual Verification (if needed)
             # ALWAYS do visual verification for homepage scans
-            force_visual_for_homepage = url_type.upper() == 'HOMEPAGE'
             visual_results = []
             if not skip_visual or force_visual_for_homepage:
                 logger.info("Step 4/5: Checking for visual verification needs...")
@@ -297,24 +310,70 @@ class HybridComplianceChecker:
 
             logger.info(f"✓ Token usage - Text: {text_tokens}, Visual: {visual_tokens}, Total: {total_tokens}")
 
-            # Step 5: Generate reports
-            logger.info("Step 5/5: Generating reports...")
-            saved_reports = {}
-            for format in save_formats:
-                report_path = self.reporter.save_report(text_result, format=format)
-                saved_reports[format] = report_path
-
-            logger.info(f"✓ Reports saved: {', '.join(saved_reports.values())}")
-
-            # Add report paths to result
-            text_result['report_paths'] = saved_reports
+            # Cache the decision without the per-check paths and token usage
+            self.template_manager.db.save_cached_decision(
+                template_id, self.state_code, content_hash,
+                {k: v for k, v in text_result.items() if k not in self.UNCACHED_RESULT_KEYS},
+                max_age_days=DECISION_CACHE_TTL_DAYS
+            )
 
-            return text_result
+            return self._save_reports(text_result, save_formats)
 
         except Exception as e:
             logger.error(f"Error checking URL {url}: {str(e)}")
             raise
 
+    def _save_llm_input(self, url: str, template_id: str, llm_input: str) -> Path:
+        """Write the LLM input for a check to llm_inputs/ and return its path."""
+        input_dir = Path("llm_inputs")
+        input_dir.mkdir(exist_ok=True)
+
+        now = datetime.now()
+        url_slug = url.split('://', 1)[-1].replace('/', '_')[:50]
+        input_filename = input_dir / f"llm_input_{url_slug}_{now.strftime('%Y%m%d_%H%M%S')}.md"
+
+        input_filename.write_text("".join((
+            "# LLM Input for Compliance Analysis\n\n",
+            f"**URL:** {url}\n",
+            f"**State:** {self.state_rules.state}\n",
+            f"**Template:** {template_id}\n",
+            f"**Timestamp:** {now.strftime('%Y-%m-%d %H:%M:%S')}\n",
+            f"**Character Count:** {len(llm_input)}\n\n",
+            "---\n\n",
+            llm_input,
+        )), encoding='utf-8')
+        return input_filename
+
+    @staticmethod
+    def _content_hash(llm_input: str, url_type: str, visual: bool) -> str:
+        """Hash the LLM input together with the options that change the analysis."""
+        # The model is part of the key so switching models doesn't reuse old decisions
+        key = f"{OPENAI_MODEL}\n{url_type.upper()}\n{int(visual)}\n{llm_input}".encode('utf-8')
+        return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+    def _save_reports(self, text_result: dict, save_formats: list) -> dict:
+        """Step 5: generate reports and record their paths on the result."""
+        logger.info("Step 5/5: Generating reports...")
+        saved_reports = {}
+        for format in save_formats:
+            report_path = self.reporter.save_report(text_result, format=format)
+            saved_reports[format] = report_path
+
+        logger.info(f"✓ Reports saved: {', '.join(saved_reports.values())}")
+
+        # Add report paths to result
+        text_result['report_paths'] = saved_reports
+
+        return text_result
+
+    async def close(self):
+        """Close the OpenAI HTTP clients and database connections."""
+        # The text analyzer's client is shared process-wide (see core/analyzer.py)
+        await close_analyzer_client()
+        await self.visual_analyzer.client.close()
+        self.template_manager.db.close()
+        self.extraction_manager.db.close()
+
     def print_summary(self, result: dict):
         """Print a summary of the compliance check results."""
         if 'error' in result:
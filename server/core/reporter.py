@@ -238,7 +238,7 @@ class ComplianceReporter:
         """
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            url_slug = analysis_result.get('url', 'unknown').replace('https://', '').replace('http://', '').replace('/', '_')[:50]
+            url_slug = analysis_result.get('url', 'unknown').split('://', 1)[-1].replace('/', '_')[:50]
             ext = {"markdown": "md", "json": "json", "html": "html"}.get(format, "txt")
             filename = f"compliance_report_{url_slug}_{timestamp}.{ext}"
 
@@ -264,7 +264,7 @@ class ComplianceReporter:
         """
         if base_filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            url_slug = analysis_result.get('url', 'unknown').replace('https://', '').replace('http://', '').replace('/', '_')[:50]
+            url_slug = analysis_result.get('url', 'unknown').split('://', 1)[-1].replace('/', '_')[:50]
             base_filename = f"compliance_report_{url_slug}_{timestamp}"
 
         paths = {}
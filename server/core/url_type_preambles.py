@@ -3,6 +3,7 @@
 Different page types have different compliance expectations and focus areas.
 """
 
+from functools import lru_cache
 from typing import Dict
 
 # URL type-specific analysis preambles
@@ -308,6 +309,7 @@ This is a **Financing/Credit Page** - about financing options and credit applica
     },
 }
 
+@lru_cache(maxsize=32)
 def get_preamble(url_type: str) -> str:
     """
     Get the analysis preamble for a specific URL type.
@@ -327,12 +329,14 @@ def get_preamble(url_type: str) -> str:
     return URL_TYPE_PREAMBLES[url_type]["preamble"]
 
 
+@lru_cache(maxsize=32)
 def get_url_type_name(url_type: str) -> str:
     """Get the human-readable name for a URL type."""
     url_type = url_type.upper()
     return URL_TYPE_PREAMBLES.get(url_type, {}).get("name", url_type)
 
 
+@lru_cache(maxsize=32)
 def get_url_type_description(url_type: str) -> str:
     """Get the description for a URL type."""
     url_type = url_type.upper()
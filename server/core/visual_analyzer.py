@@ -5,6 +5,7 @@ import base64
 from typing import Dict, Optional
 from openai import AsyncOpenAI
 import logging
+import orjson
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -82,8 +83,7 @@ class VisualComplianceAnalyzer:
             )
 
             result_text = response.choices[0].message.content
-            import json
-            result = json.loads(result_text)
+            result = orjson.loads(result_text)
 
             result["token_usage"] = {
                 "prompt_tokens": response.usage.prompt_tokens,
@@ -170,7 +170,7 @@ Look at the COMPLETE screenshot (from top to bottom) and determine if the rule i
         # Generate filename
         from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        url_slug = context.get('url', '').replace('https://', '').replace('http://', '').replace('/', '_')[:50]
+        url_slug = context.get('url', '').split('://', 1)[-1].replace('/', '_')[:50]
         screenshot_path = Path(output_dir) / f"visual_{url_slug}_{timestamp}.png"
 
         # Capture screenshot
@@ -110,14 +110,14 @@ def cmd_create_user(args):
         password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
         # Create user
-        user_id = db.create_user(
+        user = db.create_user(
             email=args.email,
             password_hash=password_hash,
             full_name=args.name
         )
 
         print(f"✓ User created successfully")
-        print(f"  ID: {user_id}")
+        print(f"  ID: {user['id']}")
         print(f"  Email: {args.email}")
         print(f"  Name: {args.name or '(none)'}")
 
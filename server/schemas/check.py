@@ -114,6 +114,8 @@ class CheckResponse(BaseModel):
     checked_at: str = Field(..., description="Check timestamp")
     violations: Optional[List[ViolationResponse]] = Field(None, description="Violations found")
     visual_verifications: Optional[List[VisualVerificationResponse]] = Field(None, description="Visual verifications")
+    violation_count: Optional[int] = Field(None, description="Number of violations (list with include_counts)")
+    visual_count: Optional[int] = Field(None, description="Number of visual verifications (list with include_counts)")
 
     model_config = {
         "json_schema_extra": {
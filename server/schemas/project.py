@@ -124,3 +124,26 @@ class IntelligentSetupResponse(BaseModel):
             ]
         }
     }
+
+
+class IntelligentSetupJobResponse(BaseModel):
+    """Status of a background intelligent setup job."""
+    job_id: int = Field(..., description="Setup job ID")
+    status: str = Field(..., description="pending, running, completed or failed")
+    progress: Optional[str] = Field(None, description="Current setup step")
+    result: Optional[IntelligentSetupResponse] = Field(None, description="Setup result once completed")
+    error: Optional[str] = Field(None, description="Failure reason if the job failed")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "job_id": 12,
+                    "status": "running",
+                    "progress": "Analyzing dealership information",
+                    "result": None,
+                    "error": None
+                }
+            ]
+        }
+    }
@@ -128,3 +128,22 @@ class LegislationDigestsListResponse(BaseModel):
     """Response for list of legislation digests."""
     digests: List[LegislationDigestResponse]
     total: int
+
+
+# Upload jobs
+class LegislationUploadResult(BaseModel):
+    """Outcome of a completed legislation upload job."""
+    legislation_source: LegislationSourceResponse
+    digest: Optional[LegislationDigestResponse] = None
+    rules_created: int = 0
+    requires_review: bool = True
+
+
+class LegislationUploadJobResponse(BaseModel):
+    """Status of a background legislation upload job."""
+    job_id: int = Field(..., description="Upload job ID")
+    status: str = Field(..., description="pending, running, completed or failed")
+    status_url: Optional[str] = Field(None, description="Where to poll for the job's status")
+    progress: Optional[str] = Field(None, description="Current processing step")
+    result: Optional[LegislationUploadResult] = Field(None, description="Created source, digest and rule count once completed")
+    error: Optional[str] = Field(None, description="Failure reason if the job failed")
@@ -1,7 +1,7 @@
 """URL-related Pydantic models."""
 
 from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -49,6 +49,23 @@ class URLUpdate(BaseModel):
     }
 
 
+class URLRescanRequest(BaseModel):
+    """Request model for rescanning several URLs at once."""
+    url_ids: List[int] = Field(..., min_length=1, max_length=500, description="IDs of the URLs to rescan")
+    skip_visual: bool = Field(False, description="Skip visual verification")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "url_ids": [1, 2, 3],
+                    "skip_visual": False
+                }
+            ]
+        }
+    }
+
+
 class URLResponse(BaseModel):
     """Response model for URL data."""
     id: int = Field(..., description="URL ID")
@@ -1,15 +1,99 @@
 """Document parsing service for legislation sources."""
 
+import io
 import os
 import logging
-from typing import Dict, Optional, List
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, Optional, List
 from datetime import date
 from openai import AsyncOpenAI
+import pymupdf
 from PyPDF2 import PdfReader
-import io
+
+from core.config import PDF_WORKERS, PDF_PAGES_PER_JOB
 
 logger = logging.getLogger(__name__)
 
+# Page extraction is CPU-bound, so large PDFs are split into page ranges and
+# extracted in separate processes. The pool is created on first use rather
+# than at import so reloader/parent processes don't spawn idle workers.
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_jobs = asyncio.Semaphore(PDF_WORKERS)
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Return the shared PDF extraction pool, creating it on first use."""
+    global _pdf_pool
+    if _pdf_pool is None:
+        # Created mid-request, from a process that already runs threads and
+        # holds SQLite connections and locks; a fork() child could inherit a
+        # lock held by another thread and hang, so workers come from a clean
+        # forkserver process instead
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=PDF_WORKERS,
+            mp_context=multiprocessing.get_context("forkserver")
+        )
+    return _pdf_pool
+
+
+def shutdown_pdf_pool():
+    """Stop the PDF extraction processes (called on app shutdown)."""
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+def _pdf_page_count(pdf_bytes: bytes) -> int:
+    """Number of pages in the PDF, via PyMuPDF."""
+    with pymupdf.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return doc.page_count
+
+
+def _extract_pages(pdf_bytes: bytes, page_ids: List[int]) -> List[str]:
+    """Text of the given PDF pages, via PyMuPDF. Runs in a pool process."""
+    with pymupdf.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return [doc[i].get_text("text") for i in page_ids]
+
+
+async def _pdf_pages_pymupdf(pdf_bytes: bytes) -> List[str]:
+    """
+    Text of each PDF page, via PyMuPDF.
+
+    Pages are extracted PDF_PAGES_PER_JOB at a time across the process pool
+    and reassembled in page order. At most PDF_WORKERS jobs are queued at once
+    so concurrent uploads don't pile copies of their bytes onto the pool.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _get_pdf_pool()
+    page_count = await loop.run_in_executor(pool, _pdf_page_count, pdf_bytes)
+
+    async def run(page_ids: List[int]) -> List[str]:
+        async with _pdf_jobs:
+            return await loop.run_in_executor(pool, _extract_pages, pdf_bytes, page_ids)
+
+    chunks = [
+        list(range(start, min(start + PDF_PAGES_PER_JOB, page_count)))
+        for start in range(0, page_count, PDF_PAGES_PER_JOB)
+    ]
+    results = await asyncio.gather(*(run(chunk) for chunk in chunks))
+    return [text for chunk_text in results for text in chunk_text]
+
+
+def _pdf_pages_pypdf(pdf_bytes: bytes) -> List[str]:
+    """Text of each PDF page, via PyPDF2 (slower fallback)."""
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    pages = []
+    for page_num, page in enumerate(reader.pages):
+        try:
+            pages.append(page.extract_text() or "")
+        except Exception as e:
+            logger.warning(f"Failed to extract text from page {page_num + 1}: {e}")
+            pages.append("")
+    return pages
+
 
 class DocumentParserService:
     """Service for parsing uploaded documents into legislation sources."""
@@ -25,7 +109,7 @@ class DocumentParserService:
 
     async def parse_document(
         self,
-        file_content: bytes,
+        file: BinaryIO,
         filename: str,
         state_code: str,
         mime_type: str
@@ -34,7 +118,7 @@ class DocumentParserService:
         Parse an uploaded document and extract legislation information.
 
         Args:
-            file_content: Raw file bytes
+            file: Binary file object positioned at the start of the upload
             filename: Original filename
             state_code: Two-letter state code
             mime_type: MIME type of the file
@@ -45,7 +129,7 @@ class DocumentParserService:
         logger.info(f"Parsing document: {filename} ({mime_type}) for state {state_code}")
 
         # Extract text based on file type
-        text = await self._extract_text(file_content, mime_type, filename)
+        text = await self._extract_text(file, mime_type, filename)
 
         if not text or len(text.strip()) < 100:
             raise ValueError("Document appears to be empty or too short to parse")
@@ -55,15 +139,16 @@ class DocumentParserService:
 
         return parsed_data
 
-    async def _extract_text(self, file_content: bytes, mime_type: str, filename: str) -> str:
+    async def _extract_text(self, file: BinaryIO, mime_type: str, filename: str) -> str:
         """Extract text from different file types."""
 
         # PDF extraction
         if mime_type == "application/pdf" or filename.lower().endswith(".pdf"):
-            return self._extract_pdf_text(file_content)
+            return await self._extract_pdf_text(file)
 
         # Markdown or plain text
         elif mime_type in ["text/markdown", "text/plain"] or filename.lower().endswith((".md", ".txt")):
+            file_content = file.read()
             try:
                 return file_content.decode("utf-8")
             except UnicodeDecodeError:
@@ -73,22 +158,29 @@ class DocumentParserService:
         else:
             raise ValueError(f"Unsupported file type: {mime_type}. Supported types: PDF, Markdown (.md), Plain Text (.txt)")
 
-    def _extract_pdf_text(self, file_content: bytes) -> str:
-        """Extract text from PDF file."""
+    async def _extract_pdf_text(self, file: BinaryIO) -> str:
+        """
+        Extract text from a PDF file object.
+
+        Uses PyMuPDF in the extraction process pool, which is far faster than
+        PyPDF2 page by page; PyPDF2 is kept as a fallback (in a thread) for
+        files MuPDF can't open or reads no text from.
+        """
         try:
-            pdf_file = io.BytesIO(file_content)
-            reader = PdfReader(pdf_file)
-
-            text_parts = []
-            for page_num, page in enumerate(reader.pages):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(f"\n--- Page {page_num + 1} ---\n{page_text}")
-                except Exception as e:
-                    logger.warning(f"Failed to extract text from page {page_num + 1}: {e}")
-
-            full_text = "\n".join(text_parts)
+            pdf_bytes = file.read()
+            try:
+                pages = await _pdf_pages_pymupdf(pdf_bytes)
+            except Exception as e:
+                logger.warning(f"PyMuPDF could not read PDF, falling back to PyPDF2: {e}")
+                pages = []
+            if not any(page.strip() for page in pages):
+                pages = await asyncio.to_thread(_pdf_pages_pypdf, pdf_bytes)
+
+            full_text = "\n".join(
+                f"\n--- Page {page_num + 1} ---\n{page_text}"
+                for page_num, page_text in enumerate(pages)
+                if page_text
+            )
 
             if not full_text.strip():
                 raise ValueError("PDF appears to be empty or contains only images")
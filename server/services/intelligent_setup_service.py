@@ -2,7 +2,7 @@
 
 import sys
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List
 import logging
 import re
 import json
@@ -31,12 +31,17 @@ class IntelligentSetupService(BaseService):
         super().__init__(db)
         self.analyzer = None  # Lazy initialization
 
-    async def setup_from_url(self, starting_url: str) -> IntelligentSetupResponse:
+    async def setup_from_url(
+        self,
+        starting_url: str,
+        on_progress: Optional[Callable[[str], None]] = None
+    ) -> IntelligentSetupResponse:
         """
         Analyze a dealership website and create a project with monitoring URLs.
 
         Args:
             starting_url: Any URL from the dealership website
+            on_progress: Optional callback invoked with a description of each step
 
         Returns:
             IntelligentSetupResponse with created project and URLs
@@ -46,8 +51,13 @@ class IntelligentSetupService(BaseService):
         """
         logger.info(f"Starting intelligent setup for: {starting_url}")
 
+        def report(step: str):
+            if on_progress:
+                on_progress(step)
+
         try:
             # Step 1: Scrape the starting page
+            report("Scraping website")
             async with DealershipScraper() as scraper:
                 page_data = await scraper.scrape_page(starting_url)
 
@@ -60,6 +70,7 @@ class IntelligentSetupService(BaseService):
             markdown = converter.html_to_markdown(page_data['html'])
 
             # Step 4: Use LLM to analyze the page and extract dealership info
+            report("Analyzing dealership information")
             analysis_result = await self._analyze_dealership(
                 markdown=markdown,
                 url=starting_url,
@@ -82,6 +93,7 @@ class IntelligentSetupService(BaseService):
                 )
 
             # Step 5: Create the project
+            report("Creating project")
             project_service = ProjectService(self.db)
 
             # Handle duplicate names by appending a number
@@ -107,6 +119,7 @@ class IntelligentSetupService(BaseService):
                         raise
 
             # Step 6: Create URLs with appropriate frequencies
+            report("Creating monitoring URLs")
             page_urls = analysis_result.get('page_urls', {})
             urls_created = await self._create_monitoring_urls(
                 project_id=project.id,
@@ -116,6 +129,7 @@ class IntelligentSetupService(BaseService):
             )
 
             # Step 7: Capture screenshot
+            report("Capturing screenshot")
             try:
                 screenshot_service = ScreenshotService(self.db)
                 await screenshot_service.capture_project_screenshot(
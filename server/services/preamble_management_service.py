@@ -1,6 +1,6 @@
 """Preamble management service for CRUD operations on preambles and versions."""
 
-from typing import List, Optional, Dict
+from typing import Iterator, List, Optional, Dict
 from datetime import datetime
 import logging
 import re
@@ -53,8 +53,6 @@ class PreambleManagementService:
         except Exception as e:
             conn.rollback()
             raise ValueError(f"Failed to create template: {str(e)}")
-        finally:
-            conn.close()
 
     def get_template(self, template_id: int) -> Optional[PreambleTemplateResponse]:
         """Get a preamble template by ID."""
@@ -68,7 +66,6 @@ class PreambleManagementService:
         """, (template_id,))
 
         row = cursor.fetchone()
-        conn.close()
 
         if row:
             return PreambleTemplateResponse(
@@ -94,7 +91,6 @@ class PreambleManagementService:
         """)
 
         rows = cursor.fetchall()
-        conn.close()
 
         return [
             PreambleTemplateResponse(
@@ -165,8 +161,6 @@ class PreambleManagementService:
         except Exception as e:
             conn.rollback()
             raise ValueError(f"Failed to create preamble: {str(e)}")
-        finally:
-            conn.close()
 
     def get_preamble(self, preamble_id: int) -> Optional[PreambleResponse]:
         """Get a preamble by ID with its active version."""
@@ -183,7 +177,6 @@ class PreambleManagementService:
         row = cursor.fetchone()
 
         if not row:
-            conn.close()
             return None
 
         preamble = PreambleResponse(
@@ -210,7 +203,6 @@ class PreambleManagementService:
         """, (preamble_id,))
 
         version_row = cursor.fetchone()
-        conn.close()
 
         if version_row:
             preamble.active_version = PreambleVersionResponse(
@@ -234,43 +226,105 @@ class PreambleManagementService:
         project_id: Optional[int] = None
     ) -> List[PreambleResponse]:
         """List preambles with optional filters."""
+        return list(self.iter_preambles(
+            scope=scope,
+            state_code=state_code,
+            page_type_code=page_type_code,
+            project_id=project_id
+        ))
+
+    def iter_preambles(
+        self,
+        scope: Optional[str] = None,
+        state_code: Optional[str] = None,
+        page_type_code: Optional[str] = None,
+        project_id: Optional[int] = None,
+        batch_size: int = 256
+    ) -> Iterator[PreambleResponse]:
+        """Yield preambles with optional filters, reading rows in batches.
+
+        The active version is joined in the same query rather than looked up
+        per preamble.
+        """
         cursor = self.db.conn.cursor()
 
         query = """
-            SELECT id, name, machine_name, scope, page_type_code, state_code,
-                   project_id, created_via, created_at, created_by
-            FROM preambles
+            SELECT p.id, p.name, p.machine_name, p.scope, p.page_type_code, p.state_code,
+                   p.project_id, p.created_via, p.created_at, p.created_by,
+                   v.id, v.preamble_id, v.version_number, v.preamble_text, v.change_summary,
+                   v.status, v.created_at, v.created_by
+            FROM preambles p
+            LEFT JOIN preamble_versions v ON v.id = (
+                SELECT id FROM preamble_versions
+                WHERE preamble_id = p.id AND status = 'active'
+                ORDER BY version_number DESC
+                LIMIT 1
+            )
             WHERE 1=1
         """
 
         params = []
 
         if scope:
-            query += " AND scope = ?"
+            query += " AND p.scope = ?"
             params.append(scope)
 
         if state_code:
-            query += " AND state_code = ?"
+            query += " AND p.state_code = ?"
             params.append(state_code.upper())
 
         if page_type_code:
-            query += " AND page_type_code = ?"
+            query += " AND p.page_type_code = ?"
             params.append(page_type_code)
 
         if project_id:
-            query += " AND project_id = ?"
+            query += " AND p.project_id = ?"
             params.append(project_id)
 
-        query += " ORDER BY scope, state_code, page_type_code, created_at DESC"
+        query += " ORDER BY p.scope, p.state_code, p.page_type_code, p.created_at DESC"
 
         cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
 
-        return [
-            self.get_preamble(row[0])
-            for row in rows
-        ]
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield self._preamble_from_row(row)
+
+    def _preamble_from_row(self, row) -> PreambleResponse:
+        """
+        Build a preamble from a row joined with its active version.
+
+        Rows come straight from tables whose scope/status values are enforced
+        by CHECK constraints, so model_construct skips re-validating them.
+        """
+        active_version = None
+        if row[10] is not None:
+            active_version = PreambleVersionResponse.model_construct(
+                id=row[10],
+                preamble_id=row[11],
+                version_number=row[12],
+                preamble_text=row[13],
+                change_summary=row[14],
+                status=row[15],
+                created_at=datetime.fromisoformat(row[16]),
+                created_by=row[17]
+            )
+
+        return PreambleResponse.model_construct(
+            id=row[0],
+            name=row[1],
+            machine_name=row[2],
+            scope=row[3],
+            page_type_code=row[4],
+            state_code=row[5],
+            project_id=row[6],
+            created_via=row[7],
+            created_at=datetime.fromisoformat(row[8]),
+            created_by=row[9],
+            active_version=active_version
+        )
 
     # Preamble Versions
     def create_version(self, version_data: PreambleVersionCreate) -> PreambleVersionResponse:
@@ -313,8 +367,6 @@ class PreambleManagementService:
         except Exception as e:
             conn.rollback()
             raise ValueError(f"Failed to create version: {str(e)}")
-        finally:
-            conn.close()
 
     def get_version(self, version_id: int) -> Optional[PreambleVersionResponse]:
         """Get a preamble version by ID."""
@@ -329,7 +381,6 @@ class PreambleManagementService:
         """, (version_id,))
 
         row = cursor.fetchone()
-        conn.close()
 
         if row:
             return PreambleVersionResponse(
@@ -358,10 +409,9 @@ class PreambleManagementService:
         """, (preamble_id,))
 
         rows = cursor.fetchall()
-        conn.close()
 
         return [
-            PreambleVersionResponse(
+            PreambleVersionResponse.model_construct(
                 id=row[0],
                 preamble_id=row[1],
                 version_number=row[2],
@@ -412,8 +462,6 @@ class PreambleManagementService:
         except Exception as e:
             conn.rollback()
             raise ValueError(f"Failed to activate version: {str(e)}")
-        finally:
-            conn.close()
 
     # Test Runs
     def create_test_run(self, test_data: PreambleTestRunCreate) -> PreambleTestRunResponse:
@@ -454,8 +502,6 @@ class PreambleManagementService:
         except Exception as e:
             conn.rollback()
             raise ValueError(f"Failed to create test run: {str(e)}")
-        finally:
-            conn.close()
 
     def get_test_run(self, test_id: int) -> Optional[PreambleTestRunResponse]:
         """Get a test run by ID."""
@@ -471,7 +517,6 @@ class PreambleManagementService:
         """, (test_id,))
 
         row = cursor.fetchone()
-        conn.close()
 
         if row:
             return PreambleTestRunResponse(
@@ -518,7 +563,6 @@ class PreambleManagementService:
             """)
 
         rows = cursor.fetchall()
-        conn.close()
 
         return [
             PreambleTestRunResponse(
@@ -556,7 +600,6 @@ class PreambleManagementService:
         """, (preamble_version_id,))
 
         row = cursor.fetchone()
-        conn.close()
 
         if row:
             return PreambleVersionPerformanceResponse(
@@ -675,5 +718,3 @@ class PreambleManagementService:
         except Exception as e:
             conn.rollback()
             logger.error(f"Failed to update performance metrics: {str(e)}")
-        finally:
-            conn.close()
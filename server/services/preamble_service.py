@@ -2,6 +2,7 @@
 
 import hashlib
 import json
+from functools import lru_cache
 from typing import Optional, Dict, List
 from jinja2 import Template
 from datetime import datetime
@@ -12,6 +13,18 @@ from core.database import ComplianceDatabase
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=32)
+def _compile_template(template_structure: str) -> Template:
+    """
+    Compile a composition template once; there are only a handful of them.
+
+    Renders only happen on a preamble_compositions miss, so this in-process
+    cache plus that table cover the hot path. (Jinja's bytecode cache would
+    not help: it only applies to loader templates, not from_string ones.)
+    """
+    return Template(template_structure)
+
+
 class PreambleService:
     """Service for composing and caching preambles."""
 
@@ -262,7 +275,7 @@ class PreambleService:
         page_type: str
     ) -> str:
         """Compose preamble using Jinja2 template."""
-        template = Template(template_structure)
+        template = _compile_template(template_structure)
 
         return template.render(
             universal_preamble=universal_text,
@@ -280,8 +293,8 @@ class PreambleService:
         state_version_id: Optional[int],
         page_type_version_id: Optional[int],
         project_version_id: Optional[int]
-    ) -> str:
-        """Generate a hash for cache lookup."""
+    ) -> int:
+        """Generate a signed 64-bit hash for cache lookup (an INTEGER key)."""
         cache_key = {
             'template_id': template_id,
             'universal_version_id': universal_version_id,
@@ -292,9 +305,10 @@ class PreambleService:
 
         # Create deterministic hash
         key_string = json.dumps(cache_key, sort_keys=True)
-        return hashlib.sha256(key_string.encode()).hexdigest()
+        digest = hashlib.blake2b(key_string.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big", signed=True)
 
-    def _get_cached_composition(self, cache_hash: str) -> Optional[Dict]:
+    def _get_cached_composition(self, cache_hash: int) -> Optional[Dict]:
         """Retrieve cached composition by hash."""
         conn = self.db.get_connection()
         cursor = conn.cursor()
@@ -318,7 +332,7 @@ class PreambleService:
 
     def _cache_composition(
         self,
-        cache_hash: str,
+        cache_hash: int,
         template_id: int,
         universal_version_id: Optional[int],
         state_version_id: Optional[int],
@@ -330,9 +344,10 @@ class PreambleService:
         conn = self.db.get_connection()
         cursor = conn.cursor()
 
-        # Insert composition
+        # Insert composition. OR IGNORE: two requests can miss on the same
+        # hash at once, and the second render is identical to the first.
         cursor.execute("""
-            INSERT INTO preamble_compositions (
+            INSERT OR IGNORE INTO preamble_compositions (
                 composition_hash,
                 template_id,
                 universal_version_id,
@@ -356,15 +371,20 @@ class PreambleService:
             datetime.now().isoformat()
         ))
 
+        if cursor.rowcount == 0:
+            conn.close()
+            return
         composition_id = cursor.lastrowid
 
         # Insert dependency records for cache invalidation
-        for version_id in [universal_version_id, state_version_id, page_type_version_id, project_version_id]:
-            if version_id:
-                cursor.execute("""
-                    INSERT INTO preamble_composition_deps (composition_id, depends_on_version_id)
-                    VALUES (?, ?)
-                """, (composition_id, version_id))
+        cursor.executemany("""
+            INSERT INTO preamble_composition_deps (composition_id, depends_on_version_id)
+            VALUES (?, ?)
+        """, [
+            (composition_id, version_id)
+            for version_id in (universal_version_id, state_version_id, page_type_version_id, project_version_id)
+            if version_id
+        ])
 
         conn.commit()
         conn.close()
@@ -11,6 +11,24 @@ from schemas.rule import (
 
 logger = logging.getLogger(__name__)
 
+SQL_INSERT_RULE = """
+    INSERT INTO rules (
+        state_code, legislation_source_id, legislation_digest_id,
+        rule_text, applies_to_page_types, active, approved,
+        is_manually_modified, original_rule_text, status, supersedes_rule_id,
+        created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Column order matches _row_to_rule
+SQL_SELECT_RULES = """
+    SELECT id, state_code, legislation_source_id, legislation_digest_id,
+           rule_text, applies_to_page_types, active, approved,
+           is_manually_modified, original_rule_text, status, supersedes_rule_id,
+           created_at, updated_at
+    FROM rules
+"""
+
 
 class RuleService:
     """Service for managing compliance rules."""
@@ -25,31 +43,7 @@ class RuleService:
         cursor = conn.cursor()
 
         try:
-            # Store original text if this is AI-generated
-            original_text = rule_data.rule_text if rule_data.legislation_digest_id else None
-
-            cursor.execute("""
-                INSERT INTO rules (
-                    state_code, legislation_source_id, legislation_digest_id,
-                    rule_text, applies_to_page_types, active, approved,
-                    is_manually_modified, original_rule_text, status, supersedes_rule_id,
-                    created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                rule_data.state_code.upper(),
-                rule_data.legislation_source_id,
-                rule_data.legislation_digest_id,
-                rule_data.rule_text,
-                rule_data.applies_to_page_types,
-                rule_data.active,
-                rule_data.approved,
-                rule_data.is_manually_modified,
-                original_text,
-                rule_data.status,
-                rule_data.supersedes_rule_id,
-                datetime.now().isoformat(),
-                datetime.now().isoformat()
-            ))
+            cursor.execute(SQL_INSERT_RULE, self._rule_insert_params(rule_data))
             conn.commit()
             rule_id = cursor.lastrowid
             logger.info(f"Created rule: {rule_id}")
@@ -59,19 +53,39 @@ class RuleService:
             logger.error(f"Failed to create rule: {e}")
             raise ValueError(f"Failed to create rule: {str(e)}")
 
+    def create_rules_bulk(self, rules_data: List[RuleCreate]) -> List[RuleResponse]:
+        """
+        Create many rules with a single executemany and one commit.
+
+        Returns the created rules in input order.
+        """
+        if not rules_data:
+            return []
+
+        conn = self.db.conn
+        try:
+            with self.db.transaction():
+                conn.executemany(SQL_INSERT_RULE, [self._rule_insert_params(r) for r in rules_data])
+                # New rowids are consecutive: no other writer can interleave in this transaction
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                first_id = last_id - len(rules_data) + 1
+                rows = conn.execute(
+                    SQL_SELECT_RULES + " WHERE id BETWEEN ? AND ? ORDER BY id",
+                    (first_id, last_id)
+                ).fetchall()
+        except Exception as e:
+            logger.error(f"Failed to create rules: {e}")
+            raise ValueError(f"Failed to create rules: {str(e)}")
+
+        logger.info(f"Created {len(rows)} rules (ids {first_id}-{last_id})")
+        return [self._row_to_rule(row) for row in rows]
+
     def get_rule(self, rule_id: int) -> Optional[RuleResponse]:
         """Get a rule by ID."""
         conn = self.db.conn
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT id, state_code, legislation_source_id, legislation_digest_id,
-                   rule_text, applies_to_page_types, active, approved,
-                   is_manually_modified, original_rule_text, status, supersedes_rule_id,
-                   created_at, updated_at
-            FROM rules
-            WHERE id = ?
-        """, (rule_id,))
+        cursor.execute(SQL_SELECT_RULES + " WHERE id = ?", (rule_id,))
 
         row = cursor.fetchone()
 
@@ -89,13 +103,7 @@ class RuleService:
         conn = self.db.conn
         cursor = conn.cursor()
 
-        query = """
-            SELECT id, state_code, legislation_source_id, legislation_digest_id,
-                   rule_text, applies_to_page_types, active, approved,
-                   is_manually_modified, original_rule_text, status, supersedes_rule_id,
-                   created_at, updated_at
-            FROM rules
-        """
+        query = SQL_SELECT_RULES
 
         conditions = []
         params = []
@@ -120,6 +128,15 @@ class RuleService:
 
         return [self._row_to_rule(row) for row in rows]
 
+    def list_rules_by_legislation(self, source_id: int) -> List[RuleResponse]:
+        """List all rules from a legislation source (every digest version), newest first."""
+        cursor = self.db.conn.cursor()
+        cursor.execute(
+            SQL_SELECT_RULES + " WHERE legislation_source_id = ? ORDER BY created_at DESC",
+            (source_id,)
+        )
+        return [self._row_to_rule(row) for row in cursor.fetchall()]
+
     def update_rule(self, rule_id: int, rule_data: RuleUpdate) -> RuleResponse:
         """Update a rule."""
         conn = self.db.conn
@@ -232,18 +249,12 @@ class RuleService:
         cursor = conn.cursor()
 
         try:
-            # Get count before deletion
-            cursor.execute(
-                "SELECT COUNT(*) FROM rules WHERE legislation_source_id = ?",
-                (source_id,)
-            )
-            count = cursor.fetchone()[0]
-
             # Delete ALL rules
             cursor.execute(
                 "DELETE FROM rules WHERE legislation_source_id = ?",
                 (source_id,)
             )
+            count = cursor.rowcount
             conn.commit()
             logger.info(f"Deleted {count} rules for legislation source {source_id}")
             return count
@@ -267,39 +278,29 @@ class RuleService:
 
         Returns dict with deleted and protected counts.
         """
-        conn = self.db.conn
-        cursor = conn.cursor()
+        cursor = self.db.conn.cursor()
 
         try:
-            # Count deletable rules (not approved, not manually modified)
-            cursor.execute("""
-                SELECT COUNT(*)
-                FROM rules
-                WHERE legislation_digest_id = ?
-                AND approved = 0
-                AND is_manually_modified = 0
-            """, (digest_id,))
-            deleted_count = cursor.fetchone()[0]
-
-            # Count protected rules (will NOT be deleted)
-            cursor.execute("""
-                SELECT COUNT(*)
-                FROM rules
-                WHERE legislation_digest_id = ?
-                AND (approved = 1 OR is_manually_modified = 1)
-            """, (digest_id,))
-            protected_count = cursor.fetchone()[0]
-
-            # Delete only unapproved, unmodified rules
-            # Protected rules keep their digest_id for full lineage trail
-            cursor.execute("""
-                DELETE FROM rules
-                WHERE legislation_digest_id = ?
-                AND approved = 0
-                AND is_manually_modified = 0
-            """, (digest_id,))
-
-            conn.commit()
+            # Joins the caller's transaction when run as part of a re-digest
+            with self.db.transaction():
+                # Delete only unapproved, unmodified rules
+                # Protected rules keep their digest_id for full lineage trail
+                cursor.execute("""
+                    DELETE FROM rules
+                    WHERE legislation_digest_id = ?
+                    AND approved = 0
+                    AND is_manually_modified = 0
+                """, (digest_id,))
+                deleted_count = cursor.rowcount
+
+                # Count protected rules (kept above)
+                cursor.execute("""
+                    SELECT COUNT(*)
+                    FROM rules
+                    WHERE legislation_digest_id = ?
+                    AND (approved = 1 OR is_manually_modified = 1)
+                """, (digest_id,))
+                protected_count = cursor.fetchone()[0]
 
             logger.info(
                 f"Digest {digest_id}: Deleted {deleted_count} unapproved rules, "
@@ -312,7 +313,6 @@ class RuleService:
             }
 
         except Exception as e:
-            conn.rollback()
             logger.error(f"Failed to delete rules by digest: {e}")
             raise ValueError(f"Failed to delete rules by digest: {str(e)}")
 
@@ -342,18 +342,11 @@ class RuleService:
         cursor = conn.cursor()
 
         try:
-            # Get count before deletion
-            cursor.execute(
-                "SELECT COUNT(*) FROM rules WHERE state_code = ?",
-                (state_code.upper(),)
-            )
-            count = cursor.fetchone()[0]
-
-            # Delete rules
             cursor.execute(
                 "DELETE FROM rules WHERE state_code = ?",
                 (state_code.upper(),)
             )
+            count = cursor.rowcount
             conn.commit()
             logger.info(f"Deleted {count} rules for state {state_code}")
             return count
@@ -362,9 +355,31 @@ class RuleService:
             logger.error(f"Failed to delete rules by state: {e}")
             raise ValueError(f"Failed to delete rules by state: {str(e)}")
 
+    @staticmethod
+    def _rule_insert_params(rule_data: RuleCreate) -> tuple:
+        """Build SQL_INSERT_RULE parameters for a new rule."""
+        # Store original text if this is AI-generated
+        original_text = rule_data.rule_text if rule_data.legislation_digest_id else None
+        now = datetime.now().isoformat()
+        return (
+            rule_data.state_code.upper(),
+            rule_data.legislation_source_id,
+            rule_data.legislation_digest_id,
+            rule_data.rule_text,
+            rule_data.applies_to_page_types,
+            rule_data.active,
+            rule_data.approved,
+            rule_data.is_manually_modified,
+            original_text,
+            rule_data.status,
+            rule_data.supersedes_rule_id,
+            now,
+            now
+        )
+
     def _row_to_rule(self, row) -> RuleResponse:
-        """Convert database row to RuleResponse."""
-        return RuleResponse(
+        """Convert database row to RuleResponse (trusted row, so not re-validated)."""
+        return RuleResponse.model_construct(
             id=row[0],
             state_code=row[1],
             legislation_source_id=row[2],
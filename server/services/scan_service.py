@@ -9,6 +9,7 @@ import asyncio
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core.config import RESCAN_CONCURRENCY
 from core.database import ComplianceDatabase
 from core.main_hybrid import HybridComplianceChecker
 from services.base_service import BaseService
@@ -17,6 +18,28 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# One checker per state, shared by the check and rescan routes so the OpenAI
+# clients and the template/extraction database connections are set up once
+# per worker. The Playwright browser is still started per check in check_url.
+_CHECKERS: Dict[str, HybridComplianceChecker] = {}
+
+
+def get_checker(state_code: str) -> HybridComplianceChecker:
+    """Return the cached checker for a state, creating it on first use."""
+    checker = _CHECKERS.get(state_code)
+    if checker is None:
+        checker = HybridComplianceChecker(state_code=state_code, output_dir="reports")
+        _CHECKERS[state_code] = checker
+    return checker
+
+
+async def close_checkers():
+    """Close and forget all cached checkers (on shutdown)."""
+    while _CHECKERS:
+        _, checker = _CHECKERS.popitem()
+        await checker.close()
+
+
 class ScanService(BaseService):
     """Service for compliance scanning with batch and immediate modes."""
 
@@ -80,11 +103,7 @@ class ScanService(BaseService):
         url_type = url_data.get('url_type', 'VDP')  # Default to VDP if not specified
 
         try:
-            # Initialize checker
-            checker = HybridComplianceChecker(
-                state_code=state_code,
-                output_dir="reports"
-            )
+            checker = get_checker(state_code)
 
             # Run immediate check
             logger.info(f"Running immediate check for {url} (Type: {url_type})")
@@ -232,6 +251,80 @@ class ScanService(BaseService):
             "message": "Batch scan scheduled. OpenAI Batch API integration pending."
         }
 
+    async def rescan_urls(
+        self,
+        url_ids: List[int],
+        skip_visual: bool = False,
+        concurrency: int = RESCAN_CONCURRENCY
+    ) -> Dict:
+        """
+        Rescan several URLs in one call.
+
+        Inventory URLs go into a single batch scan; all other URLs are
+        scanned immediately, up to `concurrency` at a time.
+
+        Args:
+            url_ids: IDs of the URLs to rescan
+            skip_visual: Whether to skip visual verification
+            concurrency: Maximum immediate scans running at once
+
+        Returns:
+            Dictionary with the batch (if any), immediate results and failures
+        """
+        url_ids = list(dict.fromkeys(url_ids))
+        placeholders = ",".join("?" * len(url_ids))
+        cursor = self.db.conn.cursor()
+        cursor.execute(
+            f"SELECT id, url_type FROM urls WHERE id IN ({placeholders})",
+            url_ids
+        )
+        url_types = {row[0]: (row[1] or '').lower() for row in cursor.fetchall()}
+
+        failed = [
+            {"url_id": url_id, "error": f"URL not found: {url_id}"}
+            for url_id in url_ids if url_id not in url_types
+        ]
+        inventory_ids = [url_id for url_id in url_ids if url_types.get(url_id) == 'inventory']
+        immediate_ids = [
+            url_id for url_id in url_ids
+            if url_id in url_types and url_types[url_id] != 'inventory'
+        ]
+
+        batch = None
+        if inventory_ids:
+            try:
+                batch = await self.schedule_batch_scan(
+                    url_ids=inventory_ids,
+                    batch_name=f"Force rescan: {len(inventory_ids)} inventory URLs"
+                )
+            except ValueError as e:
+                failed.extend({"url_id": url_id, "error": str(e)} for url_id in inventory_ids)
+
+        slots = asyncio.Semaphore(concurrency)
+
+        async def scan(url_id: int) -> Dict:
+            async with slots:
+                return await self.force_rescan_immediate(url_id=url_id, skip_visual=skip_visual)
+
+        completed = []
+        results = await asyncio.gather(*(scan(url_id) for url_id in immediate_ids), return_exceptions=True)
+        for url_id, result in zip(immediate_ids, results):
+            if isinstance(result, Exception):
+                failed.append({"url_id": url_id, "error": str(result)})
+            else:
+                completed.append(result)
+
+        logger.info(
+            f"Bulk rescan: {len(completed)} scanned, "
+            f"{len(inventory_ids)} batched, {len(failed)} failed"
+        )
+
+        return {
+            "batch": batch,
+            "immediate": completed,
+            "failed": failed
+        }
+
     def get_urls_needing_scan(
         self,
         project_id: Optional[int] = None,
@@ -1,6 +1,7 @@
 """Screenshot service for capturing project previews."""
 
 import asyncio
+import sqlite3
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -12,10 +13,22 @@ from pathlib import Path as PathLib
 sys.path.insert(0, str(PathLib(__file__).parent.parent))
 
 from core.database import ComplianceDatabase
-from core.config import DATABASE_PATH
+from core.config import (
+    DATABASE_PATH,
+    SCREENSHOT_CONCURRENCY,
+    SCREENSHOT_MAX_ATTEMPTS,
+    SCREENSHOT_RETRY_DELAY
+)
 
 logger = logging.getLogger(__name__)
 
+# Each capture launches its own Chromium, so cap how many run at once
+_capture_slots = asyncio.Semaphore(SCREENSHOT_CONCURRENCY)
+
+# Strong references to resumed and retried jobs so they aren't garbage
+# collected mid-run
+_scheduled_jobs = set()
+
 
 class ScreenshotService:
     """Service for capturing project screenshots."""
@@ -103,3 +116,79 @@ def capture_screenshot_sync(project_id: int, url: str) -> Optional[str]:
         return asyncio.run(service.capture_project_screenshot(project_id, url))
     finally:
         db.close()
+
+
+def _schedule(coro):
+    """Run a job coroutine as a task, keeping a strong reference until it ends."""
+    task = asyncio.create_task(coro)
+    _scheduled_jobs.add(task)
+    task.add_done_callback(_scheduled_jobs.discard)
+
+
+async def _retry_screenshot_job(job_id: int, project_id: int, url: str, delay: float):
+    """Re-run a requeued screenshot job after its backoff delay."""
+    await asyncio.sleep(delay)
+    await run_screenshot_job(job_id, project_id, url)
+
+
+async def run_screenshot_job(job_id: int, project_id: int, url: str):
+    """
+    Run a queued screenshot job with its own database connection.
+
+    The job is claimed once a capture slot is free, so a job already picked
+    up by another worker (or a previous call) is skipped, and a claimed job
+    never sits waiting for a slot past its lease. A failed capture is
+    requeued with exponential backoff until SCREENSHOT_MAX_ATTEMPTS.
+    """
+    async with _capture_slots:
+        db = ComplianceDatabase(DATABASE_PATH)
+        try:
+            if not db.claim_screenshot_job(job_id):
+                return
+            try:
+                service = ScreenshotService(db)
+                screenshot_path = await service.capture_project_screenshot(project_id, url)
+                error = None if screenshot_path else "Screenshot capture failed"
+            except Exception as e:
+                logger.error(f"Screenshot job {job_id} failed: {e}")
+                screenshot_path, error = None, str(e)
+
+            if screenshot_path:
+                db.finish_screenshot_job(job_id, screenshot_path=screenshot_path)
+                return
+
+            attempts = db.requeue_screenshot_job(job_id, error, SCREENSHOT_MAX_ATTEMPTS)
+        finally:
+            db.close()
+
+    # Back off outside the capture slot. If this worker stops first, the
+    # pending job is resumed at the next startup.
+    if attempts is not None:
+        delay = SCREENSHOT_RETRY_DELAY * 2 ** (attempts - 1)
+        logger.info(f"Retrying screenshot job {job_id} in {delay:.0f}s (attempt {attempts} failed)")
+        _schedule(_retry_screenshot_job(job_id, project_id, url, delay))
+
+
+def resume_screenshot_jobs(db: ComplianceDatabase) -> int:
+    """
+    Restart screenshot jobs left unfinished by a previous worker.
+
+    Must be called from the running event loop (e.g. a startup hook).
+
+    Returns:
+        Number of jobs scheduled
+    """
+    try:
+        jobs = db.list_unfinished_screenshot_jobs()
+    except sqlite3.OperationalError as e:
+        # e.g. the database hasn't been migrated yet; don't block startup
+        logger.error(f"Could not resume screenshot jobs: {e}")
+        return 0
+
+    # Every worker runs this at startup; run_screenshot_job claims each job
+    # atomically once it has a capture slot, so only one worker runs it
+    for job in jobs:
+        _schedule(run_screenshot_job(job['id'], job['project_id'], job['url']))
+    if jobs:
+        logger.info(f"Resumed {len(jobs)} screenshot job(s)")
+    return len(jobs)